@@ -5,7 +5,7 @@ import motor  # type: ignore
 import time
 
 
-from DriveBase import DriveBase
+from DriveBase import DriveBase, Motion, Profiler
 from Logger import Logger
 
 """
@@ -29,10 +29,14 @@ print("-" * 50)
 print()
 
 class Controller:
+    # Time every DriveBase maneuver and print a table at the end of main
+    PROFILE = False
+
     def __init__(self):
         self._kill_ = False
 
         self.driveBase = DriveBase()
+        self.driveBase.configure_profiling(self.PROFILE)
 
         Logger.info("Started Program", code = 0)
 
@@ -56,12 +60,58 @@ class Controller:
             return False
 
     def __connect_addition__(self):
+        self.run(self.connect_addition_async())
+
+    async def connect_addition_async(self):
         self.driveBase.attach_addition(False)
         Logger.info("WAITING", code = "START")
-        while not self.__button_check__(0):
-            pass
+        await self.wait_button_async(0)
         self.driveBase.attach_addition(True)
-        time.sleep(0.5)
+        await self.sleep(500)
+
+    def __schedule__(self, awaitables):
+        """
+        Step all awaitables round robin until every one has finished.
+        Yields the ms until the next task wants to run, returns their results. \n
+        Führe alle Awaitables abwechselnd aus, bis jedes fertig ist.
+        Gibt die ms bis zum nächsten Schritt aus, liefert ihre Ergebnisse.
+        """
+        tasks = [
+            awaitable.__await__() if hasattr(awaitable, "__await__") else awaitable
+            for awaitable in awaitables
+        ]
+        wake = [time.ticks_ms()] * len(tasks)
+        results = [None] * len(tasks)
+        running = len(tasks)
+
+        while running:
+            if self._kill_:
+                for task in tasks:
+                    if task is not None:
+                        task.close()
+                break
+
+            for i in range(len(tasks)):
+                task = tasks[i]
+                if task is None or time.ticks_diff(wake[i], time.ticks_ms()) > 0:
+                    continue
+                try:
+                    duration = task.send(None)
+                except StopIteration as result:
+                    results[i] = result.value
+                    tasks[i] = None
+                    running -= 1
+                    continue
+                wake[i] = time.ticks_add(time.ticks_ms(), duration or 0)
+
+            if running:
+                now = time.ticks_ms()
+                delay = min(
+                    time.ticks_diff(wake[i], now)
+                    for i in range(len(tasks)) if tasks[i] is not None
+                )
+                yield max(0, delay)
+        return results
 
     ##################
     # MAIN FUNCTIONS #
@@ -70,6 +120,37 @@ class Controller:
     def kill(self):
         Logger.info("Killed program", code = -1)
         self._kill_ = True
+        Logger.flush()
+
+    def run(self, *awaitables) -> list:
+        """
+        Run coroutines and DriveBase `*_async` maneuvers side by side and
+        block until all are done. Returns their results in order. \n
+        Führe Coroutinen und DriveBase `*_async` Manöver nebeneinander aus
+        und warte, bis alle fertig sind. Gibt ihre Ergebnisse der Reihe nach aus.
+        """
+        return Motion.run(self.__schedule__(awaitables))
+
+    def parallel(self, *awaitables) -> Motion:
+        """
+        Awaitable version of `run`, to overlap moves inside a mission. \n
+        Awaitbare Version von `run`, um Bewegungen in einer Mission zu überlappen.
+        """
+        return Motion(self.__schedule__(awaitables))
+
+    def sleep(self, duration: int) -> Motion:
+        """
+        Awaitable pause of `duration` ms that lets other tasks run. \n
+        Awaitbare Pause von `duration` ms, in der andere Aufgaben weiterlaufen.
+        """
+        return Motion.sleep(duration)
+
+    def wait_button_async(self, button: int = 0) -> Motion:
+        """
+        Awaitable that finishes when the button is pressed. \n
+        Awaitbar, endet wenn der Knopf gedrückt wird.
+        """
+        return Motion.until(lambda: self.__button_check__(button))
 
     ###############
     # RUN PROGRAM #
@@ -97,6 +178,15 @@ class Controller:
     def drive_forward(self):
         self.driveBase.turn_to_angle(90, maxspeed=1110, minspeed=800)
         # self.driveBase.drive_distance(10, 900, 800)
+
+    async def drive_and_lower(self):
+        # Lower the attachment while the base is still driving
+        db = self.driveBase
+        await self.parallel(
+            db.drive_distance_async(30, 600, 300),
+            db.run_action_degree_async(700, 90),
+        )
+        await db.turn_to_angle_async(90)
     ###
 
 
@@ -108,6 +198,8 @@ ctrl.driveBase.configure_pid(1, 1, 1)
 def main():
     ctrl.drive_forward()
     ctrl.kill()
+    if ctrl.PROFILE:
+        Profiler.report()
 
 
 # Start the main async function
@@ -5,9 +5,919 @@ import color_sensor  # type: ignore
 
 import time
 import math
+import struct
+import binascii
+from array import array
 
 from Logger import Logger
 
+class SensorSnapshot:
+    """
+    One sample of the robot sensors per control tick. \n
+    Every value a controller needs is read exactly once in `read()`,
+    so the P, I and D terms all work on the same moment in time. \n
+    Ein Abbild der Sensoren pro Regelschritt.
+    Jeder Wert wird in `read()` genau einmal gelesen, damit P, I und D
+    mit demselben Zeitpunkt rechnen.
+    """
+
+    COLOR_OFF = 0
+    COLOR_RGBI = 1
+    COLOR_REFLECTION = 2
+
+    __slots__ = (
+        "gyro_sens", "motor_left", "motor_right", "color_port",
+        "motion", "duty_cycle", "color_mode", "color_type",
+        "yaw", "left", "right", "duty", "color",
+    )
+
+    def __init__(
+        self,
+        drive_base,
+        motion: bool = True,
+        duty_cycle: bool = False,
+        color_mode: int = COLOR_OFF,
+        color_type: int = 0,
+    ):
+        """
+        #### drive_base: DriveBase
+            The DriveBase whose ports are sampled. \n
+            Die DriveBase, deren Ports gelesen werden.
+        #### motion: bool = True
+            Read the gyro yaw and both drive encoders. \n
+            Lese den Gyro-Winkel und beide Antriebs-Encoder.
+        #### duty_cycle: bool = False
+            Read the duty cycle of both drive motors. \n
+            Lese die Auslastung beider Antriebsmotoren.
+        #### color_mode: int = COLOR_OFF
+            Read the color sensor: COLOR_OFF, COLOR_RGBI or COLOR_REFLECTION. \n
+            Lese den Farbsensor: COLOR_OFF, COLOR_RGBI oder COLOR_REFLECTION.
+        #### color_type: int = 0
+            Which channel of rgbi() is stored for COLOR_RGBI. \n
+            Welcher Kanal von rgbi() bei COLOR_RGBI gespeichert wird.
+        """
+        self.gyro_sens = drive_base.gyroSens
+        self.motor_left = drive_base.MOTORL
+        self.motor_right = drive_base.MOTORR
+        self.color_port = drive_base.COLORSENS
+
+        self.motion = motion
+        self.duty_cycle = duty_cycle
+        self.color_mode = color_mode
+        self.color_type = color_type
+
+        self.yaw = 0
+        self.left = 0
+        self.right = 0
+        self.duty = 0
+        self.color = 0
+
+    def read(self):
+        """
+        Sample all enabled sensors once. \n
+        Lese alle aktivierten Sensoren einmal.
+        """
+        if self.motion:
+            self.yaw = self.gyro_sens.tilt_angles()[0]
+            self.left = motor.relative_position(self.motor_left)
+            self.right = motor.relative_position(self.motor_right)
+        if self.duty_cycle:
+            self.duty = (
+                abs(motor.get_duty_cycle(self.motor_left))
+                + abs(motor.get_duty_cycle(self.motor_right))
+            ) // 2
+        if self.color_mode == self.COLOR_RGBI:
+            self.color = color_sensor.rgbi(self.color_port)[self.color_type]
+        elif self.color_mode == self.COLOR_REFLECTION:
+            self.color = color_sensor.reflection(self.color_port)
+
+    def driven(self) -> float:
+        """
+        Return the mean absolute encoder position of both drive motors. \n
+        Gib die mittlere absolute Encoderposition beider Antriebsmotoren aus.
+        """
+        return (abs(self.left) + abs(self.right)) / 2
+
+class LoopTimer:
+    """
+    Fixed-rate deadline scheduler for control loops. \n
+    `wait()` sleeps only for the part of the period that the loop body
+    did not already use and counts every missed deadline. \n
+    Taktgeber mit fester Rate für Regelschleifen.
+    `wait()` schläft nur den Rest der Periode, den die Schleife nicht
+    schon verbraucht hat, und zählt jede verpasste Deadline.
+    """
+
+    __slots__ = ("period", "deadline", "ticks", "missed", "worst")
+
+    def __init__(self, period: int = 10):
+        """
+        #### period: int = 10 [ms]
+            The time between the start of two loop iterations. \n
+            Die Zeit zwischen dem Start von zwei Schleifendurchläufen.
+        """
+        self.period = max(1, int(period))
+        self.start()
+
+    def start(self):
+        """
+        Start a new deadline grid from now and clear the statistics. \n
+        Starte ein neues Zeitraster ab jetzt und setze die Statistik zurück.
+        """
+        self.deadline = time.ticks_add(time.ticks_ms(), self.period)
+        self.ticks = 0
+        self.missed = 0
+        self.worst = 0
+
+    def tick(self) -> int:
+        """
+        Advance to the next deadline and return how many ms are left until it. \n
+        Gehe zur nächsten Deadline und gib aus, wie viele ms bis dahin übrig sind.
+        """
+        self.ticks += 1
+        remaining = time.ticks_diff(self.deadline, time.ticks_ms())
+        if remaining > 0:
+            self.deadline = time.ticks_add(self.deadline, self.period)
+            return remaining
+        # Missed: do not try to catch up, restart the grid from now
+        self.missed += 1
+        if -remaining > self.worst:
+            self.worst = -remaining
+        self.deadline = time.ticks_add(time.ticks_ms(), self.period)
+        return 0
+
+    def hold(self, duration: int) -> int:
+        """
+        Wait a fixed time outside of the loop rate, e.g. to let the robot settle.
+        Returns the duration, the grid continues after it. \n
+        Warte eine feste Zeit außerhalb des Takts, z.B. damit der Roboter zur Ruhe kommt.
+        Gibt die Dauer aus, das Raster läuft danach weiter.
+        """
+        self.deadline = time.ticks_add(time.ticks_ms(), duration + self.period)
+        return duration
+
+    def wait(self):
+        """
+        Sleep until the next deadline. \n
+        Schlafe bis zur nächsten Deadline.
+        """
+        remaining = self.tick()
+        if remaining:
+            time.sleep_ms(remaining)
+
+    def report(self, name: str):
+        """
+        Log the missed deadlines of the finished loop, if there were any. \n
+        Gib die verpassten Deadlines der beendeten Schleife aus, falls es welche gab.
+        """
+        if self.missed:
+            Logger.debug(
+                "{}: missed {}/{} deadlines of {} ms, worst {} ms late",
+                name, self.missed, self.ticks, self.period, self.worst)
+
+class Motion:
+    """
+    Awaitable handle of a running maneuver. \n
+    Every maneuver is a generator that yields how many ms it wants to sleep
+    until its next tick. `DriveBase` runs it blocking, `Controller` runs
+    several of them side by side with `await`. \n
+    Awaitbarer Griff auf ein laufendes Manöver.
+    Jedes Manöver ist ein Generator, der ausgibt, wie viele ms er bis zum
+    nächsten Schritt schlafen will. `DriveBase` führt ihn blockierend aus,
+    `Controller` führt mehrere davon mit `await` nebeneinander aus.
+    """
+
+    __slots__ = ("steps",)
+
+    def __init__(self, steps):
+        self.steps = steps
+
+    def __await__(self):
+        return self.steps
+
+    __iter__ = __await__
+
+    @staticmethod
+    def sleep(duration: int):
+        """
+        Awaitable pause of `duration` ms. \n
+        Awaitbare Pause von `duration` ms.
+        """
+        def steps():
+            yield duration
+        return Motion(steps())
+
+    @staticmethod
+    def until(condition, period: int = 20, timeout: int = -1):
+        """
+        Awaitable that finishes once `condition()` is True or `timeout` ms passed.
+        Returns whether the condition was met. \n
+        Awaitbar, endet sobald `condition()` True ist oder `timeout` ms vergangen sind.
+        Gibt aus, ob die Bedingung erfüllt wurde.
+        """
+        def steps():
+            timer = LoopTimer(period)
+            start_time = time.ticks_ms()
+            while not condition():
+                if timeout > 0 and time.ticks_diff(time.ticks_ms(), start_time) > timeout:
+                    return False
+                yield timer.tick()
+            return True
+        return Motion(steps())
+
+    @staticmethod
+    def run(steps):
+        """
+        Run a maneuver generator blocking and return its result.
+        Queued log messages are written in the pauses between its ticks. \n
+        Führe einen Manöver-Generator blockierend aus und gib sein Ergebnis aus.
+        Gepufferte Log-Nachrichten werden in den Pausen geschrieben.
+        """
+        Logger.running += 1
+        try:
+            if Profiler.current is not None:
+                return Profiler.run(steps, Profiler.current)
+            while True:
+                duration = next(steps)
+                if duration > 0:
+                    Logger.idle(duration)
+        except StopIteration as result:
+            return result.value
+        finally:
+            Logger.running -= 1
+            Logger.flush()
+
+class GainSchedule:
+    """
+    Speed-indexed table of PID gains, built once and read with linear interpolation. \n
+    Bucket `n` holds the gains for the speed `n * step`, so a lookup is one
+    division, one index and one multiply-add per gain. \n
+    Nach Geschwindigkeit geordnete Tabelle der PID-Werte, einmal erstellt und
+    linear interpoliert gelesen.
+    """
+
+    __slots__ = ("step", "size", "p", "i", "d", "dp", "di", "dd")
+
+    def __init__(self, step: int, p: list, i: list, d: list = None):
+        """
+        #### step: int
+            The speed difference between two buckets [degree/second]. \n
+            Der Geschwindigkeitsabstand zwischen zwei Einträgen [Grad/Sekunde].
+        #### p, i, d: list[float]
+            The gains at the speeds 0, step, 2 * step, ... ; d defaults to 1. \n
+            Die Werte bei den Geschwindigkeiten 0, step, 2 * step, ... ; d ist standardmäßig 1.
+        """
+        if d is None:
+            d = [1] * len(p)
+        if not (len(p) == len(i) == len(d)) or len(p) < 2:
+            raise ValueError("Gain table needs at least two buckets of equal length")
+        self.step = step
+        self.size = len(p)
+        self.p = array("f", p)
+        self.i = array("f", i)
+        self.d = array("f", d)
+        # Slopes per bucket, so lookup() does not subtract neighbours every tick
+        self.dp = array("f", [p[n + 1] - p[n] for n in range(self.size - 1)] + [0])
+        self.di = array("f", [i[n + 1] - i[n] for n in range(self.size - 1)] + [0])
+        self.dd = array("f", [d[n + 1] - d[n] for n in range(self.size - 1)] + [0])
+
+    @staticmethod
+    def from_functions(p_function, i_function, d_function=None, max_speed: int = 1200, step: int = 20):
+        """
+        Sample gain functions of the speed into a table. \n
+        Taste Funktionen der Geschwindigkeit in eine Tabelle ab.
+        """
+        speeds = range(0, max_speed + step, step)
+        return GainSchedule(
+            step,
+            [p_function(speed) for speed in speeds],
+            [i_function(speed) for speed in speeds],
+            [d_function(speed) for speed in speeds] if d_function else None,
+        )
+
+    @staticmethod
+    def from_points(speeds: list, p: list, i: list, d: list = None, step: int = 20):
+        """
+        Resample measured gains at arbitrary speeds into equal buckets. \n
+        Taste gemessene Werte bei beliebigen Geschwindigkeiten in gleiche Abstände um.
+        """
+        rows = sorted(zip(speeds, p, i, d if d else [1] * len(p)))
+
+        def sample(column: int, speed: float) -> float:
+            if speed <= rows[0][0]:
+                return rows[0][column]
+            for n in range(1, len(rows)):
+                if speed <= rows[n][0]:
+                    low, high = rows[n - 1], rows[n]
+                    return low[column] + (high[column] - low[column]) * (speed - low[0]) / (high[0] - low[0])
+            return rows[-1][column]
+
+        buckets = range(0, int(rows[-1][0]) + step, step)
+        return GainSchedule(
+            step,
+            [sample(1, speed) for speed in buckets],
+            [sample(2, speed) for speed in buckets],
+            [sample(3, speed) for speed in buckets],
+        )
+
+    @staticmethod
+    def from_csv(path: str, step: int = 20):
+        """
+        Load a calibration table in the format of `src/Calibrate.py`:
+        `;` separated, `,` as decimal point, a SPEED column and one column per
+        gain whose name starts with P, I or D (e.g. pRegler, iRegler). \n
+        Lade eine Kalibrierungstabelle im Format von `src/Calibrate.py`.
+        """
+        with open(path) as file:
+            header = [name.strip().lower() for name in file.readline().split(";")]
+            columns = {"speed": [], "p": [], "i": [], "d": []}
+            index = {}
+            for n, name in enumerate(header):
+                key = "speed" if name == "speed" else name[:1]
+                if key in columns and key not in index:
+                    index[key] = n
+            if "speed" not in index or "p" not in index or "i" not in index:
+                raise ValueError("Gain table needs SPEED, P and I columns: {}".format(path))
+            for line in file:
+                values = line.strip().split(";")
+                if len(values) < len(header):
+                    continue
+                for key, n in index.items():
+                    columns[key].append(float(values[n].replace(",", ".")))
+        return GainSchedule.from_points(
+            columns["speed"], columns["p"], columns["i"], columns["d"] or None, step)
+
+    def lookup(self, speed: float) -> tuple[float, float, float]:
+        """
+        Return (p, i, d) for the given speed. \n
+        Gib (p, i, d) für die gegebene Geschwindigkeit aus.
+        """
+        position = abs(speed) / self.step
+        index = int(position)
+        if index >= self.size - 1:
+            index = self.size - 1
+            return (self.p[index], self.i[index], self.d[index])
+        fraction = position - index
+        return (
+            self.p[index] + self.dp[index] * fraction,
+            self.i[index] + self.di[index] * fraction,
+            self.d[index] + self.dd[index] * fraction,
+        )
+
+class MotionProfile:
+    """
+    Velocity over encoder degrees, planned once before a maneuver. \n
+    Entry `n` holds the speed at `n * step` degrees, so the control loop only
+    does one division and one index per tick. `plan()` accelerates from a
+    start speed, holds the maximum speed and brakes to the end speed, with a
+    `jerk` the ramps are S-curves, otherwise trapezoidal. `from_segments()`
+    plans several segments with their own speed limits in one go. \n
+    Geschwindigkeit über Encodergrad, einmal vor einem Manöver geplant.
+    Eintrag `n` ist die Geschwindigkeit bei `n * step` Grad, die Regelschleife
+    braucht pro Schritt nur eine Division und einen Index. `plan()` plant
+    eine Fahrt mit Trapez- oder S-Kurven-Rampen, `from_segments()` mehrere
+    Abschnitte mit eigenen Geschwindigkeitsgrenzen auf einmal.
+    """
+
+    __slots__ = ("step", "size", "speeds", "end_speed", "brake_point")
+
+    # [s] Integration step of the S-curve ramps
+    DT = 0.005
+
+    def __init__(self, step: int, speeds: array, end_speed: int, brake_point: float):
+        """
+        #### step: int
+            The distance between two entries [degree]. \n
+            Der Abstand zwischen zwei Einträgen [Grad].
+        #### speeds: array
+            The speeds at 0, step, 2 * step, ... [degree/second]. \n
+            Die Geschwindigkeiten bei 0, step, 2 * step, ... [Grad/Sekunde].
+        #### end_speed: int
+            The speed after the last entry. \n
+            Die Geschwindigkeit nach dem letzten Eintrag.
+        #### brake_point: float
+            The distance where the final braking starts [degree]. \n
+            Die Strecke, ab der zum Schluss gebremst wird [Grad].
+        """
+        self.step = step
+        self.size = len(speeds)
+        self.speeds = speeds
+        self.end_speed = int(end_speed)
+        self.brake_point = brake_point
+
+    @staticmethod
+    def plan(
+        distance: float,
+        max_speed: float,
+        acceleration: float,
+        end_speed: float = 0,
+        start_speed: float = 0,
+        deceleration: float = None,
+        jerk: float = None,
+        step: int = 5,
+    ):
+        """
+        Plan one drive of `distance` degrees. \n
+        Plane eine Fahrt über `distance` Grad.
+
+        #### distance: float
+            The length of the drive [degree]. \n
+            Die Länge der Fahrt [Grad].
+        #### max_speed: float
+            The speed between the ramps [degree/second]. \n
+            Die Geschwindigkeit zwischen den Rampen [Grad/Sekunde].
+        #### acceleration: float
+            [degree/second²]
+        #### end_speed, start_speed: float = 0
+            The speeds at both ends. \n
+            Die Geschwindigkeiten an beiden Enden.
+        #### deceleration: float = None
+            [degree/second²], the acceleration if not given. \n
+            [Grad/Sekunde²], sonst gleich acceleration.
+        #### jerk: float = None
+            [degree/second³], S-curve ramps instead of trapezoidal ones. \n
+            [Grad/Sekunde³], S-Kurven statt Trapezrampen.
+        #### step: int = 5
+            The distance between two entries [degree]. \n
+            Der Abstand zwischen zwei Einträgen [Grad].
+        """
+        if max_speed <= 0 or acceleration <= 0:
+            raise ValueError("Motion profile needs a positive speed and acceleration")
+        max_speed = abs(max_speed)
+        start_speed = min(abs(start_speed), max_speed)
+        end_speed = min(abs(end_speed), max_speed)
+        size = int(distance // step) + 1
+
+        rising = MotionProfile.__ramp__(start_speed, max_speed, acceleration, jerk, step, size)
+        falling = MotionProfile.__ramp__(end_speed, max_speed, deceleration or acceleration, jerk, step, size)
+        last = size - 1
+        speeds = array("h", [0] * size)
+        brake_point = distance
+        for n in range(size):
+            # Ahead by one entry, so a drive from standstill gets moving
+            up = rising[n + 1] if n + 1 < len(rising) else max_speed
+            down = falling[last - n] if last - n < len(falling) else max_speed
+            if down < up and brake_point == distance:
+                brake_point = n * step
+            speeds[n] = int(min(up, down))
+        return MotionProfile(step, speeds, end_speed, brake_point)
+
+    @staticmethod
+    def __ramp__(speed: float, max_speed: float, acceleration: float, jerk: float, step: int, size: int) -> list:
+        """
+        Speeds every `step` degrees while accelerating from `speed` to
+        `max_speed`, braking is the same ramp read backwards. \n
+        Geschwindigkeiten alle `step` Grad beim Beschleunigen auf `max_speed`,
+        Bremsen ist dieselbe Rampe rückwärts gelesen.
+        """
+        ramp = []
+        if jerk is None:
+            # v² = v0² + 2as
+            while speed < max_speed and len(ramp) < size:
+                ramp.append(speed)
+                speed = math.sqrt(speed * speed + 2 * acceleration * step)
+            return ramp
+        dt = MotionProfile.DT
+        rate = 0.0
+        position = 0.0
+        while speed < max_speed and len(ramp) < size:
+            while len(ramp) * step <= position:
+                ramp.append(speed)
+            # Release the acceleration in time to reach max_speed without jerk
+            if max_speed - speed <= rate * rate / (2 * jerk):
+                rate = max(rate - jerk * dt, acceleration * 0.05)
+            else:
+                rate = min(rate + jerk * dt, acceleration)
+            speed = min(speed + rate * dt, max_speed)
+            position += speed * dt
+        return ramp
+
+    @staticmethod
+    def from_segments(
+        lengths: list,
+        limits: list,
+        joins: list,
+        acceleration: float,
+        start_speed: float = 0,
+        end_speed: float = 0,
+        step: int = 5,
+    ):
+        """
+        Plan segments back to back without stopping in between. Every
+        segment has its own speed limit, every join between two segments a
+        limit of its own, e.g. low before a turn on the spot. A forward
+        pass accelerates as far as the limits allow, a backward pass brakes
+        in time for every lower limit ahead. Ramps are trapezoidal. \n
+        Plane Abschnitte direkt hintereinander ohne Halt dazwischen. Jeder
+        Abschnitt und jeder Übergang hat eine eigene Höchstgeschwindigkeit,
+        vorwärts wird beschleunigt, rückwärts rechtzeitig gebremst.
+
+        #### lengths: list[float]
+            The length of every segment [degree]. \n
+            Die Länge jedes Abschnitts [Grad].
+        #### limits: list[float]
+            The maximum speed of every segment [degree/second]. \n
+            Die Höchstgeschwindigkeit jedes Abschnitts [Grad/Sekunde].
+        #### joins: list[float]
+            The maximum speed at the end of every segment but the last. \n
+            Die Höchstgeschwindigkeit am Ende jedes Abschnitts außer dem letzten.
+        """
+        if acceleration <= 0:
+            raise ValueError("Motion profile needs a positive acceleration")
+        size = int(sum(lengths) // step) + 1
+        speeds = array("h", [0] * size)
+        position = 0
+        for length, limit, join in zip(lengths, limits, list(joins) + [end_speed]):
+            first = int(position // step)
+            position += length
+            last = min(int(position // step), size - 1)
+            for n in range(first, last + 1):
+                speeds[n] = int(abs(limit))
+            speeds[last] = int(min(abs(limit), abs(join)))
+        speeds[size - 1] = int(min(speeds[size - 1], abs(end_speed)))
+
+        # Forward, ahead by one entry so a path from standstill gets moving
+        change = 2 * acceleration * step
+        speed = abs(start_speed)
+        for n in range(size):
+            speed = min(speeds[n], math.sqrt(speed * speed + change))
+            speeds[n] = int(speed)
+        # Backward
+        speed = speeds[size - 1]
+        for n in range(size - 2, -1, -1):
+            speed = min(speeds[n], math.sqrt(speed * speed + change))
+            speeds[n] = int(speed)
+        return MotionProfile(step, speeds, end_speed, sum(lengths))
+
+    def lookup(self, driven: float) -> int:
+        """
+        Return the planned speed after `driven` degrees. \n
+        Gib die geplante Geschwindigkeit nach `driven` Grad aus.
+        """
+        index = int(driven) // self.step
+        if index >= self.size:
+            return self.end_speed
+        return self.speeds[index]
+
+class PIDController:
+    """
+    Reusable PID core with preallocated state. \n
+    In float mode the error is given in degrees. In fixed-point mode it is
+    given in integer decidegrees, the unit of `tilt_angles()`, and all
+    terms are integers scaled by 2**SHIFT, so an update does not create
+    float objects on the hub. \n
+    Wiederverwendbarer PID-Regler mit vorab angelegtem Zustand.
+    Im Festkomma-Modus wird der Fehler in ganzen Zehntelgrad übergeben und
+    alle Terme sind Ganzzahlen, damit ein Schritt keine Floats erzeugt.
+    """
+
+    SHIFT = 16
+
+    __slots__ = (
+        "fixed_point", "dt", "kp", "ki", "kd",
+        "integral", "integral_limit", "max_integral", "previous",
+        "p_term", "i_term", "d_term",
+    )
+
+    def __init__(
+        self,
+        p: float = 0,
+        i: float = 0,
+        d: float = 0,
+        dt: int = 0,
+        fixed_point: bool = False,
+        integral_limit: int = 0,
+    ):
+        """
+        #### p, i, d: float = 0
+            The gains per degree of error. \n
+            Die Verstärkungen pro Grad Fehler.
+        #### dt: int = 0 [ms]
+            Time between two updates; I and D are scaled per second.
+            With 0 they are taken per update. \n
+            Zeit zwischen zwei Schritten; I und D werden pro Sekunde gerechnet.
+            Bei 0 pro Schritt.
+        #### fixed_point: bool = False
+            Work on integer decidegrees instead of float degrees. \n
+            Rechne mit ganzen Zehntelgrad statt Float-Grad.
+        #### integral_limit: int = 0
+            Clamp of the summed error, 0 for none. \n
+            Begrenzung des aufsummierten Fehlers, 0 für keine.
+        """
+        self.fixed_point = fixed_point
+        self.dt = dt
+        self.integral_limit = integral_limit
+        self.set_gains(p, i, d)
+        self.reset()
+
+    def set_gains(self, p: float, i: float, d: float):
+        """
+        Change the gains, the time step is folded into I and D once here. \n
+        Ändere die Verstärkungen, der Zeitschritt wird hier einmal eingerechnet.
+        """
+        if self.dt:
+            i = i * self.dt / 1000
+            d = d * 1000 / self.dt
+        if self.fixed_point:
+            # Gains per decidegree in units of 1 / 2**SHIFT
+            scale = (1 << self.SHIFT) / 10
+            self.kp = int(p * scale)
+            self.ki = int(i * scale)
+            self.kd = int(d * scale)
+            # Keep ki * integral a small int, bigger ints are heap objects
+            self.max_integral = (1 << 29) // abs(self.ki) if self.ki else 0
+            if self.integral_limit and (not self.max_integral or self.integral_limit < self.max_integral):
+                self.max_integral = self.integral_limit
+        else:
+            self.kp = p
+            self.ki = i
+            self.kd = d
+            self.max_integral = self.integral_limit
+
+    def reset(self):
+        """
+        Clear the integral and the previous error. \n
+        Setze Integral und letzten Fehler zurück.
+        """
+        self.integral = 0
+        self.previous = 0
+        self.p_term = 0
+        self.i_term = 0
+        self.d_term = 0
+
+    def update(self, error):
+        """
+        Feed one error sample and return the summed output.
+        The single terms stay readable in p_term, i_term and d_term. \n
+        Verarbeite einen Fehlerwert und gib die Summe aus.
+        Die einzelnen Terme bleiben in p_term, i_term und d_term lesbar.
+        """
+        self.integral += error
+        if self.max_integral:
+            if self.integral > self.max_integral:
+                self.integral = self.max_integral
+            elif self.integral < -self.max_integral:
+                self.integral = -self.max_integral
+
+        if self.fixed_point:
+            self.p_term = (self.kp * error) >> self.SHIFT
+            self.i_term = (self.ki * self.integral) >> self.SHIFT
+            self.d_term = (self.kd * (error - self.previous)) >> self.SHIFT
+        else:
+            self.p_term = self.kp * error
+            self.i_term = self.ki * self.integral
+            self.d_term = self.kd * (error - self.previous)
+        self.previous = error
+        return self.p_term + self.i_term + self.d_term
+
+class Telemetry:
+    """
+    Preallocated ring buffer of control loop samples. \n
+    `record()` only writes into an array, it neither allocates nor prints,
+    so it does not change the timing of the loop it observes. The newest
+    `capacity` samples of the last maneuver are kept and dumped afterwards. \n
+    Vorab angelegter Ringpuffer für Messwerte der Regelschleifen.
+    `record()` schreibt nur in ein Array, ohne Speicher anzulegen oder
+    auszugeben. Die neuesten `capacity` Werte des letzten Manövers bleiben
+    erhalten und werden danach ausgegeben.
+    """
+
+    FIELDS = ("time", "yaw", "error", "p", "i", "d", "steering", "speed", "left", "right")
+    WIDTH = 10
+
+    # Binary block per maneuver: header, name, then count * WIDTH float32,
+    # little endian like the hub. Read by src/TelemetryTool.py
+    MAGIC = b"DBTL"
+    VERSION = 1
+    HEADER = "<4sBBHII"
+
+    __slots__ = ("capacity", "samples", "count", "start_time", "name", "path")
+
+    def __init__(self, capacity: int = 512, path: str = None):
+        """
+        #### capacity: int = 512
+            Number of samples kept, older ones are overwritten. \n
+            Anzahl gespeicherter Messwerte, ältere werden überschrieben.
+        #### path: str = None
+            File on the hub, e.g. "/flash/telemetry.csv", every maneuver is
+            appended there when it ends, in the binary format if the name
+            ends with ".bin". None keeps the samples until `dump()`. \n
+            Datei auf dem Hub, an die jedes Manöver am Ende angehängt wird,
+            binär wenn der Name auf ".bin" endet.
+            Bei None bleiben die Werte bis `dump()` im Speicher.
+        """
+        self.capacity = capacity
+        self.samples = array("f", bytes(4 * self.WIDTH * capacity))
+        self.path = path
+        self.name = ""
+        self.count = 0
+        self.start_time = 0
+
+    def start(self, name: str):
+        """
+        Begin recording a new maneuver, the previous samples are dropped. \n
+        Beginne die Aufnahme eines neuen Manövers, alte Werte werden verworfen.
+        """
+        self.name = name
+        self.count = 0
+        self.start_time = time.ticks_ms()
+
+    def record(self, yaw, error, p, i, d, steering, speed, left, right):
+        """
+        Store one sample of the current tick. \n
+        Speichere einen Messwert des aktuellen Schritts.
+        """
+        samples = self.samples
+        n = (self.count % self.capacity) * self.WIDTH
+        samples[n] = time.ticks_diff(time.ticks_ms(), self.start_time)
+        samples[n + 1] = yaw
+        samples[n + 2] = error
+        samples[n + 3] = p
+        samples[n + 4] = i
+        samples[n + 5] = d
+        samples[n + 6] = steering
+        samples[n + 7] = speed
+        samples[n + 8] = left
+        samples[n + 9] = right
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def rows(self):
+        """
+        Iterate the kept samples from oldest to newest as tuples. \n
+        Gehe die gespeicherten Werte vom ältesten zum neuesten als Tupel durch.
+        """
+        first = self.count - len(self)
+        for k in range(first, self.count):
+            n = (k % self.capacity) * self.WIDTH
+            yield tuple(self.samples[n:n + self.WIDTH])
+
+    def finish(self):
+        """
+        End the maneuver; appends it to `path` if one is set. \n
+        Beende das Manöver; hängt es an `path` an, falls gesetzt.
+        """
+        if not self.path:
+            return
+        if self.path.endswith(".bin"):
+            self.save(self.path)
+        else:
+            self.dump(self.path)
+
+    def chunks(self):
+        """
+        Iterate the binary block of the maneuver as buffers, without copying the samples. \n
+        Gehe den Binärblock des Manövers als Puffer durch, ohne die Werte zu kopieren.
+        """
+        name = self.name.encode()
+        yield struct.pack(self.HEADER, self.MAGIC, self.VERSION, self.WIDTH,
+                          len(name), len(self), self.count - len(self))
+        yield name
+        samples = memoryview(self.samples)
+        if self.count <= self.capacity:
+            yield samples[:self.count * self.WIDTH]
+        else:
+            # Oldest sample first: the part after the write position comes first
+            split = (self.count % self.capacity) * self.WIDTH
+            yield samples[split:]
+            yield samples[:split]
+
+    def save(self, path: str):
+        """
+        Append the maneuver in the binary format to a file. \n
+        Hänge das Manöver im Binärformat an eine Datei an.
+        """
+        with open(path, "ab") as file:
+            for chunk in self.chunks():
+                file.write(chunk)
+
+    def stream(self, size: int = 48):
+        """
+        Print the binary block base64 encoded on lines starting with "TLM:",
+        `size` buffer items per line. src/TelemetryTool.py decodes them from
+        a captured console. \n
+        Gib den Binärblock base64-kodiert in Zeilen mit "TLM:" aus,
+        src/TelemetryTool.py dekodiert sie aus der mitgeschnittenen Konsole.
+        """
+        for chunk in self.chunks():
+            for n in range(0, len(chunk), size):
+                print("TLM:" + binascii.b2a_base64(chunk[n:n + size]).decode().strip())
+
+    def dump(self, path: str = None):
+        """
+        Write the samples as CSV to the console or append them to a file. \n
+        Gib die Werte als CSV in die Konsole aus oder hänge sie an eine Datei an.
+        """
+        header = "# {} {} samples, {} dropped".format(
+            self.name, len(self), self.count - len(self))
+        if path is None:
+            print(header)
+            print(",".join(self.FIELDS))
+            for row in self.rows():
+                print(",".join(map(str, row)))
+            return
+        with open(path, "a") as file:
+            file.write(header + "\n" + ",".join(self.FIELDS) + "\n")
+            for row in self.rows():
+                file.write(",".join(map(str, row)) + "\n")
+
+class Profiler:
+    """
+    Per-maneuver timing of the public DriveBase methods. \n
+    `DriveBase.configure_profiling()` wraps the methods of one instance,
+    so nothing is measured or slowed down while it is off. Ticks of a
+    maneuver are timed in `Motion.run`: computing is the time inside the
+    generator, sleeping the pause it asked for. \n
+    Zeitmessung pro Manöver für die öffentlichen DriveBase-Methoden.
+    Ausgeschaltet wird nichts gemessen und nichts verlangsamt.
+    """
+
+    # Columns of one entry in `stats`
+    CALLS = 0
+    WALL = 1  # [ms]
+    TICKS = 2
+    COMPUTE = 3  # [us]
+    MAX_TICK = 4  # [us]
+    SLEEP = 5  # [ms]
+
+    stats = {}
+    current = None
+
+    @staticmethod
+    def wrap(name: str, method):
+        """
+        Return `method` with its calls timed under `name`. \n
+        Gib `method` mit Zeitmessung unter `name` zurück.
+        """
+        stats = Profiler.stats
+        if name not in stats:
+            stats[name] = array("i", [0] * 6)
+        record = stats[name]
+
+        def profiled(*args, **kwargs):
+            outer = Profiler.current
+            Profiler.current = record
+            start = time.ticks_ms()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record[Profiler.CALLS] += 1
+                record[Profiler.WALL] += time.ticks_diff(time.ticks_ms(), start)
+                Profiler.current = outer
+        return profiled
+
+    @staticmethod
+    def run(steps, record):
+        """
+        `Motion.run` with every tick timed into `record`. \n
+        `Motion.run` mit Zeitmessung jedes Schritts in `record`.
+        """
+        try:
+            while True:
+                start = time.ticks_us()
+                duration = next(steps)
+                compute = time.ticks_diff(time.ticks_us(), start)
+                record[Profiler.TICKS] += 1
+                record[Profiler.COMPUTE] += compute
+                if compute > record[Profiler.MAX_TICK]:
+                    record[Profiler.MAX_TICK] = compute
+                if duration > 0:
+                    start = time.ticks_ms()
+                    Logger.idle(duration)
+                    record[Profiler.SLEEP] += time.ticks_diff(time.ticks_ms(), start)
+        except StopIteration as result:
+            return result.value
+
+    @staticmethod
+    def reset():
+        """
+        Clear all measurements. \n
+        Lösche alle Messwerte.
+        """
+        for record in Profiler.stats.values():
+            for n in range(len(record)):
+                record[n] = 0
+
+    @staticmethod
+    def report():
+        """
+        Print a table of all profiled methods, the slowest first.
+        Nested calls, e.g. run_action_degree -> run_motor_degree, count in both. \n
+        Gib eine Tabelle aller gemessenen Methoden aus, die langsamste zuerst.
+        """
+        rows = [(name, record) for name, record in Profiler.stats.items() if record[Profiler.CALLS]]
+        rows.sort(key=lambda row: -row[1][Profiler.WALL])
+        print("{:<26} {:>5} {:>9} {:>6} {:>9} {:>9} {:>9} {:>9}".format(
+            "maneuver", "calls", "wall[ms]", "ticks", "mean[us]", "max[us]", "sleep[ms]", "busy[ms]"))
+        for name, record in rows:
+            ticks = record[Profiler.TICKS]
+            print("{:<26} {:>5} {:>9} {:>6} {:>9} {:>9} {:>9} {:>9}".format(
+                name, record[Profiler.CALLS], record[Profiler.WALL], ticks,
+                record[Profiler.COMPUTE] // ticks if ticks else 0, record[Profiler.MAX_TICK],
+                record[Profiler.SLEEP], record[Profiler.WALL] - record[Profiler.SLEEP]))
+
 class DriveBase:
     """
 
@@ -26,10 +936,15 @@ class DriveBase:
     TANKTURN = 0
     LEFTTURN = 1
     RIGHTTURN = 2
+
+    PATHDRIVE = 0
+    PATHTURN = 1
+    PATHARC = 2
     
     PREGLER = False
     IREGLER = False
     DREGLER = False
+    FIXEDPOINT = False
 
     # CONFIGS
 
@@ -41,8 +956,18 @@ class DriveBase:
 
     MOTPAIR = 0
 
+    MOTORSTEP = 5 # [ms] Takt der Motor-Schleifen
+    SENSORSTEP = 50 # [ms] Takt der Sensor-Schleifen
+
     WHEELCIRC = 17.6 / (24/8) # Übersetzung von 3 [Rad:Motor] 24:8
 
+    TRACKWIDTH = 11.2 # [cm] Abstand der Antriebsräder
+
+    ACCELERATION = 2000 # [Grad/s²] Anfahrrampe von drive_distance
+    TURNACCELERATION = 1500 # [Grad/s²] Rampen von turn_to_angle
+
+    TURNCACHE = 16 # Gespeicherte Drehprofile
+
     def __init__(self, initial_yaw: int = 0):
         self.gyroSens = hub.motion_sensor
         self.stop = False
@@ -51,12 +976,19 @@ class DriveBase:
         self.gyroSens.reset_yaw(initial_yaw * -10)
 
         motor_pair.pair(self.MOTPAIR, self.MOTORL, self.MOTORR)
+
+        self.gains = GainSchedule.from_functions(self.p_polynomial, self.i_polynomial)
+        self.telemetry = None
+        self.profiling = False
+        self.turn_profiles = {}
         
     def configure_pid(
         self,
         p_regler: float = PREGLER,
         i_regler: float = IREGLER,
-        d_regler: float = DREGLER
+        d_regler: float = DREGLER,
+        gain_table = None,
+        fixed_point: bool = FIXEDPOINT,
     ):
         """Configure PID Constants
         Configure PID Constants
@@ -77,11 +1009,27 @@ class DriveBase:
         #### d_regler: float = DREGLER
             The D-Constant
             Die D Konstante
+
+        #### gain_table: GainSchedule | str = None
+            Speed dependent gains used where no constant is given, either a
+            GainSchedule or the path of a calibration CSV on the hub. \n
+            Geschwindigkeitsabhängige Werte für alle nicht gesetzten Konstanten,
+            entweder ein GainSchedule oder der Pfad einer Kalibrierungs-CSV auf dem Hub.
+
+        #### fixed_point: bool = FIXEDPOINT
+            Run the drive and turn PID in integer decidegrees, no floats per tick. \n
+            Rechne den Fahr- und Dreh-PID in ganzen Zehntelgrad, ohne Floats pro Schritt.
         """
         
         self.PREGLER = p_regler
         self.IREGLER = i_regler
         self.DREGLER = d_regler
+        self.FIXEDPOINT = fixed_point
+
+        if isinstance(gain_table, str):
+            gain_table = GainSchedule.from_csv(gain_table)
+        if gain_table is not None:
+            self.gains = gain_table
 
     def configure(
         self,
@@ -92,6 +1040,9 @@ class DriveBase:
         color_sensor_port: int = COLORSENS,
         motor_pair_id: int = MOTPAIR,
         wheel_circumference: float = WHEELCIRC,
+        motor_timestep: int = MOTORSTEP,
+        sensor_timestep: int = SENSORSTEP,
+        track_width: float = TRACKWIDTH,
     ):
         """
         Configure DriveBase
@@ -128,6 +1079,18 @@ class DriveBase:
         #### wheel_circumference: float = 17.6
             The circumference of the wheels. \n
             Der Umfang der Räder.
+
+        #### motor_timestep: int = 5 [ms]
+            The loop period while waiting for single motors to reach their target. \n
+            Der Takt, mit dem auf einzelne Motoren gewartet wird.
+
+        #### sensor_timestep: int = 50 [ms]
+            The loop period while waiting for a color or collision event. \n
+            Der Takt, mit dem auf ein Farb- oder Kollisionsereignis gewartet wird.
+
+        #### track_width: float = 11.2
+            The distance between the two drive wheels. \n
+            Der Abstand der beiden Antriebsräder.
         """
         self.MOTORR = motor_right_port
         self.MOTORL = motor_left_port
@@ -136,6 +1099,65 @@ class DriveBase:
         self.COLORSENS = color_sensor_port
         self.MOTPAIR = motor_pair_id
         self.WHEELCIRC = wheel_circumference
+        self.MOTORSTEP = motor_timestep
+        self.SENSORSTEP = sensor_timestep
+        self.TRACKWIDTH = track_width
+        # Turn profiles depend on the wheel geometry
+        self.turn_profiles = {}
+
+    def configure_telemetry(self, capacity: int = 512, path: str = None):
+        """Configure Telemetry
+        Record every tick of drive_distance and turn_to_angle into a ring buffer.
+        Read it with `self.telemetry.dump()` after a maneuver. 
+
+        Zeichne jeden Schritt von drive_distance und turn_to_angle in einem
+        Ringpuffer auf. Nach einem Manöver mit `self.telemetry.dump()` auslesen.
+
+        Parameters / Parameter
+        -----------------
+
+        #### capacity: int = 512
+            Samples kept per maneuver, 0 turns the recording off. \n
+            Gespeicherte Messwerte pro Manöver, 0 schaltet die Aufnahme ab.
+
+        #### path: str = None
+            Append every maneuver to this file, e.g. "/flash/telemetry.csv". \n
+            Hänge jedes Manöver an diese Datei an, z.B. "/flash/telemetry.csv".
+        """
+        self.telemetry = Telemetry(capacity, path) if capacity else None
+
+    PROFILED = (
+        "drive_distance", "drive_path", "drive_arc", "turn_to_angle", "turn_till_color", "turn_till_reflect",
+        "till_collide", "till_color", "run_motor_duration", "run_motor_degree",
+        "run_action_duration", "run_action_degree", "run_to_absolute_position",
+        "run_to_relative_position", "attach_addition", "reset_null",
+    )
+
+    def configure_profiling(self, enabled: bool = True):
+        """Configure Profiling
+        Time every call of the public motion methods: calls, wall time,
+        loop ticks, mean and max tick, sleeping and computing time.
+        Print the table with `Profiler.report()`. \n
+        Miss jeden Aufruf der öffentlichen Bewegungsmethoden: Aufrufe,
+        Gesamtzeit, Schleifenschritte, mittlerer und längster Schritt,
+        Schlaf- und Rechenzeit. Tabelle mit `Profiler.report()` ausgeben.
+
+        Parameters / Parameter
+        -----------------
+
+        #### enabled: bool = True
+            Switch the measurement on or off. \n
+            Schalte die Messung an oder aus.
+        """
+        if enabled == self.profiling:
+            return
+        self.profiling = enabled
+        for name in self.PROFILED:
+            if enabled:
+                # Instance attributes shadow the methods, deleting them restores them
+                setattr(self, name, Profiler.wrap(name, getattr(self, name)))
+            else:
+                delattr(self, name)
 
     #########################
     # Complex GyroFunctions #
@@ -153,6 +1175,8 @@ class DriveBase:
         brake_start: float = 0.7,
         timestep: int = 100,
         avoid_collision: bool = False,
+        acceleration: float = ACCELERATION,
+        jerk: float = None,
         ) -> bool:
         """
         Drive a specific distance and correct unwanted changes with the gyrosensor.
@@ -170,8 +1194,8 @@ class DriveBase:
             Die maximale Geschwindigkeit, die der Roboter erreicht.
 
         #### stopspeed : float = 300
-            The target speed while braking; the minimum speed at the end of the program. \n
-            Die minimale Geschwindigkeit am Ende des Programms.
+            The speed at the start and at the end of the drive. \n
+            Die Geschwindigkeit am Anfang und am Ende der Fahrt.
         
         #### re_align : bool = True
             If the robot should realign itself at the end of the driving to correct changes. \n
@@ -186,41 +1210,71 @@ class DriveBase:
             Ob der Roboter am Ende der Distanz stoppen soll.
 
         ##### brake_start : int = 0.7
-            Percentage of the driven distance after which the robot starts braking. \n
-            Prozentsatz der zurückgelegten Strecke, nach der der Roboter mit dem Bremsen beginnt. \n
+            Percentage of the driven distance after which the robot starts braking,
+            sets the deceleration from mainspeed to stopspeed. \n
+            Prozentsatz der zurückgelegten Strecke, nach der der Roboter mit dem Bremsen beginnt,
+            legt die Verzögerung von mainspeed auf stopspeed fest. \n
+        ##### acceleration : float = ACCELERATION
+            The acceleration from stopspeed to mainspeed [degree/second²]. \n
+            Die Beschleunigung von stopspeed auf mainspeed [Grad/Sekunde²]. \n
+        ##### jerk : float = None
+            Limit the jerk [degree/second³] for S-curve ramps, trapezoidal ramps if None. \n
+            Begrenze den Ruck [Grad/Sekunde³] für S-Kurven-Rampen, Trapezrampen bei None. \n
         ##### timestep : int = 100
-            The timestep between every single calculation and correction to prevent to fast reactions. \n
-            Der Zeitabstand zwischen jeder Berechnung und Ausgleichung, um zu schnelle Reaktionen zu verhindern. \n
+            The timestep [ms] between every single calculation and correction to prevent to fast reactions.
+            The loop runs at this fixed rate. \n
+            Der Zeitabstand [ms] zwischen jeder Berechnung und Ausgleichung, um zu schnelle Reaktionen zu verhindern.
+            Die Schleife läuft mit diesem festen Takt. \n
         ##### avoid_collision : bool = False    ---> UNUSED
             If the robot should try to avoid every collision. \n
             Ob der Roboter versuchen sollte, Kollisionen auszuweichen.
         """
+        return Motion.run(self.__drive_distance__(distance, mainspeed, stopspeed, re_align, isolated_drive, stop, brake_start=brake_start, timestep=timestep, avoid_collision=avoid_collision, acceleration=acceleration, jerk=jerk))
+
+    def drive_distance_async(self, *args, **kwargs):
+        """
+        Awaitable version of `drive_distance`, takes the same parameters. \n
+        Awaitbare Version von `drive_distance`, nimmt dieselben Parameter.
+        """
+        return Motion(self.__drive_distance__(*args, **kwargs))
+
+    def __drive_distance__(
+        self,
+        distance: float = 100,
+        mainspeed: int = 600,
+        stopspeed: int = 300,
+        re_align: bool = True,
+        isolated_drive: bool = False,
+        stop: bool = True,
+        *,
+        brake_start: float = 0.7,
+        timestep: int = 100,
+        avoid_collision: bool = False,
+        acceleration: float = ACCELERATION,
+        jerk: float = None,
+        ):
+        """
+        Maneuver generator of `drive_distance`. \n
+        Manöver-Generator von `drive_distance`.
+        """
         motor.reset_relative_position(self.MOTORL, 0)
         motor.reset_relative_position(self.MOTORR, 0)
         mainspeed = -mainspeed
         stopspeed = -stopspeed
 
-        def get_gyro_value() -> float:
-            return -self.gyroSens.tilt_angles()[0] / 10
+        snapshot = SensorSnapshot(self)
+        snapshot.read()
 
-        def get_driven():
-            return (
-                abs(motor.relative_position(self.MOTORL))
-                + abs(motor.relative_position(self.MOTORR))
-            ) / 2
-            
-        def error() -> int:
-            return int(get_gyro_value() - start_value)
-                
-        start_value = get_gyro_value() if isolated_drive else self.global_turn_value
+        start_value = -snapshot.yaw / 10 if isolated_drive else self.global_turn_value
+        start_decidegrees = int(start_value * 10)
 
         # Set starting speed of robot
         speed = mainspeed
         # Sets PID values
-
-        old_change = 0
-        integral = 0
-        steering_sum = 0
+        # The former integral summed the error differences, which adds up to
+        # the current error, so the I gain works like a second P gain.
+        pid = PIDController(fixed_point=self.FIXEDPOINT)
+        gain_speed = None
 
         invert = 1
 
@@ -230,33 +1284,49 @@ class DriveBase:
         # Calulation of degrees the motors should turn to
         # 17.6 is wheel circumference in cm. You might need to adapt it
         rotate_distance = (distance / self.WHEELCIRC) * 360
-        deccelerate_distance = rotate_distance * (1 - brake_start)
 
         # Inversion of target rotation value for negative values
         if speed < 0:
             invert = -1
 
-        # Calculation of braking point
-        brake_start_value = brake_start * rotate_distance
-        driven_distance = get_driven()
-
-
+        if distance > 0:
+            # Ramp up from stopspeed, brake back to it over the last part of the distance
+            brake_distance = rotate_distance * (1 - brake_start)
+            deceleration = None
+            end_speed = mainspeed
+            if brake_distance > 0:
+                end_speed = stopspeed
+                deceleration = max(
+                    abs(mainspeed * mainspeed - stopspeed * stopspeed) / (2 * brake_distance), 1)
+            profile = MotionProfile.plan(
+                rotate_distance, abs(mainspeed), acceleration, abs(end_speed), abs(stopspeed),
+                deceleration, jerk)
+            brake_start_value = profile.brake_point
+        driven_distance = snapshot.driven()
+
+        telemetry = self.telemetry
+        if telemetry is not None:
+            telemetry.start("drive_distance")
+
+        timer = LoopTimer(timestep)
         while loop:
-            steering_sum += error()
-            integral += error() - old_change
-            # Calculation of driven distance and PID values
-            old_driven_distance = driven_distance
-            driven_distance = get_driven()
-            
-            p_regler, i_regler, d_regler = self.get_pids(speed)
+            # One sensor sample per tick feeds every term below
+            snapshot.read()
             # yaw angle used due to orientation of the hub
-            curren_steering = (
-                error() * p_regler
-                + integral * i_regler
-                + d_regler * (error() - old_change)
-            )
+            if pid.fixed_point:
+                error = -snapshot.yaw - start_decidegrees
+            else:
+                error = int(-snapshot.yaw / 10 - start_value)
+
+            # Calculation of driven distance and PID values
+            driven_distance = snapshot.driven()
             
-            old_change = error()
+            # Gains only change with the speed, not every tick
+            if speed != gain_speed:
+                gain_speed = speed
+                p_regler, i_regler, d_regler = self.get_pids(speed)
+                pid.set_gains(p_regler + i_regler, 0, d_regler)
+            curren_steering = pid.update(error)
 
             curren_steering = max(-100, min(curren_steering, 100))
 
@@ -264,21 +1334,17 @@ class DriveBase:
             if distance <= 0:
                 speed = mainspeed
             else:
-                speed = self.speed_calculation(
-                    speed,
-                    deccelerate_distance,
-                    brake_start_value,
-                    int(driven_distance),
-                    int(old_driven_distance),
-                    mainspeed=mainspeed,
-                    stopspeed=stopspeed,
-                )
+                speed = invert * profile.lookup(driven_distance)
                 braking = True if driven_distance > brake_start_value else False
                 curren_steering = 0 if braking else curren_steering
 
             motor_pair.move(
                 self.MOTPAIR, invert * -int(curren_steering), velocity=int(speed)
             )
+            if telemetry is not None:
+                telemetry.record(
+                    snapshot.yaw, error, pid.p_term, pid.i_term, pid.d_term,
+                    invert * -int(curren_steering), speed, snapshot.left, snapshot.right)
 
             if distance <= 0:
                 if self.stop:
@@ -290,11 +1356,354 @@ class DriveBase:
                 motor_pair.stop(self.MOTPAIR)
             elif rotate_distance < driven_distance:
                 loop = False
-            time.sleep(0.1)
+            if loop:
+                yield timer.tick()
+        timer.report("drive_distance")
+        if telemetry is not None:
+            telemetry.finish()
         if re_align:
             # Removed isolated turn because not needed
-            self.turn_to_angle(self.global_turn_value)
-        time.sleep_ms(timestep)
+            yield from self.__turn_to_angle__(self.global_turn_value)
+        yield timestep
+        return True
+
+    def drive_path(
+        self,
+        segments: list,
+        mainspeed: int = 600,
+        turnspeed: int = 500,
+        stopspeed: int = 150,
+        stop: bool = True,
+        *,
+        acceleration: float = ACCELERATION,
+        tolerance: float = 1,
+        timestep: int = 20,
+        ) -> bool:
+        """
+        Drive a list of segments in one go and carry the speed from one
+        segment into the next, the robot only stops at the end.
+
+        Fahre eine Liste von Abschnitten am Stück und nimm die Geschwindigkeit
+        in den nächsten Abschnitt mit, der Roboter hält nur am Ende.
+
+        Parameters / Parameter
+        -----------------
+        #### segments : list
+            The segments in order / Die Abschnitte der Reihe nach: \n
+                -> (PATHDRIVE, distance) Drive straight, negative backwards / Geradeaus, negativ rückwärts \n
+                -> (PATHTURN, angle) Turn on the spot to this heading like turn_to_angle / Auf der Stelle auf diesen Winkel drehen \n
+                -> (PATHARC, radius, angle) Drive a circle of this radius [cm] by the angle, positive turns right /
+                   Fahre einen Kreisbogen mit dem Radius [cm] um den Winkel, positiv nach rechts \n
+                -> (PATHARC, radius, angle, True) The same arc backwards / Derselbe Bogen rückwärts
+
+        #### mainspeed : int = 600
+            The maximum speed of the drives, arcs keep their outer wheel below it. \n
+            Die Höchstgeschwindigkeit beim Fahren, bei Bögen für das äußere Rad.
+
+        #### turnspeed : int = 500
+            The maximum speed of the turns on the spot. \n
+            Die Höchstgeschwindigkeit beim Drehen auf der Stelle.
+
+        #### stopspeed : int = 150
+            The speed at the start, at the end and around every turn on the spot. \n
+            Die Geschwindigkeit am Anfang, am Ende und um jede Drehung auf der Stelle.
+
+        #### stop : bool = True
+            If the robot should stop at the end of the path, otherwise it keeps the speed. \n
+            Ob der Roboter am Ende anhalten soll, sonst behält er die Geschwindigkeit.
+
+        ##### acceleration : float = ACCELERATION
+            The acceleration and deceleration along the path [degree/second²]. \n
+            Die Beschleunigung und Verzögerung entlang des Weges [Grad/Sekunde²]. \n
+        ##### tolerance : float = 1
+            The tolerance of the heading at the end of a turn on the spot. \n
+            Die Toleranz des Winkels am Ende einer Drehung auf der Stelle. \n
+        ##### timestep : int = 20
+            The loop period [ms]. \n
+            Der Takt der Schleife [ms].
+        """
+        return Motion.run(self.__drive_path__(segments, mainspeed, turnspeed, stopspeed, stop, acceleration=acceleration, tolerance=tolerance, timestep=timestep))
+
+    def drive_path_async(self, *args, **kwargs):
+        """
+        Awaitable version of `drive_path`, takes the same parameters. \n
+        Awaitbare Version von `drive_path`, nimmt dieselben Parameter.
+        """
+        return Motion(self.__drive_path__(*args, **kwargs))
+
+    def drive_arc(
+        self,
+        radius: float,
+        angle: float = 90,
+        mainspeed: int = 600,
+        stopspeed: int = 150,
+        stop: bool = True,
+        backwards: bool = False,
+        *,
+        brake_start: float = 0.7,
+        acceleration: float = ACCELERATION,
+        jerk: float = None,
+        timestep: int = 20,
+        ) -> bool:
+        """
+        Drive along a circle and follow its heading with the gyrosensor.
+        The heading is held to the one expected after the driven distance,
+        so heading rate and distance are both closed loop.
+
+        Fahre einen Kreisbogen und folge seinem Winkel mit dem GyroSensor.
+        Der Winkel wird auf den nach der gefahrenen Strecke erwarteten geregelt.
+
+        Parameters / Parameter
+        -----------------
+        #### radius : float
+            The radius of the circle through the middle of the robot [cm],
+            above half the track width. \n
+            Der Radius des Kreises durch die Mitte des Roboters [cm],
+            größer als die halbe Spurweite.
+
+        #### angle : float = 90
+            The heading change, positive turns right like turn_to_angle. \n
+            Die Winkeländerung, positiv nach rechts wie bei turn_to_angle.
+
+        #### mainspeed : int = 600
+            The maximum speed of the outer wheel. \n
+            Die Höchstgeschwindigkeit des äußeren Rades.
+
+        #### stopspeed : int = 150
+            The speed at the start and the end of the arc. \n
+            Die Geschwindigkeit am Anfang und am Ende des Bogens.
+
+        #### stop : bool = True
+            If the robot should stop at the end of the arc. \n
+            Ob der Roboter am Ende des Bogens anhalten soll.
+
+        #### backwards : bool = False
+            Drive the arc backwards. \n
+            Fahre den Bogen rückwärts.
+
+        ##### brake_start : float = 0.7
+            Percentage of the arc after which the robot starts braking. \n
+            Prozentsatz des Bogens, nach dem der Roboter mit dem Bremsen beginnt. \n
+        ##### acceleration : float = ACCELERATION
+            The acceleration from stopspeed [degree/second²]. \n
+            Die Beschleunigung von stopspeed aus [Grad/Sekunde²]. \n
+        ##### jerk : float = None
+            Limit the jerk [degree/second³] for S-curve ramps, trapezoidal ramps if None. \n
+            Begrenze den Ruck [Grad/Sekunde³] für S-Kurven-Rampen, Trapezrampen bei None. \n
+        ##### timestep : int = 20
+            The loop period [ms]. \n
+            Der Takt der Schleife [ms].
+        """
+        return Motion.run(self.__drive_arc__(radius, angle, mainspeed, stopspeed, stop, backwards, brake_start=brake_start, acceleration=acceleration, jerk=jerk, timestep=timestep))
+
+    def drive_arc_async(self, *args, **kwargs):
+        """
+        Awaitable version of `drive_arc`, takes the same parameters. \n
+        Awaitbare Version von `drive_arc`, nimmt dieselben Parameter.
+        """
+        return Motion(self.__drive_arc__(*args, **kwargs))
+
+    def __drive_arc__(
+        self,
+        radius: float,
+        angle: float = 90,
+        mainspeed: int = 600,
+        stopspeed: int = 150,
+        stop: bool = True,
+        backwards: bool = False,
+        *,
+        brake_start: float = 0.7,
+        acceleration: float = ACCELERATION,
+        jerk: float = None,
+        timestep: int = 20,
+        ):
+        """
+        Maneuver generator of `drive_arc`, a path of one arc with its own profile. \n
+        Manöver-Generator von `drive_arc`, ein Weg aus einem Bogen mit eigenem Profil.
+        """
+        segments = [(self.PATHARC, radius, angle, backwards)]
+        lengths, limits, joins, headings = self.plan_path(segments, mainspeed, mainspeed, stopspeed)
+        length, limit = lengths[0], limits[0]
+        end_speed = stopspeed if stop else limit
+        deceleration = None
+        brake_distance = length * (1 - brake_start)
+        if brake_distance > 0 and limit > end_speed:
+            deceleration = max((limit * limit - end_speed * end_speed) / (2 * brake_distance), 1)
+        profile = MotionProfile.plan(
+            length, limit, acceleration, end_speed if deceleration else limit,
+            stopspeed, deceleration, jerk)
+        return (yield from self.__drive_path__(
+            segments, mainspeed, mainspeed, stopspeed, stop, timestep=timestep, profile=profile))
+
+    def plan_path(self, segments: list, mainspeed: int = 600, turnspeed: int = 500, stopspeed: int = 150) -> tuple:
+        """
+        Return the lengths [motor degrees], speed limits, join speeds and
+        end headings of the segments of `drive_path`. \n
+        Gib Längen [Motorgrad], Höchstgeschwindigkeiten, Übergangsgeschwindigkeiten
+        und Endwinkel der Abschnitte von `drive_path` aus.
+        """
+        lengths = []
+        limits = []
+        headings = []
+        heading = self.global_turn_value
+        half_track = self.TRACKWIDTH / 2
+        for segment in segments:
+            kind = segment[0]
+            if kind == self.PATHDRIVE:
+                lengths.append(abs(segment[1]) / self.WHEELCIRC * 360)
+                limits.append(mainspeed)
+            elif kind == self.PATHTURN:
+                delta = (segment[1] - heading + 180) % 360 - 180
+                lengths.append(abs(delta) * self.turn_ratio(self.TANKTURN))
+                limits.append(turnspeed)
+                heading = segment[1]
+            elif kind == self.PATHARC:
+                radius = segment[1]
+                if radius <= half_track:
+                    raise ValueError("Arc radius must be above half the track width: {}".format(radius))
+                lengths.append(abs(segment[2]) * math.pi / 180 * radius / self.WHEELCIRC * 360)
+                # The outer wheel runs faster than the middle of the robot
+                limits.append(mainspeed * radius / (radius + half_track))
+                heading += segment[2]
+            else:
+                raise ValueError("Unknown path segment: {}".format(segment))
+            headings.append(heading)
+
+        joins = []
+        for n in range(len(segments) - 1):
+            first, second = segments[n], segments[n + 1]
+            reverse = self.__path_direction__(first) != self.__path_direction__(second)
+            if self.PATHTURN in (first[0], second[0]) or reverse:
+                joins.append(stopspeed)
+            else:
+                joins.append(min(limits[n], limits[n + 1]))
+        return lengths, limits, joins, headings
+
+    def __path_direction__(self, segment) -> int:
+        """
+        Return 1 for a segment that drives forward, -1 backwards, 0 for a turn. \n
+        Gib 1 für einen Abschnitt vorwärts, -1 rückwärts und 0 für eine Drehung aus.
+        """
+        if segment[0] == self.PATHDRIVE:
+            return -1 if segment[1] < 0 else 1
+        if segment[0] == self.PATHARC:
+            return -1 if len(segment) > 3 and segment[3] else 1
+        return 0
+
+    def __drive_path__(
+        self,
+        segments: list,
+        mainspeed: int = 600,
+        turnspeed: int = 500,
+        stopspeed: int = 150,
+        stop: bool = True,
+        *,
+        acceleration: float = ACCELERATION,
+        tolerance: float = 1,
+        timestep: int = 20,
+        profile: MotionProfile = None,
+        ):
+        """
+        Maneuver generator of `drive_path`, `profile` replaces the planned speeds. \n
+        Manöver-Generator von `drive_path`, `profile` ersetzt die geplanten Geschwindigkeiten.
+        """
+        lengths, limits, joins, headings = self.plan_path(segments, mainspeed, turnspeed, stopspeed)
+        if profile is None:
+            end_speed = stopspeed if stop else limits[-1]
+            profile = MotionProfile.from_segments(lengths, limits, joins, acceleration, stopspeed, end_speed)
+
+        snapshot = SensorSnapshot(self)
+        pid = PIDController(fixed_point=self.FIXEDPOINT)
+        fixed_point = pid.fixed_point
+        gain_speed = None
+
+        # Headings in the unit of the PID: decidegrees or degrees
+        unit = 10 if fixed_point else 1
+        half_turn = 180 * unit
+        tolerance = tolerance * unit
+        ratio = self.turn_ratio(self.TANKTURN)
+
+        def wrap(error):
+            if error > half_turn:
+                return error - 2 * half_turn
+            if error < -half_turn:
+                return error + 2 * half_turn
+            return error
+
+        telemetry = self.telemetry
+        if telemetry is not None:
+            telemetry.start("drive_path")
+
+        timer = LoopTimer(timestep)
+        # Planned position of the segment start on the whole path [motor degrees]
+        offset = 0
+        for segment, length, heading in zip(segments, lengths, headings):
+            kind = segment[0]
+            motor.reset_relative_position(self.MOTORL, 0)
+            motor.reset_relative_position(self.MOTORR, 0)
+            start = self.global_turn_value * unit
+            target = heading * unit
+            sweep = target - start
+            self.global_turn_value = heading
+            direction = 1
+            if kind == self.PATHDRIVE and segment[1] < 0 or kind == self.PATHARC and len(segment) > 3 and segment[3]:
+                direction = -1
+            # Heading change per middle wheel speed on an arc
+            bend = 0
+            if kind == self.PATHARC:
+                bend = self.TRACKWIDTH / (2 * segment[1]) * (1 if sweep >= 0 else -1)
+
+            while True:
+                snapshot.read()
+                yaw = snapshot.yaw if fixed_point else snapshot.yaw / 10
+
+                if kind == self.PATHTURN:
+                    error = wrap(target + yaw)
+                    if abs(error) <= tolerance:
+                        break
+                    turned = length - abs(error) / unit * ratio
+                    speed = profile.lookup(offset + (turned if turned > 0 else 0))
+                    left = right = 0
+                    motor_pair.move(self.MOTPAIR, 100, velocity=speed if error > 0 else -speed)
+                else:
+                    driven = snapshot.driven()
+                    if driven >= length:
+                        break
+                    speed = profile.lookup(offset + driven)
+                    # yaw angle used due to orientation of the hub, the same heading as drive_distance
+                    if kind == self.PATHARC:
+                        error = wrap(-yaw - (start + sweep * driven / length))
+                    else:
+                        error = wrap(-yaw - target)
+                    if fixed_point:
+                        error = int(error)
+
+                    if speed != gain_speed:
+                        gain_speed = speed
+                        p_regler, i_regler, d_regler = self.get_pids(speed)
+                        pid.set_gains(p_regler + i_regler, 0, d_regler)
+                    steering = max(-100, min(pid.update(error), 100))
+
+                    # Pair velocities: forward is negative, left minus right turns right
+                    middle = direction * speed
+                    turn = bend * speed - speed * steering / 100
+                    left = int(-middle + turn)
+                    right = int(-middle - turn)
+                    motor_pair.move_tank(self.MOTPAIR, left, right)
+
+                if telemetry is not None:
+                    telemetry.record(
+                        snapshot.yaw, error, pid.p_term, pid.i_term, pid.d_term,
+                        100 if kind == self.PATHTURN else left - right, speed,
+                        snapshot.left, snapshot.right)
+                yield timer.tick()
+            offset += length
+
+        if stop:
+            motor_pair.stop(self.MOTPAIR)
+        timer.report("drive_path")
+        if telemetry is not None:
+            telemetry.finish()
         return True
 
     def turn_to_angle(
@@ -311,7 +1720,9 @@ class DriveBase:
         dGain: float = 0.4,
         powerExp: float = 6,
         tolerance: float = 0.5,
-        timestep: int = 10
+        timestep: int = 10,
+        profile: bool = True,
+        acceleration: float = TURNACCELERATION,
         ):
         """
         Turn to a specific angle and correct overturning with the gyrosensor.
@@ -365,50 +1776,143 @@ class DriveBase:
             Die Toleranz beim Output. \n
         ##### timestep : int = 10
             The timestep between every single calculation and correction to prevent to fast reactions. \n
-            Der Zeitabstand zwischen jeder Berechnung und Ausgleichung, um zu schnelle Reaktionen zu verhindern.
+            Der Zeitabstand zwischen jeder Berechnung und Ausgleichung, um zu schnelle Reaktionen zu verhindern. \n
+        ##### profile : bool = True
+            Follow a planned speed over the remaining angle instead of the P term,
+            it brakes at the target to minspeed or the lower speed the robot can stop
+            from within the tolerance, which is then the floor. After the first arrival
+            or overshoot plain feedback settles the turn. \n
+            Folge einer geplanten Geschwindigkeit über den Restwinkel statt dem P-Anteil,
+            sie bremst am Ziel auf minspeed oder die niedrigere Geschwindigkeit, aus der
+            der Roboter innerhalb der Toleranz anhalten kann, die dann die Untergrenze ist.
+            Nach dem ersten Erreichen oder Überdrehen regelt die normale Rückkopplung. \n
+        ##### acceleration : float = TURNACCELERATION
+            The acceleration and deceleration of the planned turn [degree/second²]. \n
+            Die Beschleunigung und Verzögerung der geplanten Drehung [Grad/Sekunde²].
         """
+        return Motion.run(self.__turn_to_angle__(target_angle, turn_type, minspeed, maxspeed, isolated_turn, smart_stop, pGain=pGain, iGain=iGain, dGain=dGain, powerExp=powerExp, tolerance=tolerance, timestep=timestep, profile=profile, acceleration=acceleration))
 
-        def get_gyro_value():
-            return self.gyroSens.tilt_angles()[0] / 10
+    def turn_to_angle_async(self, *args, **kwargs):
+        """
+        Awaitable version of `turn_to_angle`, takes the same parameters. \n
+        Awaitbare Version von `turn_to_angle`, nimmt dieselben Parameter.
+        """
+        return Motion(self.__turn_to_angle__(*args, **kwargs))
 
-        def error() -> float:
-            raw_error = target_angle - get_gyro_value()
-            if raw_error > 180:
-                raw_error -= 360
-            elif raw_error < -180:
-                raw_error += 360
-            return raw_error
+    def __turn_to_angle__(
+        self,
+        target_angle: float = 90,
+        turn_type: int = TANKTURN,
+        minspeed: int = 60,
+        maxspeed: int = 500,
+        isolated_turn: bool = False,
+        smart_stop: bool = True,
+        *,
+        pGain: float = 5,
+        iGain: float = 0,
+        dGain: float = 0.4,
+        powerExp: float = 6,
+        tolerance: float = 0.5,
+        timestep: int = 10,
+        profile: bool = True,
+        acceleration: float = TURNACCELERATION,
+        ):
+        """
+        Maneuver generator of `turn_to_angle`. \n
+        Manöver-Generator von `turn_to_angle`.
+        """
 
-        def calc_power():
-            return (
-                abs(motor.get_duty_cycle(self.MOTORL))
-                + abs(motor.get_duty_cycle(self.MOTORR))
-            ) / 2
-            
+        snapshot = SensorSnapshot(self, duty_cycle=True)
+        pid = PIDController(pGain, iGain, dGain, timestep, self.FIXEDPOINT)
+        fixed_point = pid.fixed_point
+
+        # Error and tolerance in the unit of the PID: decidegrees or degrees
+        unit = 10 if fixed_point else 1
+        target = int(target_angle * 10) if fixed_point else target_angle
+        half_turn = 180 * unit
+        tolerance = tolerance * unit
+        exponent = int(powerExp)
+
+        def error():
+            # yaw angle used due to orientation of the hub, the same heading as drive_distance
+            raw_error = target + (snapshot.yaw if fixed_point else snapshot.yaw / 10)
+            if raw_error > half_turn:
+                raw_error -= 2 * half_turn
+            elif raw_error < -half_turn:
+                raw_error += 2 * half_turn
+            return raw_error
 
-        integral = 0
         power = 0
-        prev_error = 0
         invert = 1
 
         if not isolated_turn:
             self.global_turn_value = target_angle
 
+        plan = None
+        floor = minspeed
+        if profile:
+            # The profile replaces the P term: speed over the turned angle in motor degrees
+            snapshot.read()
+            start_error = error()
+            direction = 1 if start_error >= 0 else -1
+            ratio = self.turn_ratio(turn_type)
+            # End at a speed the robot can stop from inside the tolerance,
+            # a high minspeed would carry it past the target again and again
+            floor = max(1, min(minspeed, int(math.sqrt(2 * acceleration * ratio * tolerance / unit))))
+            plan = self.turn_profile(abs(start_error) / unit, turn_type, minspeed, maxspeed, acceleration, floor)
+            start_error = abs(start_error)
+            # Turned motor degrees = turned angle * scale >> 10, integer in fixed point
+            scale = int(ratio * 1024 / unit)
+
+        telemetry = self.telemetry
+        if telemetry is not None:
+            telemetry.start("turn_to_angle")
+
+        timer = LoopTimer(timestep)
         while True:
-            integral += error() * (timestep / 1000)
-            derivative = (error() - prev_error) / (timestep / 1000)
-            prev_error = error()
-            power = calc_power()
-
-            output = (pGain * error()) + (iGain * integral) + \
-                (dGain * derivative) * (1 - (power / 10000) ** powerExp)
+            # One sensor sample per tick feeds every term below
+            snapshot.read()
+            current_error = error()
+            pid.update(current_error)
+            power = snapshot.duty
+
+            # The plan ends at minspeed, after the first overshoot or arrival
+            # in the tolerance plain feedback settles the turn
+            if plan is not None and (direction * current_error <= tolerance):
+                plan = None
+            if plan is not None:
+                turned = start_error - direction * current_error
+                if turned < 0:
+                    turned = 0
+                if fixed_point:
+                    p_term = plan.lookup((turned * scale) >> 10)
+                else:
+                    p_term = plan.lookup(turned * ratio)
+                if current_error < 0:
+                    p_term = -p_term
+            else:
+                p_term = pid.p_term
+
+            # The D term is damped the harder the motors already work
+            if fixed_point:
+                # damping = (power / 10000) ** powerExp in units of 1 / 10000
+                damping = 10000
+                n = exponent
+                while n > 0:
+                    damping = damping * power // 10000
+                    n -= 1
+                output = p_term + pid.i_term + \
+                    pid.d_term * (10000 - damping) // 10000
+            else:
+                output = p_term + pid.i_term + \
+                    pid.d_term * (1 - (power / 10000) ** powerExp)
             if output < 0:
                 invert = -1
             else:
                 invert = 1
-            output = int(max(minspeed, min(abs(output), maxspeed)))
+            output = int(max(floor, min(abs(output), maxspeed)))
 
-            if abs(error()) <= tolerance:
+            if abs(current_error) <= tolerance:
                 output = 0
 
             # Set motor speeds based on output
@@ -421,606 +1925,159 @@ class DriveBase:
             elif turn_type == self.RIGHTTURN:
                 motor.run(self.MOTORL, invert * -output)
 
+            if telemetry is not None:
+                # Steering 100 is a tank turn, single wheel turns have none
+                telemetry.record(
+                    snapshot.yaw, current_error, p_term, pid.i_term, pid.d_term,
+                    100 if turn_type == self.TANKTURN else 0, invert * output,
+                    snapshot.left, snapshot.right)
+
             # Stop when close to the target angle
-            if abs(error()) <= tolerance and smart_stop:
+            if abs(current_error) <= tolerance and smart_stop:
                 motor_pair.stop(self.MOTPAIR)
-                time.sleep_ms(90)
+                yield timer.hold(90)
+                snapshot.read()
                 if abs(error()) <= tolerance:
-                    Logger.debug(
-                        "Successful Turn: {}/{} offset: {}".format(target_angle, -int(get_gyro_value()), error()))
+                    if Logger.level <= Logger.DEBUG:
+                        Logger.debug(
+                            "Successful Turn: {}/{} offset: {}", target_angle, -int(snapshot.yaw / 10), error() / unit)
                     break
 
-            time.sleep_ms(timestep)
+            yield timer.tick()
+        timer.report("turn_to_angle")
+        if telemetry is not None:
+            telemetry.finish()
         motor_pair.stop(self.MOTPAIR)
 
-    def turn_till_color(self, direction: int = 1, speed: int = 360, color_type: int = 0, color_gate: int = 700, timeout: int = -1):
-        """
-
-            direction (either -1 or 1 idk which is which, ig -1 is left and 1 is right)
-
-        """
-
-        self.auto_detect_device(self.TYPECOLORSENS)
-        if timeout > 0:
-            motor_pair.move_for_time(
-                self.MOTPAIR, timeout, direction * 100, velocity=speed)
-        else:
-            motor_pair.move(self.MOTPAIR, direction * 100, velocity=speed)
-
-        start_time = time.ticks_ms()
-
-        while True:
-            color_val = color_sensor.rgbi(self.COLORSENS)[color_type]
-
-            if color_val <= color_gate:
-                break
-            elif (time.ticks_ms() - start_time) / 1000 > timeout:
-                Logger.debug((time.ticks_ms() - start_time) / 1000)
-                break
-            else:
-                time.sleep_ms(50)
-        motor.stop(self.MOTPAIR)
-
-    def turn_till_reflect(self, direction: int = 1, speed: int = 360, reflection_gate: int = 700, smaller_than: int = True, timeout: int = -1):
-        """
-
-            direction (either -1 or 1 idk which is which, ig -1 is left and 1 is right)
-
+    ##########
+    # Addons #
+    ##########
+
+    # Methods that live in add-on modules, imported on first use to keep
+    # the resident bytecode small: method name -> module
+    ADDONS = {
+        # DriveBaseSensors
+        "turn_till_color": "DriveBaseSensors",
+        "__turn_till_color__": "DriveBaseSensors",
+        "turn_till_reflect": "DriveBaseSensors",
+        "__turn_till_reflect__": "DriveBaseSensors",
+        "till_collide": "DriveBaseSensors",
+        "till_collide_async": "DriveBaseSensors",
+        "__till_collide__": "DriveBaseSensors",
+        "till_color": "DriveBaseSensors",
+        "till_color_async": "DriveBaseSensors",
+        "__till_color__": "DriveBaseSensors",
+        "around_kollision": "DriveBaseSensors",
+        "collided": "DriveBaseSensors",
+        # DriveBaseAttachments
+        "run_motor_duration": "DriveBaseAttachments",
+        "run_motor_duration_async": "DriveBaseAttachments",
+        "__run_motor_duration__": "DriveBaseAttachments",
+        "run_motor_degree": "DriveBaseAttachments",
+        "run_motor_degree_async": "DriveBaseAttachments",
+        "__run_motor_degree__": "DriveBaseAttachments",
+        "run_action_duration": "DriveBaseAttachments",
+        "run_action_duration_async": "DriveBaseAttachments",
+        "run_action_degree": "DriveBaseAttachments",
+        "run_action_degree_async": "DriveBaseAttachments",
+        "run_to_absolute_position": "DriveBaseAttachments",
+        "run_to_absolute_position_async": "DriveBaseAttachments",
+        "__run_to_absolute_position__": "DriveBaseAttachments",
+        "run_to_relative_position": "DriveBaseAttachments",
+        "run_to_relative_position_async": "DriveBaseAttachments",
+        "__run_to_relative_position__": "DriveBaseAttachments",
+        "attach_addition": "DriveBaseAttachments",
+        "reset_null": "DriveBaseAttachments",
+        "__reset_null__": "DriveBaseAttachments",
+        "stop_motor": "DriveBaseAttachments",
+        "get_addition_state": "DriveBaseAttachments",
+        "convert_abs": "DriveBaseAttachments",
+        # DriveBaseDiagnostics
+        "auto_detect_device": "DriveBaseDiagnostics",
+        "detect_all_devices": "DriveBaseDiagnostics",
+    }
+
+    def __getattr__(self, name):
         """
-
-        self.auto_detect_device(self.TYPECOLORSENS)
-        motor_pair.move(self.MOTPAIR, direction * 100, velocity=speed)
-
-        start_time = time.ticks_ms()
-
-        while True:
-            reflection_val = color_sensor.reflection(self.COLORSENS)
-
-            if smaller_than and reflection_val <= reflection_gate:
-                break
-            elif not smaller_than and reflection_val >= reflection_gate:
-                break
-            elif (time.ticks_ms() - start_time) / 1000 > timeout:
-                Logger.debug((time.ticks_ms() - start_time) / 1000)
-                break
-            else:
-                time.sleep_ms(50)
-        print("Finish")
-        motor.stop(self.MOTPAIR)
-
-    def till_collide(self, speed, gate: int = 300, timeout: int = -1) -> float:
-        def cycl() -> float:
-            return (
-                abs(motor.get_duty_cycle(self.MOTORL))
-                + abs(motor.get_duty_cycle(self.MOTORR))
-            ) / 2
-
-        def get_driven() -> float:
-            return (
-                abs(motor.relative_position(self.MOTORL))
-                + abs(motor.relative_position(self.MOTORR))
-            ) / 2
-        start_dist = get_driven()
-
-        motor_pair.move(self.MOTPAIR, 0, velocity=speed)
-        time.sleep(0.5)
-        start_cycl = cycl()
-        start_time = time.ticks_ms()
-        while True:
-            if self.collided(cycl(), start_cycl, gate):
-                print(cycl())
-                break
-            elif (time.ticks_ms() - start_time) / 1000 > timeout and timeout > 0:
-                Logger.debug(
-                    abs(time.ticks_diff(start_time, time.ticks_ms)) / 1000)
-                break
-            else:
-                time.sleep_ms(50)
-        motor_pair.stop(self.MOTPAIR)
-
-        distance = ((get_driven() - start_dist) * self.WHEELCIRC) / 360
-        return distance
-
-    def till_color(self, speed: int, color_type: int = 0, color_gate: int = 700, timeout: int = -1):
-        self.auto_detect_device(self.TYPECOLORSENS)
-        # if timeout > 0:
-        #     motor_pair.move_for_time(self.MOTPAIR, timeout, 0, velocity = speed)
-        # else:
-        motor_pair.move(self.MOTPAIR, 0, velocity=speed)
-
-        start_time = time.ticks_ms()
-
-        loop = True
-
-        while loop:
-            color_val = color_sensor.rgbi(self.COLORSENS)[color_type]
-
-            if color_val <= color_gate:
-                loop = False
-                break
-            elif (time.ticks_ms() - start_time) / 1000 > timeout:
-                loop = False
-                break
-            else:
-                time.sleep_ms(50)
-            if not loop:
-                print("IDK what happens")
-        print("Finish")
-        motor.stop(self.MOTPAIR)
-
-    def around_kollision(self, timestamp, power, old_power, steering, speed):
-        # Logger.debug((timestamp, power, old_power))
-        motor_pair.move(self.MOTPAIR, steering, velocity=speed)
-
-    #######################
-    # Simple Interactions #
-    #######################
-
-    def run_motor_duration(
-        self, 
-        speed: int = 500, 
-        duration: float = 5, 
-        *ports: int
-        ) -> bool:
-        """Run the given Motor
-
-        Start the given ports for a specified time duration.
-        If the duration is <= 0 do not stop.
-
-        Starte die gegebenen ports für eine angegebene Zeit.
-        Wenn die Zeit <= 0 ist, stoppt der Motor nicht.
-
-        Parameters / Parameter
-        -----------------
-
-        #### speed: int = 500
-            How fast the motor should turn. \n
-            Wie schnell sich der Motor drehen soll. \n
-        #### duration: float = 5
-            How long the motor should run, if <= 0 no stopping. \n
-            Wie lange der Motor sich drehen soll, wenn <= 0 stoppt er nicht. \n
-        #### ports: int
-            The ports which will be controlled, needs to be specified, otherwise throws Error. \n
-            Die Ports die gesteuert werden sollen, muss angegeben sein, sonst kommt ein Fehler. \n
-        """
-        if len(ports) == 0:
-            Logger.exception(40, "Please give ports")
-            return False
-        ports_list = list(ports)
-
-        try:
-            for port in ports_list:
-                motor.run(port, speed)
-            if duration > 0:
-                time.sleep(duration)
-                for port in ports_list:
-                    motor.stop(port, stop=motor.SMART_COAST)
-            return True
-        except:
-            Logger.exception(
-                421, "Given unavailable port {}".format(str(ports)))
-            return False
-
-    def run_motor_degree(
-        self, 
-        speed: int = 500, 
-        degree: float = 90, 
-        *ports: int, 
-        tolerance: float = 5
-        ) -> bool:
-        """Run the given Motor
-
-        Start the given ports for a specified angle.
-
-        Starte die gegebenen ports für einen angegebenen Winkel.
-
-        Parameters / Parameter
-        -----------------
-        #### speed: int = 500 [degree/second]
-            How fast the motor should turn. \n
-            Wie schnell sich der Motor drehen soll. \n
-        #### angle: float = 5 [degree]
-            How much the motor should turn. \n
-            Wie viel sich der Motor drehen soll. \n
-        #### ports: int
-            The ports which will be controlled, needs to be specified, otherwise throws Error. \n
-            Die Ports die gesteuert werden sollen, muss angegeben sein, sonst kommt ein Fehler. \n
-        ##### tolerance: float = 5
-            The tolerance the motor checks for between the given and measured angle. \n
-            Die Toleranz der Motor überprüft zwischen dem gegebenen und gemessenen Winkel. \n
-        """
-
-        def reached() -> bool:
-            if abs(current_pos - target_pos) <= tolerance:
-                return True
-            else:
-                return False
-
-        try:
-            if degree > 0:
-                invert = 1
-            else:
-                invert = -1
-
-            ports_list = [port for port in ports]
-            if len(ports) == 0:
-                Logger.exception(40, "Please give ports")
-                return False
-
-            target_pos = degree
-
-            for port in ports_list:
-                start_pos = motor.relative_position(
-                    port)  # Startposition speichern
-                motor.run(port, invert * speed)  # Motor starten
-                # Zielposition berechnen
-                target_pos = start_pos + degree
-
-            while True:
-                for port in ports_list:
-                    current_pos = motor.relative_position(port)
-                    if reached():
-                        ports_list.remove(port)
-                        motor.stop(port, stop=motor.SMART_COAST)
-                if len(ports_list) == 0:
-                    break
-            return True
-        except Exception as e:
-            Logger.exception(
-                421, "Error with motor port(s) {}: {}".format(str(ports), e)
-            )
-            return False
-
-    def run_action_duration(self, speed: int = 360, duration: float = 5) -> bool:
-        """Run the action/ability motor for time.
-
-        Run the action motor with given speed, for the given time.
-
-        Drehe den Motor mit dem gegebenen Speed, die gegebene Zeit.
-
-        Parameters / Parameter
-        --------------
-
-        #### speed: float = 700 [degree/second]
-            The given speed, with which the motor turns. \n
-            Der gegebene Speed mit dem der Motor sich dreht. \n
-        #### time: float = 5 [seconds]
-            The given time, for which the motor should turn. \n
-            Die gegebene Zeit, die sich der Motor drehen soll.
+        Load the add-on module of a method on first use, see `ADDONS`. \n
+        Lade das Zusatzmodul einer Methode bei der ersten Benutzung, siehe `ADDONS`.
         """
-        return self.run_motor_duration(speed, duration, self.ACTION)
-
-    def run_action_degree(self, speed: int = 700, degree: float = 90) -> bool:
-        """Run the action/ability motor for degree
-
-        Run the action motor until it has turned the given degree. (not a turn to-, but a turn for-action)
-
-        Drehe den Motor mit gegebener Geschwindigkeit bis er sich um den gegebenen Winkel dreht. (Kein drehen bis auf Position, aber ein drehen um Grad)
-
-        Parameters / Parameter
-        --------------
-
-        #### speed: int = 700 [degree / second]
-            The given speed, with which the motor turns. \n
-            Der gegebene Speed mit dem der Motor sich dreht. \n
-        #### degree: float = 90 [degree]
-            The given angle, for which the motor should turn. \n
-            Den gegebenen Winkel, um die sich der Motor drehen soll.
+        module = DriveBase.ADDONS.get(name)
+        if module is None:
+            raise AttributeError(name)
+        DriveBase.load_addon(module)
+        return getattr(self, name)
+
+    @staticmethod
+    def load_addon(module: str):
         """
-        return self.run_motor_degree(speed, degree, self.ACTION)
-
-    def run_to_absolute_position(
-        self, position: int = 0, speed: int = 500, *ports: int
-    ) -> bool:
-        """Run motor(s) to given absolute position
-
-        Run the given motors to the position, waits until position is reached
-
-        Drehe die Motoren auf die Position, wartet bis die Position erreicht ist
-
-        Parameters / Parameter
-        ------------
-
-        position: int = 0 [degree]
-            Where the robot should turn to. \n
-            Auf welchen Wert sich der Roboter drehen soll. \n
-        speed: int = 500 [degree / second]
-            With which speed the robot should turn. \n
-            Mit welcher Geschwindigkeit der Roboter sich drehen soll. \n
-        ports: tuple[int, ...]
-            Which port should be used. \n
-            Welche Ports angesteuert werden sollen.
-
-        """
-
-        def reached(port: int) -> bool:
-            """
-            Return whether the distance is reached
-            """
-            pos = (motor.absolute_position(port) + 360) % 360
-            # print(pos, position)
-            if position < 0 and pos <= position:
-                motor.stop(port)
-                return True
-            elif position > 0 and pos >= position:
-                motor.stop(port)
-                return True
-            elif position == 0 and abs(pos) >= 340:
-                motor.stop(port)
-                return True
-            else:
-                return False
-
-        def invert(port: int) -> int:
-            """
-            Return whether the speed should be inverted for this port
-            """
-            current_pos = self.convert_abs(motor.absolute_position(port))
-            if (position - current_pos) > 0:
-                Logger.debug(-1)
-                return -1
-            else:
-                Logger.debug(1)
-                return 1
-
-        ports_list = [port for port in ports]
-        if len(ports) == 0:
-            Logger.exception(40, "Please give ports")
-            return False
-        try:
-            for port in ports_list:
-                motor.run(port, invert(port) * speed)
-        except Exception as e:
-            Logger.exception(
-                12, "run to absolute position had following error: {}".format(
-                    e)
-            )
-            return False
-        while True:
-            for port in ports_list:
-                pos = (motor.absolute_position(port) + 360) % 360
-                if position < 0 and pos <= position:
-                    motor.stop(port)
-                    ports_list.remove(port)
-                elif position > 0 and pos >= position:
-                    motor.stop(port)
-                    ports_list.remove(port)
-                elif position == 0 and pos in range(position, position + 5):
-                    print(
-                        "finish {}".format(
-                            (motor.absolute_position(port) + 360) % 360)
-                    )
-                    motor.stop(port)
-                    print(
-                        "finish {}".format(
-                            (motor.absolute_position(port) + 360) % 360)
-                    )
-                    ports_list.remove(port)
-            if len(ports_list) == 0:
-                break
-        return True
-
-    def run_to_relative_position(
-        self, position: int = 0, speed: int = 500, *ports: int
-    ) -> bool:
-        """Run motor(s) to given relative position
-
-        Run the given motors to the position, waits until position is reached
-
-        Drehe die Motoren auf die Position, wartet bis die Position erreicht ist
-
-        Parameters / Parameter
-        ------------
-
-        position: int = 0 [degree]
-            Where the robot should turn to. \n
-            Auf welchen Wert sich der Roboter drehen soll. \n
-        speed: int = 500 [degree / second]
-            With which speed the robot should turn. \n
-            Mit welcher Geschwindigkeit der Roboter sich drehen soll. \n
-        ports: tuple[int, ...]
-            Which port should be used. \n
-            Welche Ports angesteuert werden sollen.
-
-        """
-
-        def reached() -> bool:
-            """
-            Return whether the distance is reached
-            """
-            if position > 0 and current_pos >= position:
-                return True
-            elif position < 0 and current_pos <= position:
-                return True
-            else:
-                return False
-
-        def invert(port) -> int:
-            """
-            Return whether the speed should be inverted for this port
-            """
-            current_pos = motor.relative_position(port)
-            if (position - current_pos) > 0:
-                return -1
-            else:
-                return 1
-
-        ports_list = [port for port in ports]
-        if len(ports) == 0:
-            Logger.exception(40, "Please give ports")
-            return False
-        try:
-            for port in ports_list:
-                motor.run(port, invert(port) * speed)
-                pass
-        except Exception as e:
-            Logger.exception(
-                12, "run to relative position had following error: {}".format(
-                    e)
-            )
-            return False
-        while True:
-            for port in ports_list:
-                current_pos = motor.relative_position(port)
-                if reached():
-                    ports_list.remove(port)
-                    motor.stop(port, stop=motor.SMART_COAST)
-            if len(ports_list) == 0:
-                break
-        return True
-
-    def attach_addition(self, attach: bool = True) -> bool:
-        """Attach/Detach the addition.
-
-        Attach or detach the addition of the robot.
-
-        Befestige oder Löse Aufsatz vom Roboter.
-
-        Parameters/Parameter
-        --------
-        attach: bool
-            In which state the addition should be set. \n
-            In welchen Zustand der Aufsatz gesetzt werden soll.
+        Import an add-on module and add its methods to DriveBase.
+        The imports are spelled out so UploadLibrarys.py finds the modules. \n
+        Importiere ein Zusatzmodul und füge seine Methoden zu DriveBase hinzu.
         """
-        old_state = self.get_addition_state()
-        if attach and not old_state:
-            motor.run_to_absolute_position(
-                3, 95, 1000, direction=motor.SHORTEST_PATH)
-            return True
-        elif not attach and old_state:
-            motor.run_to_absolute_position(
-                3, 0, 1000, direction=motor.SHORTEST_PATH)
-            return True
+        if module == "DriveBaseSensors":
+            import DriveBaseSensors as addon
+        elif module == "DriveBaseAttachments":
+            import DriveBaseAttachments as addon
+        elif module == "DriveBaseDiagnostics":
+            import DriveBaseDiagnostics as addon
         else:
-            return False
-
-    def reset_null(self, *ports: int):
-        """Reset given motor to zero
+            raise ImportError("Unknown DriveBase add-on: {}".format(module))
+        for name, owner in DriveBase.ADDONS.items():
+            if owner == module:
+                setattr(DriveBase, name, getattr(addon, name))
 
-        Reset the position of a given motor to absolute position zero.
-
-        Setze die Position von einem gegebenen Motor auf die absolute Position Null.
-
-        Parameters
-        ------
-
-        ports: tuple[int]
+    @staticmethod
+    def load_addons():
         """
-        for port in ports:
-            motor.reset_relative_position(port, 0)
-            while True:
-                current_pos = motor.relative_position(port)
-                if abs(current_pos) == 0:
-                    break
-
-    def stop_motor(self, *ports) -> bool:
-        """Stop given motor
-
-        Stop the motor(s) with given port(s)
-
-        ports: tuple[int]
+        Load every add-on module at once, e.g. before patching the class. \n
+        Lade alle Zusatzmodule auf einmal, z.B. bevor die Klasse verändert wird.
         """
-        try:
-            for port in ports:
-                motor.stop(port)
-            return True
-        except OSError:
-            Logger.exception(
-                621, "Given unavailable port(s) {}".format(str(ports)))
-            return False
+        for module in ("DriveBaseSensors", "DriveBaseAttachments", "DriveBaseDiagnostics"):
+            DriveBase.load_addon(module)
 
     #########################
     # Calculating Functions #
     #########################
 
-    def auto_detect_device(self, device_type: int) -> list[int]:
-        devices = []
-        for i in range(6):
-            try:
-                if device_type == self.TYPEMOTOR:
-                    motor.relative_position(i)
-                elif device_type == self.TYPECOLORSENS:
-                    color_sensor.rgbi(i)
-                else:
-                    Logger.exception(
-                        404, "Please specify a correct device_type: 0/1")
-                    continue
-            except:
-                continue
-            devices.append(i)
-        if device_type == self.TYPECOLORSENS:
-            self.COLORSENS = devices[0]
-        return devices
-
-    def detect_all_devices(self) -> dict[int, str]:
-        """Detect all connected devices on all ports
-
-        Scan all ports and identify which type of device is connected to each port.
-
-        Scanne alle Ports und identifiziere, welche Art von Gerät an jedem Port angeschlossen ist.
-
-        Returns / Ausgabe
-        -----
-        dict[int, str]
-            A dictionary mapping port numbers to device types ('motor', 'color_sensor', or 'none'). \n
-            Ein Dictionary, das Portnummern zu Gerätetypen zuordnet ('motor', 'color_sensor' oder 'none').
+    def turn_ratio(self, turn_type: int = TANKTURN) -> float:
         """
-        devices = {}
-        for port in range(6):
-            device_type = 'none'
-            
-            # Check for motor
-            try:
-                motor.relative_position(port)
-                device_type = 'motor'
-            except:
-                pass
-            
-            # Check for color sensor
-            if device_type == 'none':
-                try:
-                    color_sensor.rgbi(port)
-                    device_type = 'color_sensor'
-                except:
-                    pass
-            
-            devices[port] = device_type
-        
-        Logger.debug("Device scan: {}".format(devices))
-        return devices
-
-    def get_addition_state(self) -> bool:
+        Return the motor degrees per degree of heading for the turn type.
+        Both wheels of a tank turn roll on a circle of the track width,
+        the wheel of a single wheel turn on a circle twice as wide. \n
+        Gib die Motorgrad pro Grad Drehung für die Drehart aus.
         """
-        Return the state of the addition. \n
-        Gib den Zustand des Aufsatzes aus.
+        ratio = math.pi * self.TRACKWIDTH / self.WHEELCIRC
+        return ratio if turn_type == self.TANKTURN else 2 * ratio
 
-        Returns / Ausgabe:
-        ----------
-        True: abs_pos == 80 - 100
-            Addition is connected. \n
-            Aufsatz ist verbunden. \n
-        False: abs_pos == -10 - 10 or 170 - 190
-            Addition is not connected. \n
-            Aufsatz ist gelöst.
+    def turn_profile(
+        self, angle: float, turn_type: int = TANKTURN, minspeed: int = 60, maxspeed: int = 500,
+        acceleration: float = TURNACCELERATION, stopspeed: int = None,
+    ) -> MotionProfile:
         """
-        if motor.absolute_position(3) in range(80, 100, 1):
-            self.addition_state = True
-            return True
-        elif motor.absolute_position(3) in range(-10, 10, 1):
-            self.addition_state = False
-            return False
-        elif motor.absolute_position(3) in range(170, 190, 1):
-            return False
-        else:
-            motor.run_to_absolute_position(
-                3, 0, 1000, direction=motor.SHORTEST_PATH)
-            Logger.debug(
-                "State {}° inbetweeen, open completely".format(
-                    motor.absolute_position(3)
-                )
-            )
-            self.addition_state = False
-            return False
+        Return the planned turn over `angle` degrees, from minspeed up to
+        maxspeed and back to stopspeed (default minspeed) at the target,
+        over motor degrees.
+        Plans are kept per whole degree and speed limits, so a repeated
+        turn costs one dictionary lookup. \n
+        Gib die geplante Drehung über `angle` Grad aus. Pläne werden pro
+        ganzem Grad und Geschwindigkeitsgrenzen gespeichert, eine
+        wiederholte Drehung kostet nur einen Blick ins Wörterbuch.
+        """
+        angle = int(angle + 0.5)
+        if stopspeed is None:
+            stopspeed = minspeed
+        key = (angle, turn_type, minspeed, maxspeed, acceleration, stopspeed)
+        profile = self.turn_profiles.get(key)
+        if profile is None:
+            if len(self.turn_profiles) >= self.TURNCACHE:
+                self.turn_profiles.clear()
+            profile = MotionProfile.plan(
+                angle * self.turn_ratio(turn_type), maxspeed, acceleration, stopspeed, minspeed)
+            self.turn_profiles[key] = profile
+            if Logger.level <= Logger.DEBUG:
+                Logger.debug("Planned turn of {}° in {} steps", angle, profile.size)
+        return profile
 
     def speed_calculation(
         self,
@@ -1038,9 +2095,11 @@ class DriveBase:
 
         Used to calculate all the speeds in our programs.
         Executed separately to reduce redundancy.
+        Kept for mission code, drive_distance plans its speeds with MotionProfile.
 
         Wird verwendet, um alle Geschwindigkeiten in unseren Programmen zu berechnen.
         Wird separat ausgeführt, um Redundanz zu reduzieren.
+        Bleibt für Missionscode erhalten, drive_distance plant mit MotionProfile.
 
         Parameters / Parameter
         ----------------------
@@ -1115,8 +2174,10 @@ class DriveBase:
     def get_pids(self, speed: float) -> tuple[float, float, float]:
         """Calculation of PID Values.
 
-        Return the PID Values depending on the given speed. \n
-        Gib die PID-Werte aus, abhängig davon, wie schnell der Roboter fährt
+        Return the PID Values depending on the given speed.
+        Looked up in the precomputed gain table, constants from configure_pid win. \n
+        Gib die PID-Werte aus, abhängig davon, wie schnell der Roboter fährt.
+        Aus der vorberechneten Tabelle, Konstanten aus configure_pid haben Vorrang.
 
         Returns / Ausgabe
         -----
@@ -1124,54 +2185,47 @@ class DriveBase:
 
         """
 
-        speed = abs(speed)
-
-        def pRegler():
-            return (
-                14.59
-                - 0.177132762 * speed
-                + 0.000920045989 * speed**2
-                - 2.34879006e-6 * speed**3
-                + 3.15365919e-9 * speed**4
-                - 2.15176282e-12 * speed**5
-                + 5.90277778e-16 * speed**6
-            )
+        p_regler, i_regler, d_regler = self.gains.lookup(speed)
 
-        def iRegler():
-            return (
-                4.30433333
-                - 0.0374442063 * speed
-                + 0.00018870942 * speed**2
-                - 5.52917468e-7 * speed**3
-                + 8.790625e-10 * speed**4
-                - 6.96201923e-13 * speed**5
-                + 2.14583333e-16 * speed**6
-            )
-
-        if not self.PREGLER:
-            p_regler = pRegler()
-        else:
+        if self.PREGLER:
             p_regler = self.PREGLER
-            
-        if not self.IREGLER:
-            i_regler = iRegler()
-        else:
+        if self.IREGLER:
             i_regler = self.IREGLER
-            
-        if not self.DREGLER:
-            d_regler = 1
-        else:
+        if self.DREGLER:
             d_regler = self.DREGLER
-        
 
         return (p_regler, i_regler, d_regler)
 
-    def collided(self, cycl, start_cycl, gate: int = 300):
-        diff = cycl - start_cycl
-        if diff > gate:
-            return True
-        else:
-            return False
-
-    def convert_abs(self, abs_pos: int = 0) -> int:
-        return (abs_pos + 360) % 360
\ No newline at end of file
+    @staticmethod
+    def p_polynomial(speed: float) -> float:
+        """
+        Fitted P-gain curve from PIDValuesCalibration.xlsx, used to build the default gain table. \n
+        Angepasste P-Kurve aus PIDValuesCalibration.xlsx, Grundlage der Standard-Tabelle.
+        """
+        speed = abs(speed)
+        return (
+            14.59
+            - 0.177132762 * speed
+            + 0.000920045989 * speed**2
+            - 2.34879006e-6 * speed**3
+            + 3.15365919e-9 * speed**4
+            - 2.15176282e-12 * speed**5
+            + 5.90277778e-16 * speed**6
+        )
+
+    @staticmethod
+    def i_polynomial(speed: float) -> float:
+        """
+        Fitted I-gain curve from PIDValuesCalibration.xlsx, used to build the default gain table. \n
+        Angepasste I-Kurve aus PIDValuesCalibration.xlsx, Grundlage der Standard-Tabelle.
+        """
+        speed = abs(speed)
+        return (
+            4.30433333
+            - 0.0374442063 * speed
+            + 0.00018870942 * speed**2
+            - 5.52917468e-7 * speed**3
+            + 8.790625e-10 * speed**4
+            - 6.96201923e-13 * speed**5
+            + 2.14583333e-16 * speed**6
+        )
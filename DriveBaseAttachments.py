@@ -0,0 +1,519 @@
+"""
+Attachment and single motor control of DriveBase: running motors by time,
+degrees or to a position and the addition on port D. Loaded on first use
+by DriveBase.__getattr__. \n
+Steuerung von Aufsätzen und einzelnen Motoren für DriveBase. Wird bei der
+ersten Benutzung geladen.
+"""
+
+import motor  # type: ignore
+
+from DriveBase import LoopTimer, Motion
+from Logger import Logger
+
+
+def run_motor_duration(
+    self, 
+    speed: int = 500, 
+    duration: float = 5, 
+    *ports: int
+    ) -> bool:
+    """Run the given Motor
+
+    Start the given ports for a specified time duration.
+    If the duration is <= 0 do not stop.
+
+    Starte die gegebenen ports für eine angegebene Zeit.
+    Wenn die Zeit <= 0 ist, stoppt der Motor nicht.
+
+    Parameters / Parameter
+    -----------------
+
+    #### speed: int = 500
+        How fast the motor should turn. \n
+        Wie schnell sich der Motor drehen soll. \n
+    #### duration: float = 5
+        How long the motor should run, if <= 0 no stopping. \n
+        Wie lange der Motor sich drehen soll, wenn <= 0 stoppt er nicht. \n
+    #### ports: int
+        The ports which will be controlled, needs to be specified, otherwise throws Error. \n
+        Die Ports die gesteuert werden sollen, muss angegeben sein, sonst kommt ein Fehler. \n
+    """
+    return Motion.run(self.__run_motor_duration__(speed, duration, *ports))
+
+def run_motor_duration_async(self, *args, **kwargs):
+    """
+    Awaitable version of `run_motor_duration`, takes the same parameters. \n
+    Awaitbare Version von `run_motor_duration`, nimmt dieselben Parameter.
+    """
+    return Motion(self.__run_motor_duration__(*args, **kwargs))
+
+def __run_motor_duration__(
+    self, 
+    speed: int = 500, 
+    duration: float = 5, 
+    *ports: int
+    ):
+    """
+    Maneuver generator of `run_motor_duration`. \n
+    Manöver-Generator von `run_motor_duration`.
+    """
+    if len(ports) == 0:
+        Logger.exception(40, "Please give ports")
+        return False
+    ports_list = list(ports)
+
+    try:
+        for port in ports_list:
+            motor.run(port, speed)
+        if duration > 0:
+            yield int(duration * 1000)
+            for port in ports_list:
+                motor.stop(port, stop=motor.SMART_COAST)
+        return True
+    except:
+        Logger.exception(
+            421, "Given unavailable port {}".format(str(ports)))
+        return False
+
+def run_motor_degree(
+    self, 
+    speed: int = 500, 
+    degree: float = 90, 
+    *ports: int, 
+    tolerance: float = 5
+    ) -> bool:
+    """Run the given Motor
+
+    Start the given ports for a specified angle.
+
+    Starte die gegebenen ports für einen angegebenen Winkel.
+
+    Parameters / Parameter
+    -----------------
+    #### speed: int = 500 [degree/second]
+        How fast the motor should turn. \n
+        Wie schnell sich der Motor drehen soll. \n
+    #### angle: float = 5 [degree]
+        How much the motor should turn. \n
+        Wie viel sich der Motor drehen soll. \n
+    #### ports: int
+        The ports which will be controlled, needs to be specified, otherwise throws Error. \n
+        Die Ports die gesteuert werden sollen, muss angegeben sein, sonst kommt ein Fehler. \n
+    ##### tolerance: float = 5
+        The tolerance the motor checks for between the given and measured angle. \n
+        Die Toleranz der Motor überprüft zwischen dem gegebenen und gemessenen Winkel. \n
+    """
+    return Motion.run(self.__run_motor_degree__(speed, degree, *ports, tolerance=tolerance))
+
+def run_motor_degree_async(self, *args, **kwargs):
+    """
+    Awaitable version of `run_motor_degree`, takes the same parameters. \n
+    Awaitbare Version von `run_motor_degree`, nimmt dieselben Parameter.
+    """
+    return Motion(self.__run_motor_degree__(*args, **kwargs))
+
+def __run_motor_degree__(
+    self, 
+    speed: int = 500, 
+    degree: float = 90, 
+    *ports: int, 
+    tolerance: float = 5
+    ):
+    """
+    Maneuver generator of `run_motor_degree`. \n
+    Manöver-Generator von `run_motor_degree`.
+    """
+
+    def reached() -> bool:
+        if abs(current_pos - target_pos) <= tolerance:
+            return True
+        else:
+            return False
+
+    try:
+        if degree > 0:
+            invert = 1
+        else:
+            invert = -1
+
+        ports_list = [port for port in ports]
+        if len(ports) == 0:
+            Logger.exception(40, "Please give ports")
+            return False
+
+        target_pos = degree
+
+        for port in ports_list:
+            start_pos = motor.relative_position(
+                port)  # Startposition speichern
+            motor.run(port, invert * speed)  # Motor starten
+            # Zielposition berechnen
+            target_pos = start_pos + degree
+
+        timer = LoopTimer(self.MOTORSTEP)
+        while True:
+            for port in ports_list:
+                current_pos = motor.relative_position(port)
+                if reached():
+                    ports_list.remove(port)
+                    motor.stop(port, stop=motor.SMART_COAST)
+            if len(ports_list) == 0:
+                break
+            yield timer.tick()
+        return True
+    except Exception as e:
+        Logger.exception(
+            421, "Error with motor port(s) {}: {}".format(str(ports), e)
+        )
+        return False
+
+def run_action_duration(self, speed: int = 360, duration: float = 5) -> bool:
+    """Run the action/ability motor for time.
+
+    Run the action motor with given speed, for the given time.
+
+    Drehe den Motor mit dem gegebenen Speed, die gegebene Zeit.
+
+    Parameters / Parameter
+    --------------
+
+    #### speed: float = 700 [degree/second]
+        The given speed, with which the motor turns. \n
+        Der gegebene Speed mit dem der Motor sich dreht. \n
+    #### time: float = 5 [seconds]
+        The given time, for which the motor should turn. \n
+        Die gegebene Zeit, die sich der Motor drehen soll.
+    """
+    return self.run_motor_duration(speed, duration, self.ACTION)
+
+def run_action_duration_async(self, speed: int = 360, duration: float = 5):
+    """
+    Awaitable version of `run_action_duration`. \n
+    Awaitbare Version von `run_action_duration`.
+    """
+    return self.run_motor_duration_async(speed, duration, self.ACTION)
+
+def run_action_degree(self, speed: int = 700, degree: float = 90) -> bool:
+    """Run the action/ability motor for degree
+
+    Run the action motor until it has turned the given degree. (not a turn to-, but a turn for-action)
+
+    Drehe den Motor mit gegebener Geschwindigkeit bis er sich um den gegebenen Winkel dreht. (Kein drehen bis auf Position, aber ein drehen um Grad)
+
+    Parameters / Parameter
+    --------------
+
+    #### speed: int = 700 [degree / second]
+        The given speed, with which the motor turns. \n
+        Der gegebene Speed mit dem der Motor sich dreht. \n
+    #### degree: float = 90 [degree]
+        The given angle, for which the motor should turn. \n
+        Den gegebenen Winkel, um die sich der Motor drehen soll.
+    """
+    return self.run_motor_degree(speed, degree, self.ACTION)
+
+def run_action_degree_async(self, speed: int = 700, degree: float = 90):
+    """
+    Awaitable version of `run_action_degree`. \n
+    Awaitbare Version von `run_action_degree`.
+    """
+    return self.run_motor_degree_async(speed, degree, self.ACTION)
+
+def run_to_absolute_position(
+    self, position: int = 0, speed: int = 500, *ports: int
+) -> bool:
+    """Run motor(s) to given absolute position
+
+    Run the given motors to the position, waits until position is reached
+
+    Drehe die Motoren auf die Position, wartet bis die Position erreicht ist
+
+    Parameters / Parameter
+    ------------
+
+    position: int = 0 [degree]
+        Where the robot should turn to. \n
+        Auf welchen Wert sich der Roboter drehen soll. \n
+    speed: int = 500 [degree / second]
+        With which speed the robot should turn. \n
+        Mit welcher Geschwindigkeit der Roboter sich drehen soll. \n
+    ports: tuple[int, ...]
+        Which port should be used. \n
+        Welche Ports angesteuert werden sollen.
+
+    """
+    return Motion.run(self.__run_to_absolute_position__(position, speed, *ports))
+
+def run_to_absolute_position_async(self, *args, **kwargs):
+    """
+    Awaitable version of `run_to_absolute_position`, takes the same parameters. \n
+    Awaitbare Version von `run_to_absolute_position`, nimmt dieselben Parameter.
+    """
+    return Motion(self.__run_to_absolute_position__(*args, **kwargs))
+
+def __run_to_absolute_position__(
+    self, position: int = 0, speed: int = 500, *ports: int
+):
+    """
+    Maneuver generator of `run_to_absolute_position`. \n
+    Manöver-Generator von `run_to_absolute_position`.
+    """
+
+    def reached(port: int) -> bool:
+        """
+        Return whether the distance is reached
+        """
+        pos = (motor.absolute_position(port) + 360) % 360
+        # print(pos, position)
+        if position < 0 and pos <= position:
+            motor.stop(port)
+            return True
+        elif position > 0 and pos >= position:
+            motor.stop(port)
+            return True
+        elif position == 0 and abs(pos) >= 340:
+            motor.stop(port)
+            return True
+        else:
+            return False
+
+    def invert(port: int) -> int:
+        """
+        Return whether the speed should be inverted for this port
+        """
+        current_pos = self.convert_abs(motor.absolute_position(port))
+        if (position - current_pos) > 0:
+            Logger.debug(-1)
+            return -1
+        else:
+            Logger.debug(1)
+            return 1
+
+    ports_list = [port for port in ports]
+    if len(ports) == 0:
+        Logger.exception(40, "Please give ports")
+        return False
+    try:
+        for port in ports_list:
+            motor.run(port, invert(port) * speed)
+    except Exception as e:
+        Logger.exception(
+            12, "run to absolute position had following error: {}".format(
+                e)
+        )
+        return False
+    timer = LoopTimer(self.MOTORSTEP)
+    while True:
+        for port in ports_list:
+            pos = (motor.absolute_position(port) + 360) % 360
+            if position < 0 and pos <= position:
+                motor.stop(port)
+                ports_list.remove(port)
+            elif position > 0 and pos >= position:
+                motor.stop(port)
+                ports_list.remove(port)
+            elif position == 0 and pos in range(position, position + 5):
+                print(
+                    "finish {}".format(
+                        (motor.absolute_position(port) + 360) % 360)
+                )
+                motor.stop(port)
+                print(
+                    "finish {}".format(
+                        (motor.absolute_position(port) + 360) % 360)
+                )
+                ports_list.remove(port)
+        if len(ports_list) == 0:
+            break
+        yield timer.tick()
+    return True
+
+def run_to_relative_position(
+    self, position: int = 0, speed: int = 500, *ports: int
+) -> bool:
+    """Run motor(s) to given relative position
+
+    Run the given motors to the position, waits until position is reached
+
+    Drehe die Motoren auf die Position, wartet bis die Position erreicht ist
+
+    Parameters / Parameter
+    ------------
+
+    position: int = 0 [degree]
+        Where the robot should turn to. \n
+        Auf welchen Wert sich der Roboter drehen soll. \n
+    speed: int = 500 [degree / second]
+        With which speed the robot should turn. \n
+        Mit welcher Geschwindigkeit der Roboter sich drehen soll. \n
+    ports: tuple[int, ...]
+        Which port should be used. \n
+        Welche Ports angesteuert werden sollen.
+
+    """
+    return Motion.run(self.__run_to_relative_position__(position, speed, *ports))
+
+def run_to_relative_position_async(self, *args, **kwargs):
+    """
+    Awaitable version of `run_to_relative_position`, takes the same parameters. \n
+    Awaitbare Version von `run_to_relative_position`, nimmt dieselben Parameter.
+    """
+    return Motion(self.__run_to_relative_position__(*args, **kwargs))
+
+def __run_to_relative_position__(
+    self, position: int = 0, speed: int = 500, *ports: int
+):
+    """
+    Maneuver generator of `run_to_relative_position`. \n
+    Manöver-Generator von `run_to_relative_position`.
+    """
+
+    def reached() -> bool:
+        """
+        Return whether the distance is reached
+        """
+        if position > 0 and current_pos >= position:
+            return True
+        elif position < 0 and current_pos <= position:
+            return True
+        else:
+            return False
+
+    def invert(port) -> int:
+        """
+        Return whether the speed should be inverted for this port
+        """
+        current_pos = motor.relative_position(port)
+        if (position - current_pos) > 0:
+            return -1
+        else:
+            return 1
+
+    ports_list = [port for port in ports]
+    if len(ports) == 0:
+        Logger.exception(40, "Please give ports")
+        return False
+    try:
+        for port in ports_list:
+            motor.run(port, invert(port) * speed)
+            pass
+    except Exception as e:
+        Logger.exception(
+            12, "run to relative position had following error: {}".format(
+                e)
+        )
+        return False
+    timer = LoopTimer(self.MOTORSTEP)
+    while True:
+        for port in ports_list:
+            current_pos = motor.relative_position(port)
+            if reached():
+                ports_list.remove(port)
+                motor.stop(port, stop=motor.SMART_COAST)
+        if len(ports_list) == 0:
+            break
+        yield timer.tick()
+    return True
+
+def attach_addition(self, attach: bool = True) -> bool:
+    """Attach/Detach the addition.
+
+    Attach or detach the addition of the robot.
+
+    Befestige oder Löse Aufsatz vom Roboter.
+
+    Parameters/Parameter
+    --------
+    attach: bool
+        In which state the addition should be set. \n
+        In welchen Zustand der Aufsatz gesetzt werden soll.
+    """
+    old_state = self.get_addition_state()
+    if attach and not old_state:
+        motor.run_to_absolute_position(
+            3, 95, 1000, direction=motor.SHORTEST_PATH)
+        return True
+    elif not attach and old_state:
+        motor.run_to_absolute_position(
+            3, 0, 1000, direction=motor.SHORTEST_PATH)
+        return True
+    else:
+        return False
+
+def reset_null(self, *ports: int):
+    """Reset given motor to zero
+
+    Reset the position of a given motor to absolute position zero.
+
+    Setze die Position von einem gegebenen Motor auf die absolute Position Null.
+
+    Parameters
+    ------
+
+    ports: tuple[int]
+    """
+    return Motion.run(self.__reset_null__(*ports))
+
+def __reset_null__(self, *ports: int):
+    """
+    Maneuver generator of `reset_null`. \n
+    Manöver-Generator von `reset_null`.
+    """
+    timer = LoopTimer(self.MOTORSTEP)
+    for port in ports:
+        motor.reset_relative_position(port, 0)
+        while True:
+            current_pos = motor.relative_position(port)
+            if abs(current_pos) == 0:
+                break
+            yield timer.tick()
+
+def stop_motor(self, *ports) -> bool:
+    """Stop given motor
+
+    Stop the motor(s) with given port(s)
+
+    ports: tuple[int]
+    """
+    try:
+        for port in ports:
+            motor.stop(port)
+        return True
+    except OSError:
+        Logger.exception(
+            621, "Given unavailable port(s) {}".format(str(ports)))
+        return False
+
+def get_addition_state(self) -> bool:
+    """
+    Return the state of the addition. \n
+    Gib den Zustand des Aufsatzes aus.
+
+    Returns / Ausgabe:
+    ----------
+    True: abs_pos == 80 - 100
+        Addition is connected. \n
+        Aufsatz ist verbunden. \n
+    False: abs_pos == -10 - 10 or 170 - 190
+        Addition is not connected. \n
+        Aufsatz ist gelöst.
+    """
+    if motor.absolute_position(3) in range(80, 100, 1):
+        self.addition_state = True
+        return True
+    elif motor.absolute_position(3) in range(-10, 10, 1):
+        self.addition_state = False
+        return False
+    elif motor.absolute_position(3) in range(170, 190, 1):
+        return False
+    else:
+        motor.run_to_absolute_position(
+            3, 0, 1000, direction=motor.SHORTEST_PATH)
+        Logger.debug(
+            "State {}° inbetweeen, open completely", motor.absolute_position(3))
+        self.addition_state = False
+        return False
+
+def convert_abs(self, abs_pos: int = 0) -> int:
+    return (abs_pos + 360) % 360
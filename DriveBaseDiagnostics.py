@@ -0,0 +1,66 @@
+"""
+Device detection of DriveBase. Loaded on first use by DriveBase.__getattr__. \n
+Geräteerkennung von DriveBase. Wird bei der ersten Benutzung geladen.
+"""
+
+import motor  # type: ignore
+import color_sensor  # type: ignore
+
+from Logger import Logger
+
+
+def auto_detect_device(self, device_type: int) -> list[int]:
+    devices = []
+    for i in range(6):
+        try:
+            if device_type == self.TYPEMOTOR:
+                motor.relative_position(i)
+            elif device_type == self.TYPECOLORSENS:
+                color_sensor.rgbi(i)
+            else:
+                Logger.exception(
+                    404, "Please specify a correct device_type: 0/1")
+                continue
+        except:
+            continue
+        devices.append(i)
+    if device_type == self.TYPECOLORSENS:
+        self.COLORSENS = devices[0]
+    return devices
+
+def detect_all_devices(self) -> dict[int, str]:
+    """Detect all connected devices on all ports
+
+    Scan all ports and identify which type of device is connected to each port.
+
+    Scanne alle Ports und identifiziere, welche Art von Gerät an jedem Port angeschlossen ist.
+
+    Returns / Ausgabe
+    -----
+    dict[int, str]
+        A dictionary mapping port numbers to device types ('motor', 'color_sensor', or 'none'). \n
+        Ein Dictionary, das Portnummern zu Gerätetypen zuordnet ('motor', 'color_sensor' oder 'none').
+    """
+    devices = {}
+    for port in range(6):
+        device_type = 'none'
+        
+        # Check for motor
+        try:
+            motor.relative_position(port)
+            device_type = 'motor'
+        except:
+            pass
+        
+        # Check for color sensor
+        if device_type == 'none':
+            try:
+                color_sensor.rgbi(port)
+                device_type = 'color_sensor'
+            except:
+                pass
+        
+        devices[port] = device_type
+    
+    Logger.debug("Device scan: {}", devices)
+    return devices
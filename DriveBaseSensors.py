@@ -0,0 +1,189 @@
+"""
+Sensor maneuvers of DriveBase: turning or driving until a color, a
+reflection or a collision. Loaded on first use by DriveBase.__getattr__. \n
+Sensor-Manöver von DriveBase: Drehen oder Fahren bis zu einer Farbe, einer
+Reflexion oder einer Kollision. Wird bei der ersten Benutzung geladen.
+"""
+
+import motor  # type: ignore
+import motor_pair  # type: ignore
+
+import time
+
+from DriveBase import LoopTimer, Motion, SensorSnapshot
+from Logger import Logger
+
+
+def turn_till_color(self, direction: int = 1, speed: int = 360, color_type: int = 0, color_gate: int = 700, timeout: int = -1):
+    """
+
+        direction (either -1 or 1 idk which is which, ig -1 is left and 1 is right)
+
+    """
+    return Motion.run(self.__turn_till_color__(direction, speed, color_type, color_gate, timeout))
+
+def __turn_till_color__(self, direction: int = 1, speed: int = 360, color_type: int = 0, color_gate: int = 700, timeout: int = -1):
+    """
+    Maneuver generator of `turn_till_color`. \n
+    Manöver-Generator von `turn_till_color`.
+    """
+
+    self.auto_detect_device(self.TYPECOLORSENS)
+    if timeout > 0:
+        motor_pair.move_for_time(
+            self.MOTPAIR, timeout, direction * 100, velocity=speed)
+    else:
+        motor_pair.move(self.MOTPAIR, direction * 100, velocity=speed)
+
+    snapshot = SensorSnapshot(
+        self, motion=False, color_mode=SensorSnapshot.COLOR_RGBI, color_type=color_type)
+    timer = LoopTimer(self.SENSORSTEP)
+    start_time = time.ticks_ms()
+
+    while True:
+        snapshot.read()
+
+        if snapshot.color <= color_gate:
+            break
+        elif timeout > 0 and time.ticks_diff(time.ticks_ms(), start_time) / 1000 > timeout:
+            if Logger.level <= Logger.DEBUG:
+                Logger.debug(time.ticks_diff(time.ticks_ms(), start_time) / 1000)
+            break
+        else:
+            yield timer.tick()
+    motor.stop(self.MOTPAIR)
+
+def turn_till_reflect(self, direction: int = 1, speed: int = 360, reflection_gate: int = 700, smaller_than: int = True, timeout: int = -1):
+    """
+
+        direction (either -1 or 1 idk which is which, ig -1 is left and 1 is right)
+
+    """
+    return Motion.run(self.__turn_till_reflect__(direction, speed, reflection_gate, smaller_than, timeout))
+
+def __turn_till_reflect__(self, direction: int = 1, speed: int = 360, reflection_gate: int = 700, smaller_than: int = True, timeout: int = -1):
+    """
+    Maneuver generator of `turn_till_reflect`. \n
+    Manöver-Generator von `turn_till_reflect`.
+    """
+
+    self.auto_detect_device(self.TYPECOLORSENS)
+    motor_pair.move(self.MOTPAIR, direction * 100, velocity=speed)
+
+    snapshot = SensorSnapshot(
+        self, motion=False, color_mode=SensorSnapshot.COLOR_REFLECTION)
+    timer = LoopTimer(self.SENSORSTEP)
+    start_time = time.ticks_ms()
+
+    while True:
+        snapshot.read()
+
+        if smaller_than and snapshot.color <= reflection_gate:
+            break
+        elif not smaller_than and snapshot.color >= reflection_gate:
+            break
+        elif timeout > 0 and time.ticks_diff(time.ticks_ms(), start_time) / 1000 > timeout:
+            if Logger.level <= Logger.DEBUG:
+                Logger.debug(time.ticks_diff(time.ticks_ms(), start_time) / 1000)
+            break
+        else:
+            yield timer.tick()
+    Logger.debug("turn_till_reflect finished")
+    motor.stop(self.MOTPAIR)
+
+def till_collide(self, speed, gate: int = 300, timeout: int = -1) -> float:
+    return Motion.run(self.__till_collide__(speed, gate, timeout))
+
+def till_collide_async(self, *args, **kwargs):
+    """
+    Awaitable version of `till_collide`, takes the same parameters. \n
+    Awaitbare Version von `till_collide`, nimmt dieselben Parameter.
+    """
+    return Motion(self.__till_collide__(*args, **kwargs))
+
+def __till_collide__(self, speed, gate: int = 300, timeout: int = -1):
+    """
+    Maneuver generator of `till_collide`. \n
+    Manöver-Generator von `till_collide`.
+    """
+    snapshot = SensorSnapshot(self, duty_cycle=True)
+    snapshot.read()
+    start_dist = snapshot.driven()
+
+    motor_pair.move(self.MOTPAIR, 0, velocity=speed)
+    yield 500
+    snapshot.read()
+    start_cycl = snapshot.duty
+    timer = LoopTimer(self.SENSORSTEP)
+    start_time = time.ticks_ms()
+    while True:
+        snapshot.read()
+        if self.collided(snapshot.duty, start_cycl, gate):
+            Logger.debug("Collided at duty cycle", snapshot.duty)
+            break
+        elif time.ticks_diff(time.ticks_ms(), start_time) / 1000 > timeout and timeout > 0:
+            if Logger.level <= Logger.DEBUG:
+                Logger.debug(abs(time.ticks_diff(time.ticks_ms(), start_time)) / 1000)
+            break
+        else:
+            yield timer.tick()
+    motor_pair.stop(self.MOTPAIR)
+
+    snapshot.read()
+    distance = ((snapshot.driven() - start_dist) * self.WHEELCIRC) / 360
+    return distance
+
+def till_color(self, speed: int, color_type: int = 0, color_gate: int = 700, timeout: int = -1):
+    return Motion.run(self.__till_color__(speed, color_type, color_gate, timeout))
+
+def till_color_async(self, *args, **kwargs):
+    """
+    Awaitable version of `till_color`, takes the same parameters. \n
+    Awaitbare Version von `till_color`, nimmt dieselben Parameter.
+    """
+    return Motion(self.__till_color__(*args, **kwargs))
+
+def __till_color__(self, speed: int, color_type: int = 0, color_gate: int = 700, timeout: int = -1):
+    """
+    Maneuver generator of `till_color`. \n
+    Manöver-Generator von `till_color`.
+    """
+    self.auto_detect_device(self.TYPECOLORSENS)
+    # if timeout > 0:
+    #     motor_pair.move_for_time(self.MOTPAIR, timeout, 0, velocity = speed)
+    # else:
+    motor_pair.move(self.MOTPAIR, 0, velocity=speed)
+
+    snapshot = SensorSnapshot(
+        self, motion=False, color_mode=SensorSnapshot.COLOR_RGBI, color_type=color_type)
+    timer = LoopTimer(self.SENSORSTEP)
+    start_time = time.ticks_ms()
+
+    loop = True
+
+    while loop:
+        snapshot.read()
+
+        if snapshot.color <= color_gate:
+            loop = False
+            break
+        elif timeout > 0 and time.ticks_diff(time.ticks_ms(), start_time) / 1000 > timeout:
+            loop = False
+            break
+        else:
+            yield timer.tick()
+        if not loop:
+            Logger.debug("Color loop left without break")
+    Logger.debug("till_color finished")
+    motor.stop(self.MOTPAIR)
+
+def around_kollision(self, timestamp, power, old_power, steering, speed):
+    # Logger.debug((timestamp, power, old_power))
+    motor_pair.move(self.MOTPAIR, steering, velocity=speed)
+
+def collided(self, cycl, start_cycl, gate: int = 300):
+    diff = cycl - start_cycl
+    if diff > gate:
+        return True
+    else:
+        return False
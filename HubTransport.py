@@ -0,0 +1,330 @@
+"""
+Persistent raw-REPL connection to a LEGO Spike Prime Hub.
+
+Every mpremote call opens the serial port and enters the raw REPL again.
+RawRepl keeps one link open and runs code, file transfers, hash checks and
+resets over it:
+
+    with RawRepl.serial('/dev/ttyACM0') as hub:
+        hub.put(data, '/flash/lib/Logger.py')
+        print(hub.sha256('/flash/lib/Logger.py'))
+
+The serial port needs pyserial (it comes with mpremote). For tests without a
+hub, simulator.fakehub.FakeHub answers the same protocol over a pty or a
+socket pair.
+"""
+
+import ast
+import binascii
+import hashlib
+import os
+import select
+import socket
+import time
+
+
+class HubError(Exception):
+    """Code run on the hub raised an exception, the message is its traceback."""
+
+
+class FdStream:
+    """Byte stream over a file descriptor, e.g. the master side of a pty."""
+
+    def __init__(self, fd: int):
+        self.fd = fd
+
+    def read(self, size: int, timeout: float) -> bytes:
+        """Return up to size bytes, empty after timeout seconds without data."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return os.read(self.fd, size) if ready else b''
+
+    def write(self, data: bytes) -> None:
+        while data:
+            data = data[os.write(self.fd, data):]
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SocketStream:
+    """Byte stream over a socket, e.g. one end of socket.socketpair()."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+
+    def read(self, size: int, timeout: float) -> bytes:
+        self.sock.settimeout(timeout)
+        try:
+            return self.sock.recv(size)
+        except (socket.timeout, BlockingIOError):
+            return b''
+
+    def write(self, data: bytes) -> None:
+        self.sock.sendall(data)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class SerialStream:
+    """Byte stream over a pyserial port."""
+
+    def __init__(self, port):
+        self.port = port
+
+    def read(self, size: int, timeout: float) -> bytes:
+        self.port.timeout = timeout
+        return self.port.read(max(1, min(size, self.port.in_waiting)))
+
+    def write(self, data: bytes) -> None:
+        self.port.write(data)
+
+    def close(self) -> None:
+        self.port.close()
+
+
+class RawRepl:
+    """
+    MicroPython raw REPL over one open stream.
+
+    Protocol: Ctrl-A enters the raw REPL, code ends with Ctrl-D, the hub
+    answers "OK", the output, Ctrl-D, the error output, Ctrl-D and ">".
+    Globals stay defined between exec() calls until a soft reset.
+
+    The USB input buffer of the hub is small, code is never written in one
+    go: in raw-paste mode (Ctrl-E A Ctrl-A) the hub grants windows of bytes
+    it has room for, firmware without it gets 256 byte pieces every 10 ms
+    like mpremote sends them.
+    """
+
+    BANNER = b'raw REPL; CTRL-B to exit\r\n>'
+    # Plain raw REPL: bytes per write and pause after each
+    PIECE = 256
+    PIECE_DELAY = 0.01
+
+    def __init__(self, stream, timeout: float = 10):
+        """
+        Args:
+            stream: Object with read(size, timeout), write(data) and close()
+            timeout: Seconds to wait for an answer of the hub
+        """
+        self.stream = stream
+        self.timeout = timeout
+        self.raw = False
+        self.buffer = b''
+        # None until the hub answered whether it knows raw-paste mode
+        self.raw_paste = None
+
+    @staticmethod
+    def serial(port: str, baudrate: int = 115200, timeout: float = 10) -> 'RawRepl':
+        """
+        Open a hub on a serial port and enter the raw REPL.
+
+        Raises:
+            RuntimeError: If pyserial is not installed
+        """
+        try:
+            import serial
+        except ImportError:
+            raise RuntimeError("The serial transport needs pyserial: pip install pyserial")
+        link = RawRepl(SerialStream(serial.Serial(port, baudrate, timeout=timeout)), timeout)
+        link.enter()
+        return link
+
+    def __enter__(self):
+        if not self.raw:
+            self.enter()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def read_until(self, ending: bytes, timeout: float = None) -> bytes:
+        """
+        Read up to and including the next `ending`, bytes after it stay buffered.
+
+        Raises:
+            TimeoutError: If the hub stops sending before
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            index = self.buffer.find(ending)
+            if index >= 0:
+                data, self.buffer = self.buffer[:index + len(ending)], self.buffer[index + len(ending):]
+                return data
+            remaining = deadline - time.monotonic()
+            chunk = self.stream.read(256, remaining) if remaining > 0 else b''
+            if not chunk:
+                raise TimeoutError(f"Hub did not answer, waiting for {ending!r}, got {self.buffer[-80:]!r}")
+            self.buffer += chunk
+
+    def read_exactly(self, size: int) -> bytes:
+        """Read `size` bytes, see read_until()."""
+        deadline = time.monotonic() + self.timeout
+        while len(self.buffer) < size:
+            remaining = deadline - time.monotonic()
+            chunk = self.stream.read(256, remaining) if remaining > 0 else b''
+            if not chunk:
+                raise TimeoutError(f"Hub did not answer, waiting for {size} bytes, got {self.buffer!r}")
+            self.buffer += chunk
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def enter(self) -> None:
+        """Interrupt a running program and enter the raw REPL."""
+        # Ctrl-C twice stops a program, Ctrl-A switches to the raw REPL
+        self.stream.write(b'\r\x03\x03')
+        time.sleep(0.05)
+        self.stream.write(b'\r\x01')
+        self.read_until(self.BANNER)
+        self.buffer = b''
+        self.raw = True
+
+    def exec_raw(self, code: str) -> tuple:
+        """
+        Run code on the hub.
+
+        Returns:
+            tuple: (output, error output) as bytes
+        """
+        data = code.encode()
+        if self.raw_paste is not False:
+            self.stream.write(b'\x05A\x01')
+            answer = self.read_exactly(2)
+            if answer == b'R\x01':
+                self.raw_paste = True
+                self.write_raw_paste(data)
+            else:
+                if answer != b'R\x00':
+                    # Firmware without raw-paste takes the bytes as code and answers with the banner
+                    self.read_until(self.BANNER)
+                self.raw_paste = False
+        if not self.raw_paste:
+            for offset in range(0, len(data), self.PIECE):
+                self.stream.write(data[offset:offset + self.PIECE])
+                time.sleep(self.PIECE_DELAY)
+            self.stream.write(b'\x04')
+            self.read_until(b'OK')
+        output = self.read_until(b'\x04')[:-1]
+        error = self.read_until(b'\x04')[:-1]
+        self.read_until(b'>')
+        return output, error
+
+    def write_raw_paste(self, data: bytes) -> None:
+        """Send code in raw-paste mode, never more than the hub granted."""
+        window = int.from_bytes(self.read_exactly(2), 'little')
+        remaining = window
+        offset = 0
+        while offset < len(data):
+            # Ctrl-A grants another window, Ctrl-D means the hub stopped reading
+            while remaining == 0 or self.buffer or self.stream_ready():
+                flag = self.read_exactly(1)
+                if flag == b'\x01':
+                    remaining += window
+                elif flag == b'\x04':
+                    self.stream.write(b'\x04')
+                    return
+                else:
+                    raise HubError(f"Unexpected answer in raw-paste mode: {flag!r}")
+            piece = data[offset:offset + remaining]
+            self.stream.write(piece)
+            remaining -= len(piece)
+            offset += len(piece)
+        self.stream.write(b'\x04')
+        # The hub acknowledges the end of the code with Ctrl-D, then runs it
+        self.read_until(b'\x04')
+
+    def stream_ready(self) -> bool:
+        """Return whether the hub sent bytes that were not read yet."""
+        chunk = self.stream.read(256, 0)
+        self.buffer += chunk
+        return bool(chunk)
+
+    def exec(self, code: str) -> str:
+        """
+        Run code on the hub.
+
+        Returns:
+            str: Everything the code printed
+
+        Raises:
+            HubError: With the traceback if the code raised an exception
+        """
+        output, error = self.exec_raw(code)
+        if error:
+            raise HubError(error.decode(errors='replace').strip())
+        return output.decode(errors='replace')
+
+    def eval(self, expression: str):
+        """Return the value of a Python literal expression evaluated on the hub."""
+        return ast.literal_eval(self.exec(f"print(repr({expression}))").strip())
+
+    def put(self, data: bytes, remote_path: str, chunk_size: int = 256) -> None:
+        """Write bytes to a file on the hub."""
+        self.exec(f"f = open({remote_path!r}, 'wb')\nw = f.write")
+        for offset in range(0, len(data), chunk_size):
+            self.exec(f"w({data[offset:offset + chunk_size]!r})")
+        self.exec("f.close()")
+
+    def get(self, remote_path: str, chunk_size: int = 256) -> bytes:
+        """Read a file from the hub."""
+        output = self.exec(
+            "import binascii\n"
+            f"with open({remote_path!r}, 'rb') as f:\n"
+            "    while True:\n"
+            f"        block = f.read({chunk_size})\n"
+            "        if not block:\n"
+            "            break\n"
+            "        print(binascii.hexlify(block).decode())"
+        )
+        return b''.join(binascii.unhexlify(line.strip()) for line in output.splitlines() if line.strip())
+
+    def sha256(self, remote_path: str) -> str:
+        """
+        Returns:
+            str: SHA-256 hex digest of a file on the hub, computed there,
+                None if the file does not exist
+        """
+        output = self.exec(
+            "import binascii, hashlib\n"
+            "try:\n"
+            f"    with open({remote_path!r}, 'rb') as f:\n"
+            "        h = hashlib.sha256()\n"
+            "        while True:\n"
+            "            block = f.read(512)\n"
+            "            if not block:\n"
+            "                break\n"
+            "            h.update(block)\n"
+            "    print(binascii.hexlify(h.digest()).decode())\n"
+            "except OSError:\n"
+            "    print('-')"
+        ).strip()
+        return None if output == '-' else output
+
+    def soft_reset(self) -> None:
+        """Soft reset the hub and stay in the raw REPL, globals are cleared."""
+        self.stream.write(b'\x04')
+        self.read_until(b'soft reboot\r\n')
+        self.read_until(self.BANNER)
+
+    def close(self, reset: bool = True) -> None:
+        """
+        Leave the raw REPL and close the link.
+
+        Args:
+            reset: Soft reset in the normal REPL, so the hub returns to normal operation
+        """
+        try:
+            if self.raw:
+                self.stream.write(b'\x02')
+                if reset:
+                    self.stream.write(b'\x04')
+                self.raw = False
+        finally:
+            self.stream.close()
+
+
+def file_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest RawRepl.sha256() returns for the same content."""
+    return hashlib.sha256(data).hexdigest()
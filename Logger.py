@@ -1,27 +1,219 @@
 import hub # type: ignore
 
+import os
 import time
 import math
 
 class Logger:
+    """
+        Console and hub display messages with log levels.
+        Messages below `Logger.level` return after one integer
+        comparison, their text is only put together when it is printed.
+        In hot loops guard the call itself, so not even the arguments
+        are computed: `if Logger.level <= Logger.DEBUG: Logger.debug(...)` \n
+        While a maneuver runs, messages are queued in a bounded buffer and
+        written by `flush()`, which `Motion.run` calls in the idle time
+        between maneuver ticks, so a maneuver never waits on the console,
+        a file or the display. Outside maneuvers and for errors they are
+        written at once, so a crash right after them cannot lose them. \n
+        Nachrichten für Konsole und Hub-Anzeige mit Log-Stufen.
+        Nachrichten unter `Logger.level` kosten nur einen Zahlenvergleich,
+        ihr Text wird erst beim Ausgeben zusammengesetzt.
+        Während ein Manöver läuft, landen Nachrichten in einem begrenzten
+        Puffer und werden von `flush()` in den Pausen zwischen zwei
+        Manöverschritten ausgegeben. Außerhalb von Manövern und bei Fehlern
+        werden sie sofort geschrieben.
+    """
+
+    DEBUG = 10
+    INFO = 20
+    ERROR = 40
+    OFF = 100
+
+    level = DEBUG
+
+    # Queue of (prefix, message, args), a ring of `size` slots
+    size = 32
+    records = [None] * 32
+    head = 0
+    pending = 0
+    dropped = 0
+    # Maneuvers running in Motion.run, messages are only queued while one runs
+    running = 0
+
+    # Newest code for the light matrix and the one shown right now
+    code = None
+    shown_code = None
+
+    path = None
+    max_file_size = 16384
+    file_size = 0
+
+    # [ms] Only flush inside a pause that is at least this long
+    FLUSH_SLACK = 10
+
+    @staticmethod
+    def set_level(level: int):
+        """
+            Only print messages of this level and above,
+            e.g. Logger.INFO for the competition. \n
+            Gib nur Nachrichten ab dieser Stufe aus,
+            z.B. Logger.INFO für den Wettbewerb.
+        """
+        Logger.level = level
+
+    @staticmethod
+    def configure(buffer_size: int = 32, path: str = None, max_file_size: int = 16384):
+        """
+            Set up the message buffer and the log file.
+            buffer_size 0 prints every message at once, like before.
+            With a path, e.g. "/flash/log.txt", every message is also
+            appended there; above max_file_size bytes the file is moved
+            to path + ".1" and a new one is started. \n
+            Richte den Nachrichtenpuffer und die Logdatei ein.
+            Bei buffer_size 0 wird jede Nachricht sofort ausgegeben.
+            Mit path wird jede Nachricht zusätzlich in die Datei geschrieben,
+            über max_file_size Bytes wird sie nach path + ".1" verschoben.
+        """
+        Logger.flush()
+        Logger.size = buffer_size
+        Logger.records = [None] * buffer_size
+        Logger.head = 0
+        Logger.pending = 0
+        Logger.path = path
+        Logger.max_file_size = max_file_size
+        Logger.file_size = 0
+        if path:
+            try:
+                Logger.file_size = os.stat(path)[6]
+            except OSError:
+                pass
+
+    @staticmethod
+    def __text__(message, args) -> str:
+        """
+            Put the message together: "{}" fields are filled with
+            the arguments, otherwise they are appended. \n
+            Setze die Nachricht zusammen: "{}" wird mit den Argumenten
+            gefüllt, sonst werden sie angehängt.
+        """
+        message = str(message)
+        if not args:
+            return message
+        try:
+            if "{" in message:
+                return message.format(*args)
+            return message + " " + " ".join(map(str, args))
+        except:
+            return message
+
+    @staticmethod
+    def __queue__(prefix: str, message, args):
+        """
+            Queue a record, or write it at once without a buffer or
+            outside a maneuver. A full buffer counts the message as
+            dropped instead of waiting. \n
+            Reihe eine Nachricht ein, ohne Puffer oder außerhalb eines
+            Manövers wird sie sofort geschrieben.
+            Ist der Puffer voll, wird sie gezählt statt zu warten.
+        """
+        if not Logger.size or not Logger.running:
+            # Older queued messages first
+            Logger.flush()
+            Logger.__write__(prefix, message, args)
+            Logger.__show_code__()
+            return
+        if Logger.pending >= Logger.size:
+            Logger.dropped += 1
+            return
+        Logger.records[(Logger.head + Logger.pending) % Logger.size] = (prefix, message, args)
+        Logger.pending += 1
+
+    @staticmethod
+    def __write__(prefix: str, message, args):
+        line = "[{}] {}".format(prefix, Logger.__text__(message, args))
+        print(line)
+        if Logger.path:
+            Logger.__append__(line)
+
+    @staticmethod
+    def __append__(line: str):
+        """
+            Append a line to the log file and rotate it when it is full. \n
+            Hänge eine Zeile an die Logdatei an und rotiere sie, wenn sie voll ist.
+        """
+        try:
+            if Logger.file_size + len(line) + 1 > Logger.max_file_size:
+                try:
+                    os.remove(Logger.path + ".1")
+                except OSError:
+                    pass
+                os.rename(Logger.path, Logger.path + ".1")
+                Logger.file_size = 0
+            with open(Logger.path, "a") as file:
+                file.write(line + "\n")
+            Logger.file_size += len(line) + 1
+        except OSError:
+            # A full or missing flash must not stop the program
+            Logger.path = None
+
+    @staticmethod
+    def __show_code__():
+        if Logger.code != Logger.shown_code:
+            Logger.shown_code = Logger.code
+            hub.light_matrix.write(str(Logger.code))
+
+    @staticmethod
+    def flush(limit: int = -1):
+        """
+            Write up to `limit` queued messages, all with -1, and show
+            only the newest code on the light matrix. \n
+            Schreibe bis zu `limit` Nachrichten aus dem Puffer, alle bei -1,
+            und zeige nur den neuesten Code auf der Lichtmatrix.
+        """
+        while Logger.pending and limit:
+            record = Logger.records[Logger.head]
+            Logger.records[Logger.head] = None
+            Logger.head = (Logger.head + 1) % Logger.size
+            Logger.pending -= 1
+            Logger.__write__(record[0], record[1], record[2])
+            limit -= 1
+        if Logger.dropped and not Logger.pending:
+            dropped = Logger.dropped
+            Logger.dropped = 0
+            Logger.__write__("WARN", "{} log messages dropped, buffer full", (dropped,))
+        Logger.__show_code__()
+
+    @staticmethod
+    def idle(duration: int):
+        """
+            Sleep `duration` ms and use the time to flush messages. \n
+            Schlafe `duration` ms und nutze die Zeit, um Nachrichten auszugeben.
+        """
+        if Logger.pending and duration >= Logger.FLUSH_SLACK:
+            start = time.ticks_ms()
+            Logger.flush(1)
+            duration -= time.ticks_diff(time.ticks_ms(), start)
+        if duration > 0:
+            time.sleep_ms(duration)
+
     @staticmethod
     def debug(message, *args):
         """
-            Print a debug message to the Console. 
+            Print a debug message to the Console.
             Use as many arguments as you want! \n
             Gebe eine Debug-Nachricht in die Konsole aus.
             Nutze so viele Argumente wie du möchtest!
         """
-        try:
-            print("[DEBUG] {}".format(str(message) + " " + " ".join(map(str, args))))
-        except:
-            print("[DEBUG] {}".format(str(message)))
+        if Logger.level > Logger.DEBUG:
+            return
+        Logger.__queue__("DEBUG", message, args)
 
     @staticmethod
     def info(message, *args, code = None):
         """
-            Print a info message to the Console. 
-            Use as many arguments as you want! 
+            Print a info message to the Console.
+            Use as many arguments as you want!
             Additionally you can add a code to be displayed
             on the Spike Prime Hub. \n
             Gebe eine Info-Nachricht in die Konsole aus.
@@ -29,25 +221,26 @@ class Logger:
             Zusätzlich kannst du einen "code" auf dem
             Spike Prime Hub anzeigen lassen.
         """
+        if Logger.level > Logger.INFO:
+            return
         if code != None:
-            hub.light_matrix.write(str(code))
-        try:
-            print("[INFO] {}".format(message + " " + " ".join(map(str, args))))
-        except:
-            print("[INFO] {}".format(message))
+            Logger.code = code
+        Logger.__queue__("INFO", message, args)
 
     @staticmethod
     def exception(code: int, message, *args):
         """
-            Print a error message to the Console. 
-            Use as many arguments as you want! 
-            Every Exception also has a error number! \n
+            Print a error message to the Console.
+            Use as many arguments as you want!
+            Every Exception also has a error number!
+            Errors are written at once, also during a maneuver. \n
             Gebe eine Error-Nachricht in die Konsole aus.
             Nutze so viele Argumente wie du möchtest!
             Immer einen Fehlercode angeben!
+            Fehler werden sofort geschrieben, auch während eines Manövers.
         """
-        hub.light_matrix.write(str(code))
-        try:
-            print("[ERROR] {}".format(message + " " + " ".join(map(str, args))))
-        except:
-            print("[ERROR] {}".format(message))
\ No newline at end of file
+        if Logger.level > Logger.ERROR:
+            return
+        Logger.code = code
+        Logger.__queue__("ERROR", message, args)
+        Logger.flush()
@@ -1,14 +1,44 @@
 """
 Upload library files to LEGO Spike Prime Hub using mpremote.
 
-This script uploads DriveBase.py and Logger.py to the /flash/lib/ directory
-on the LEGO hub, making them available for import in programs.
+This script uploads DriveBase.py, its add-on modules and Logger.py to the
+/flash/lib/ directory on the LEGO hub, making them available for import in programs.
 Uses a virtual environment for isolated mpremote installation.
+
+With --strip-debug every Logger.debug call and every
+`if Logger.level <= Logger.DEBUG:` block is removed from the uploaded copies,
+for a lean competition build without editing the sources.
+
+With --sync the libraries are found from the imports of Controller.py and
+only files whose content hash differs from the manifest on the hub are
+copied, all in one mpremote session that ends with a soft reset.
+
+With --mpy the libraries are stripped of docstrings and cross-compiled to
+.mpy bytecode with mpy-cross, so the hub does not compile them at import.
+Builds are cached in .build/ by content hash; without mpy-cross, or if it
+fails, the stripped source is uploaded instead. The .mpy version of
+mpy-cross has to match the hub firmware, install the matching release into
+.venv (pip install mpy-cross==<firmware MicroPython version>).
+
+With --all every connected LEGO hub is synced at the same time, each upload
+is verified by reading the content hashes back, and a report shows the time,
+free flash and library version per hub.
+
+With --port the same sync and check run over one persistent raw-REPL
+connection (HubTransport.py) instead of a new mpremote process per step,
+which saves reopening the port and re-entering the raw REPL every time.
 """
 
+import argparse
+import ast
+import concurrent.futures
+import hashlib
+import json
+import shutil
 import subprocess
 import sys
 import os
+import tempfile
 import time
 
 
@@ -17,6 +47,12 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 VENV_DIR = os.path.join(SCRIPT_DIR, '.venv')
 VENV_PYTHON = os.path.join(VENV_DIR, 'Scripts' if os.name == 'nt' else 'bin', 'python')
 VENV_MPREMOTE = os.path.join(VENV_DIR, 'Scripts' if os.name == 'nt' else 'bin', 'mpremote')
+VENV_MPY_CROSS = os.path.join(VENV_DIR, 'Scripts' if os.name == 'nt' else 'bin', 'mpy-cross')
+BUILD_DIR = os.path.join(SCRIPT_DIR, '.build')
+
+LIB_DIR = '/flash/lib'
+LEGO_VENDOR_ID = '0694'
+MANIFEST = LIB_DIR + '/manifest.json'
 
 
 def ensure_venv() -> bool:
@@ -69,6 +105,16 @@ def ensure_venv() -> bool:
         return False
 
 
+def mpremote(device: str = None) -> list:
+    """
+    Return the start of an mpremote command line, bound to `device` if given.
+
+    Args:
+        device: Serial port of the hub, e.g. /dev/ttyACM0 or COM3; None for the first one
+    """
+    return [VENV_MPREMOTE, 'connect', device] if device else [VENV_MPREMOTE]
+
+
 def test_connection() -> bool:
     """
     Test connection to the LEGO hub.
@@ -106,42 +152,196 @@ def soft_reset() -> None:
         pass
 
 
-def upload_libraries() -> bool:
+def _is_debug_call(node: ast.AST) -> bool:
+    """Return whether node is a call of Logger.debug(...)."""
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == 'debug'
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == 'Logger'
+    )
+
+
+def _is_debug_guard(node: ast.AST) -> bool:
+    """Return whether node is the test `Logger.level <= Logger.DEBUG`."""
+    return (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and isinstance(node.ops[0], ast.LtE)
+        and ast.dump(node.left) == ast.dump(ast.parse('Logger.level', mode='eval').body)
+        and ast.dump(node.comparators[0]) == ast.dump(ast.parse('Logger.DEBUG', mode='eval').body)
+    )
+
+
+class DebugStripper(ast.NodeTransformer):
+    """Remove Logger.debug statements and debug-guarded blocks from a module."""
+
+    def visit_Expr(self, node: ast.Expr):
+        if _is_debug_call(node.value):
+            return None
+        return node
+
+    def visit_If(self, node: ast.If):
+        self.generic_visit(node)
+        if _is_debug_guard(node.test):
+            return node.orelse or None
+        return node
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        super().generic_visit(node)
+        # A block that only held debug output still needs a statement
+        if isinstance(getattr(node, 'body', None), list) and not node.body:
+            node.body = [ast.Pass()]
+        return node
+
+
+def strip_debug(source: str) -> str:
+    """
+    Remove all debug logging from Python source.
+
+    Args:
+        source: Source code of a library
+
+    Returns:
+        str: The source without Logger.debug calls and debug-guarded blocks.
+            Comments and formatting are not kept, the code is unchanged otherwise.
+    """
+    tree = DebugStripper().visit(ast.parse(source))
+    return ast.unparse(ast.fix_missing_locations(tree)) + "\n"
+
+
+class DocstringStripper(ast.NodeTransformer):
+    """Remove the docstrings of the module, its classes and functions."""
+
+    def _strip(self, node: ast.AST) -> ast.AST:
+        self.generic_visit(node)
+        body = node.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            node.body = body[1:] or [ast.Pass()]
+        return node
+
+    visit_Module = _strip
+    visit_ClassDef = _strip
+    visit_FunctionDef = _strip
+    visit_AsyncFunctionDef = _strip
+
+
+def strip_docstrings(source: str) -> str:
+    """
+    Remove all docstrings from Python source, the bilingual ones are most of DriveBase.py.
+
+    Args:
+        source: Source code of a library
+
+    Returns:
+        str: The source without docstrings, formatted by ast.unparse()
     """
-    Upload DriveBase.py and Logger.py to /flash/lib/ on the LEGO hub.
+    tree = DocstringStripper().visit(ast.parse(source))
+    return ast.unparse(ast.fix_missing_locations(tree)) + "\n"
+
+
+def find_mpy_cross() -> str:
+    """
+    Returns:
+        str: The mpy-cross of the virtual environment or the PATH, None if there is none
+    """
+    if os.path.exists(VENV_MPY_CROSS):
+        return VENV_MPY_CROSS
+    return shutil.which('mpy-cross')
+
+
+def mpy_cross_version(tool: str) -> str:
+    """
+    Returns:
+        str: The version line of mpy-cross, None if it does not run
+    """
+    try:
+        result = subprocess.run([tool, '--version'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def compile_mpy(name: str, source: bytes, tool: str, version: str) -> bytes:
+    """
+    Cross-compile a library to .mpy bytecode, cached by content hash.
+
+    Args:
+        name: File name of the library, e.g. DriveBase.py, used in tracebacks
+        source: The source as it would be uploaded
+        tool: Path of mpy-cross
+        version: Its version line, part of the cache key
+
+    Returns:
+        bytes: The bytecode, None if mpy-cross failed
+    """
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    key = content_hash(source + version.encode())[:16]
+    stem = os.path.splitext(name)[0]
+    target = os.path.join(BUILD_DIR, f"{stem}-{key}.mpy")
+    if not os.path.exists(target):
+        source_path = os.path.join(BUILD_DIR, f"{stem}-{key}.py")
+        with open(source_path, 'wb') as file:
+            file.write(source)
+        result = subprocess.run(
+            [tool, '-o', target, '-s', name, source_path], capture_output=True, text=True
+        )
+        os.remove(source_path)
+        if result.returncode != 0:
+            print(f"✗ mpy-cross failed for {name}: {result.stderr.strip()}")
+            return None
+    with open(target, 'rb') as file:
+        return file.read()
+
+
+def upload_libraries(strip: bool = False) -> bool:
+    """
+    Upload DriveBase.py, its add-on modules and Logger.py to /flash/lib/ on the LEGO hub.
+    Replaces the manifest with their hashes, so a later sync compares against them.
     
+    Args:
+        strip: Upload copies without debug logging, see strip_debug()
+
     Returns:
         bool: True if successful, False otherwise
     """
-    drivebase_path = os.path.join(SCRIPT_DIR, 'DriveBase.py')
-    logger_path = os.path.join(SCRIPT_DIR, 'Logger.py')
-    
+    paths = discover_libraries()
+    names = [os.path.basename(path) for path in paths]
+
     # Verify files exist
-    if not os.path.exists(drivebase_path):
-        print(f"✗ Error: DriveBase.py not found at {drivebase_path}")
-        return False
-    
-    if not os.path.exists(logger_path):
-        print(f"✗ Error: Logger.py not found at {logger_path}")
-        return False
+    for required in ('DriveBase.py', 'Logger.py'):
+        if required not in names:
+            print(f"✗ Error: {required} not found in {SCRIPT_DIR}")
+            return False
     
+    built = build_libraries(paths, strip)
+    if strip:
+        print("✓ Debug logging stripped")
+
     print("Uploading libraries to LEGO hub...")
     
     # Create /flash/lib directory and upload files
-    commands = [
-        VENV_MPREMOTE,
-        'exec', "import os\ntry:\n    os.mkdir('/flash/lib')\nexcept OSError:\n    pass",
-        '+',
-        'cp', drivebase_path, ':/flash/lib/DriveBase.py',
-        '+',
-        'cp', logger_path, ':/flash/lib/Logger.py'
-    ]
-    
-    result = subprocess.run(commands, capture_output=True, text=True)
+    with tempfile.TemporaryDirectory(prefix='spike_build_') as build_dir:
+        commands = [VENV_MPREMOTE, 'exec', MKDIR_CODE]
+        for name, data in built.items():
+            target = os.path.join(build_dir, name)
+            with open(target, 'wb') as file:
+                file.write(data)
+            commands += ['+', 'cp', target, ':' + LIB_DIR + '/' + name]
+        # The manifest has to describe what is on the hub now, or a later
+        # sync skips libraries this upload replaced
+        manifest_path = os.path.join(build_dir, 'manifest.json')
+        with open(manifest_path, 'w') as file:
+            json.dump({name: content_hash(data) for name, data in built.items()}, file)
+        commands += ['+', 'cp', manifest_path, ':' + MANIFEST]
+
+        result = subprocess.run(commands, capture_output=True, text=True)
     
     if result.returncode == 0:
-        print("✓ DriveBase.py uploaded successfully")
-        print("✓ Logger.py uploaded successfully")
+        for name in names:
+            print(f"✓ {name} uploaded successfully")
         
         # Soft reset to exit REPL mode
         print("\nResetting hub to normal operation mode...")
@@ -157,8 +357,535 @@ def upload_libraries() -> bool:
         return False
 
 
+def discover_libraries(entry: str = 'Controller.py') -> list:
+    """
+    Find the local modules a program imports, directly or through other local modules.
+
+    Args:
+        entry: The program that runs on the hub, relative to the repository
+
+    Returns:
+        list: Paths of the imported modules next to the program, in import order
+    """
+    found = []
+    pending = [os.path.join(SCRIPT_DIR, entry)]
+    seen = set(pending)
+    while pending:
+        with open(pending.pop(0), encoding='utf-8') as file:
+            tree = ast.parse(file.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                path = os.path.join(SCRIPT_DIR, name.split('.')[0] + '.py')
+                if path not in seen and os.path.exists(path):
+                    seen.add(path)
+                    found.append(path)
+                    pending.append(path)
+    return found
+
+
+def content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest the manifest stores for a file."""
+    return hashlib.sha256(data).hexdigest()
+
+
+# Runs on the hub: prints the manifest, {} without one, and the files in the library folder
+MANIFEST_CODE = (
+    "import os\n"
+    "try:\n"
+    "    print(open('" + MANIFEST + "').read())\n"
+    "except OSError:\n"
+    "    print('{}')\n"
+    "try:\n"
+    "    print(repr(os.listdir('" + LIB_DIR + "')))\n"
+    "except OSError:\n"
+    "    print('[]')"
+)
+MKDIR_CODE = "import os\ntry:\n    os.mkdir('" + LIB_DIR + "')\nexcept OSError:\n    pass"
+
+
+def parse_manifest(output: str) -> tuple:
+    """
+    Returns:
+        tuple: (file name to content hash, files in the library folder) from the output of MANIFEST_CODE
+    """
+    lines = output.strip().splitlines()
+    try:
+        manifest = json.loads(lines[-2])
+    except (IndexError, ValueError):
+        manifest = {}
+    try:
+        files = ast.literal_eval(lines[-1])
+    except (IndexError, ValueError, SyntaxError):
+        files = None
+    return manifest, files
+
+
+def read_manifest(device: str = None) -> tuple:
+    """
+    Read the manifest of the uploaded libraries and the library folder from the hub.
+    Doubles as the connection test, it is the only extra mpremote call of a sync.
+
+    Args:
+        device: Serial port of the hub, None for the first one
+
+    Returns:
+        tuple: (file name to content hash, empty without a manifest; files in the library folder,
+            None if unknown), None if the hub is not reachable
+    """
+    result = subprocess.run(mpremote(device) + ['exec', MANIFEST_CODE], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return parse_manifest(result.stdout)
+
+
+def build_libraries(paths: list, strip: bool = False, mpy: bool = False) -> dict:
+    """
+    Read the libraries as they go to the hub.
+
+    Args:
+        paths: Local source files
+        strip: Remove debug logging, see strip_debug()
+        mpy: Remove docstrings and compile to .mpy, see compile_mpy().
+            Libraries that cannot be compiled stay stripped source.
+
+    Returns:
+        dict: File name to the bytes to upload
+    """
+    tool = version = None
+    if mpy:
+        tool = find_mpy_cross()
+        version = tool and mpy_cross_version(tool)
+        if not version:
+            print("✗ mpy-cross not found, uploading source without docstrings")
+    built = {}
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            source = file.read()
+        if strip:
+            source = strip_debug(source)
+        if mpy:
+            source = strip_docstrings(source)
+        name = os.path.basename(path)
+        data = source.encode('utf-8')
+        if version:
+            bytecode = compile_mpy(name, data, tool, version)
+            if bytecode is not None:
+                name, data = os.path.splitext(name)[0] + '.mpy', bytecode
+        built[name] = data
+    return built
+
+
+def counterpart(name: str) -> str:
+    """Return the other form of a library, DriveBase.mpy for DriveBase.py and back."""
+    stem, extension = os.path.splitext(name)
+    return stem + ('.py' if extension == '.mpy' else '.mpy')
+
+
+def plan_sync(built: dict, manifest: dict, force: bool = False, files: list = None) -> tuple:
+    """
+    Compare the built libraries with the manifest of the hub.
+
+    Args:
+        files: Files in the library folder on the hub, None if unknown
+
+    Returns:
+        tuple: (names to upload, names to remove from the hub, manifest after the upload)
+    """
+    hashes = {name: content_hash(data) for name, data in built.items()}
+    # The hub imports a .py before a .mpy of the same name, the old form has to go,
+    # also when an upload without manifest put it there
+    present = set(manifest) | set(files or ())
+    stale = [counterpart(name) for name in built if files is None or counterpart(name) in present]
+    changed = [
+        name for name in built
+        if force or manifest.get(name) != hashes[name] or counterpart(name) in present
+    ]
+    # Keep the entries of libraries this program does not need
+    manifest = {name: value for name, value in manifest.items() if name not in stale}
+    manifest.update(hashes)
+    return changed, stale, manifest
+
+
+def sync_libraries(
+    entry: str = 'Controller.py',
+    strip: bool = False,
+    force: bool = False,
+    mpy: bool = False,
+    device: str = None,
+    built: dict = None,
+    reset: bool = True,
+) -> bool:
+    """
+    Upload only the libraries whose content changed since the last upload.
+
+    Args:
+        entry: The program whose imports decide which libraries are needed
+        strip: Upload copies without debug logging, see strip_debug()
+        force: Upload every library, ignoring the manifest on the hub
+        mpy: Upload .mpy bytecode, see build_libraries()
+        device: Serial port of the hub, None for the first one
+        built: Libraries from build_libraries(), to build once for several hubs
+        reset: Soft reset the hub at the end of the session
+
+    Returns:
+        bool: True if the hub is up to date, False otherwise
+    """
+    label = f"[{device}] " if device else ""
+    if built is None:
+        built = build_libraries(discover_libraries(entry), strip, mpy)
+    if not built:
+        print(f"✗ {entry} imports no local libraries")
+        return False
+    state = read_manifest(device)
+    if state is None:
+        print(f"✗ {label}Connection failed. Please ensure the LEGO hub is connected via USB")
+        return False
+
+    changed, stale, manifest = plan_sync(built, state[0], force, state[1])
+    for name in built:
+        print(f"{label}{'↑' if name in changed else '='} {name}")
+    if not changed:
+        print(f"✓ {label}Libraries are up to date")
+        return True
+
+    with tempfile.TemporaryDirectory(prefix='spike_sync_') as build_dir:
+        commands = mpremote(device) + [
+            'exec', MKDIR_CODE,
+        ]
+        if stale:
+            paths = ", ".join(repr(LIB_DIR + '/' + name) for name in stale)
+            commands += [
+                '+', 'exec',
+                "import os\nfor path in [" + paths + "]:\n    try:\n        os.remove(path)\n    except OSError:\n        pass",
+            ]
+        for name in changed:
+            target = os.path.join(build_dir, name)
+            with open(target, 'wb') as file:
+                file.write(built[name])
+            commands += ['+', 'cp', target, ':' + LIB_DIR + '/' + name]
+        manifest_path = os.path.join(build_dir, 'manifest.json')
+        with open(manifest_path, 'w') as file:
+            json.dump(manifest, file)
+        commands += ['+', 'cp', manifest_path, ':' + MANIFEST]
+        if reset:
+            commands += ['+', 'soft-reset']
+
+        start = time.time()
+        result = subprocess.run(commands, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        print(f"✗ {label}Upload failed: {result.stderr}")
+        return False
+    print(f"✓ {label}{len(changed)} of {len(built)} libraries uploaded in {time.time() - start:.1f} s")
+    return True
+
+
+def list_devices() -> list:
+    """
+    Returns:
+        list: Serial ports of all connected LEGO hubs, found by USB vendor ID
+    """
+    result = subprocess.run([VENV_MPREMOTE, 'connect', 'list'], capture_output=True, text=True)
+    if result.returncode != 0:
+        return []
+    return [
+        line.split()[0] for line in result.stdout.splitlines()
+        if line.strip() and LEGO_VENDOR_ID in line.lower()
+    ]
+
+
+# Runs on the hub: hashes of the libraries, counterparts still on the hub
+# and free flash as one JSON line
+VERIFY_CODE = """import os, json, binascii
+try:
+    import hashlib
+except ImportError:
+    hashlib = None
+hashes = {}
+for name in NAMES:
+    try:
+        with open('%s/' + name, 'rb') as file:
+            digest = hashlib.sha256() if hashlib else None
+            size = 0
+            while True:
+                block = file.read(512)
+                if not block:
+                    break
+                size += len(block)
+                if digest:
+                    digest.update(block)
+        hashes[name] = [binascii.hexlify(digest.digest()).decode() if digest else None, size]
+    except OSError:
+        hashes[name] = None
+try:
+    files = os.listdir('%s')
+except OSError:
+    files = []
+stale = [name for name in STALE if name in files]
+stat = os.statvfs('/flash')
+print(json.dumps({'hashes': hashes, 'stale': stale, 'free': stat[0] * stat[3]}))""" % (LIB_DIR, LIB_DIR)
+
+
+def compare_report(built: dict, report: dict) -> dict:
+    """
+    Compare the output of VERIFY_CODE with the uploaded libraries.
+    A .py left next to an uploaded .mpy (or the other way round) fails the
+    check, the hub would import the .py.
+
+    Returns:
+        dict: verified (bool), mismatched (list of names), stale (counterparts still
+            on the hub) and free (bytes of free flash)
+    """
+    mismatched = []
+    for name, data in built.items():
+        remote = report['hashes'].get(name)
+        if remote is None or remote[1] != len(data) or (remote[0] and remote[0] != content_hash(data)):
+            mismatched.append(name)
+    stale = report.get('stale', [])
+    return {'verified': not mismatched and not stale, 'mismatched': mismatched, 'stale': stale, 'free': report['free']}
+
+
+def verify_code(built: dict) -> str:
+    """Return VERIFY_CODE for the built libraries and their counterparts."""
+    return "NAMES = {!r}\nSTALE = {!r}\n{}".format(
+        sorted(built), sorted(counterpart(name) for name in built), VERIFY_CODE)
+
+
+def verify_libraries(built: dict, device: str = None, reset: bool = True) -> dict:
+    """
+    Read the libraries back from the hub and compare them with what was uploaded.
+    Hubs without hashlib are compared by file size.
+
+    Args:
+        built: Libraries from build_libraries()
+        device: Serial port of the hub, None for the first one
+        reset: Soft reset the hub in the same session afterwards
+
+    Returns:
+        dict: verified (bool), mismatched (list of names) and free (bytes of free flash),
+            None if the hub did not answer
+    """
+    commands = mpremote(device) + ['exec', verify_code(built)]
+    if reset:
+        commands += ['+', 'soft-reset']
+    result = subprocess.run(commands, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    try:
+        report = json.loads([line for line in result.stdout.splitlines() if line.startswith('{')][-1])
+    except (IndexError, ValueError):
+        return None
+    return compare_report(built, report)
+
+
+def library_version(built: dict) -> str:
+    """Return a short hash over all uploaded libraries, equal on hubs with the same build."""
+    return content_hash("".join(name + content_hash(built[name]) for name in sorted(built)).encode())[:8]
+
+
+def deploy_all(
+    entry: str = 'Controller.py',
+    strip: bool = False,
+    force: bool = False,
+    mpy: bool = False,
+    devices: list = None,
+    workers: int = 4,
+) -> bool:
+    """
+    Sync and verify the libraries on several hubs at the same time.
+
+    Args:
+        entry: The program whose imports decide which libraries are needed
+        strip: Upload copies without debug logging, see strip_debug()
+        force: Upload every library, ignoring the manifests
+        mpy: Upload .mpy bytecode, see build_libraries()
+        devices: Serial ports of the hubs, every connected LEGO hub if None
+        workers: Hubs handled at the same time
+
+    Returns:
+        bool: True if every hub is up to date and verified
+    """
+    if devices is None:
+        devices = list_devices()
+    if not devices:
+        print("✗ No LEGO hub found")
+        return False
+    built = build_libraries(discover_libraries(entry), strip, mpy)
+    if not built:
+        print(f"✗ {entry} imports no local libraries")
+        return False
+    version = library_version(built)
+
+    def deploy(device: str) -> dict:
+        start = time.time()
+        synced = sync_libraries(entry, force=force, device=device, built=built, reset=False)
+        check = verify_libraries(built, device) if synced else None
+        return {'device': device, 'synced': synced, 'check': check, 'time': time.time() - start}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(deploy, devices))
+
+    print()
+    print(f"{'device':<20} {'result':<10} {'time[s]':>7} {'free[KB]':>9} {'version':<8}")
+    ok = True
+    for result in results:
+        check = result['check']
+        if not result['synced'] or check is None:
+            status, free = "failed", "-"
+        elif not check['verified']:
+            status, free = "mismatch", f"{check['free'] / 1024:.0f}"
+        else:
+            status, free = "ok", f"{check['free'] / 1024:.0f}"
+        ok = ok and status == "ok"
+        print(f"{result['device']:<20} {status:<10} {result['time']:>7.1f} {free:>9} {version if status == 'ok' else '-':<8}")
+        if check and check['mismatched']:
+            print(f"  differs on the hub: {', '.join(check['mismatched'])}, upload again with --force")
+        if check and check['stale']:
+            print(f"  still on the hub and imported first: {', '.join(check['stale'])}")
+    return ok
+
+
+def sync_over_link(link, built: dict, force: bool = False, label: str = "") -> dict:
+    """
+    Sync and verify the libraries over an open raw-REPL link, see HubTransport.
+    Manifest, uploads, removals and the hash check share one connection
+    instead of starting mpremote for each of them.
+
+    Args:
+        link: Open HubTransport.RawRepl
+        built: Libraries from build_libraries()
+        force: Upload every library, ignoring the manifest on the hub
+        label: Prefix of the printed lines
+
+    Returns:
+        dict: Result of compare_report(), None if the hub did not answer
+    """
+    from HubTransport import HubError
+
+    try:
+        manifest, files = parse_manifest(link.exec(MANIFEST_CODE))
+        changed, stale, manifest = plan_sync(built, manifest, force, files)
+        for name in built:
+            print(f"{label}{'↑' if name in changed else '='} {name}")
+        if changed:
+            link.exec(MKDIR_CODE)
+            for name in stale:
+                link.exec(f"import os\ntry:\n    os.remove({LIB_DIR + '/' + name!r})\nexcept OSError:\n    pass")
+            for name in changed:
+                link.put(built[name], LIB_DIR + '/' + name)
+            link.put(json.dumps(manifest).encode(), MANIFEST)
+        output = link.exec(verify_code(built))
+        report = json.loads([line for line in output.splitlines() if line.startswith('{')][-1])
+    except (HubError, TimeoutError, OSError, IndexError, ValueError) as error:
+        print(f"✗ {label}Upload failed: {error}")
+        return None
+    print(f"✓ {label}{len(changed)} of {len(built)} libraries uploaded")
+    return compare_report(built, report)
+
+
+def deploy_port(
+    port: str,
+    entry: str = 'Controller.py',
+    strip: bool = False,
+    force: bool = False,
+    mpy: bool = False,
+) -> bool:
+    """
+    Sync, verify and reset one hub over a single persistent serial connection.
+
+    Args:
+        port: Serial port of the hub, e.g. /dev/ttyACM0 or COM3
+        entry: The program whose imports decide which libraries are needed
+        strip: Upload copies without debug logging, see strip_debug()
+        force: Upload every library, ignoring the manifest
+        mpy: Upload .mpy bytecode, see build_libraries()
+
+    Returns:
+        bool: True if the hub is up to date and verified
+    """
+    from HubTransport import RawRepl
+
+    built = build_libraries(discover_libraries(entry), strip, mpy)
+    if not built:
+        print(f"✗ {entry} imports no local libraries")
+        return False
+    start = time.time()
+    try:
+        link = RawRepl.serial(port)
+    except (OSError, TimeoutError, RuntimeError) as error:
+        print(f"✗ Connection to {port} failed: {error}")
+        return False
+    print(f"✓ Connected to {port} in {time.time() - start:.1f} s")
+    try:
+        check = sync_over_link(link, built, force)
+    finally:
+        # Leave the raw REPL with a soft reset, the hub returns to normal operation
+        link.close(reset=True)
+    if check is None:
+        return False
+    if check['mismatched']:
+        print(f"✗ Differs on the hub: {', '.join(check['mismatched'])}, upload again with --force")
+    if check['stale']:
+        print(f"✗ Still on the hub and imported first: {', '.join(check['stale'])}")
+    if not check['verified']:
+        return False
+    print(f"✓ Verified in {time.time() - start:.1f} s, {check['free'] / 1024:.0f} KB flash free, "
+          f"version {library_version(built)}")
+    return True
+
+
+def fetch_file(remote_path: str, local_path: str) -> bool:
+    """
+    Copy a file from the hub to the PC, e.g. telemetry written to /flash.
+
+    Args:
+        remote_path: Path on the hub, e.g. /flash/telemetry.bin
+        local_path: Destination on the PC
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    result = subprocess.run(
+        [VENV_MPREMOTE, 'cp', ':' + remote_path, local_path],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode == 0:
+        print(f"✓ {remote_path} fetched to {local_path}")
+        return True
+    print(f"✗ Fetch failed: {result.stderr}")
+    return False
+
+
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Upload DriveBase.py, its add-ons and Logger.py to the LEGO hub.")
+    parser.add_argument('--strip-debug', action='store_true', help="Remove debug logging from the uploaded copies")
+    parser.add_argument('--sync', action='store_true', help="Only upload libraries that changed since the last sync")
+    parser.add_argument('--entry', default='Controller.py', help="Program whose imports decide the libraries for --sync")
+    parser.add_argument('--force', action='store_true', help="Upload every library with --sync, ignoring the manifest")
+    parser.add_argument('--mpy', action='store_true', help="Upload .mpy bytecode without docstrings, implies --sync")
+    parser.add_argument('--all', action='store_true', help="Sync and verify every connected hub at the same time")
+    parser.add_argument('--device', action='append', help="Serial port of a hub for --all, may be repeated")
+    parser.add_argument('--port', help="Sync over one persistent connection to this serial port, without mpremote")
+    parser.add_argument('--workers', type=int, default=4, help="Hubs handled at the same time with --all")
+    args = parser.parse_args()
+
+    if args.port:
+        try:
+            import serial  # noqa: F401
+        except ImportError:
+            # pyserial comes with mpremote in the venv
+            if ensure_venv() and os.path.abspath(sys.executable) != os.path.abspath(VENV_PYTHON):
+                sys.exit(subprocess.run([VENV_PYTHON, os.path.abspath(__file__)] + sys.argv[1:]).returncode)
+        sys.exit(0 if deploy_port(args.port, args.entry, args.strip_debug, args.force, args.mpy) else 1)
+
     print("=" * 50)
     print("LEGO Spike Prime - Library Upload Tool")
     print("=" * 50)
@@ -171,7 +898,14 @@ def main():
     print()
     print("-" * 50)
     print()
-    
+
+    if args.all or args.device:
+        sys.exit(0 if deploy_all(args.entry, args.strip_debug, args.force, args.mpy, args.device, args.workers) else 1)
+
+    if args.sync or args.mpy:
+        # Reading the manifest is the connection test
+        sys.exit(0 if sync_libraries(args.entry, args.strip_debug, args.force, args.mpy) else 1)
+
     # Test connection
     print("Testing connection to LEGO hub...")
     if not test_connection():
@@ -186,7 +920,7 @@ def main():
     print()
     
     # Upload libraries
-    if upload_libraries():
+    if upload_libraries(strip=args.strip_debug):
         print()
         print("=" * 50)
         print("Upload completed successfully!")
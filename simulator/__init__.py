@@ -0,0 +1,125 @@
+"""
+Host-side simulator of the LEGO SPIKE Prime hub.
+
+Replaces the firmware modules hub, motor, motor_pair and color_sensor and the
+MicroPython tick functions of `time`, so DriveBase.py, Logger.py and missions
+written against them run unchanged on a PC, faster than real time:
+
+    import simulator
+    world = simulator.install(simulator.World(start=(40, 20, 0)))
+
+    from DriveBase import DriveBase
+    db = DriveBase()
+    db.drive_distance(30)
+    print(world.x, world.y, world.heading)
+
+install() has to run before DriveBase or Logger are imported.
+With World(clock=VirtualClock()) sleeps return at once and a mission takes
+milliseconds of wall time; simulator.batch sweeps mission parameters that
+way in a process pool. \n
+Simulator des LEGO SPIKE Prime Hubs für den PC.
+Ersetzt die Firmware-Module und die Tick-Funktionen von `time`, damit
+DriveBase.py, Logger.py und Missionen unverändert und schneller als in
+Echtzeit auf dem PC laufen. install() muss vor dem Import von DriveBase
+oder Logger aufgerufen werden.
+"""
+
+import sys
+import time
+
+from . import color_sensor, hub, motor, motor_pair, world as _world
+from .world import Clock, ColorField, SimulationTimeout, VirtualClock, World, TICKS_HALF, TICKS_PERIOD
+
+__all__ = ["Clock", "ColorField", "SimulationTimeout", "VirtualClock", "World", "install", "uninstall"]
+
+MODULES = {
+    "hub": hub,
+    "motor": motor,
+    "motor_pair": motor_pair,
+    "color_sensor": color_sensor,
+}
+
+TIME_FUNCTIONS = ("ticks_ms", "ticks_us", "ticks_diff", "ticks_add", "sleep_ms", "sleep_us", "sleep")
+
+_saved_modules = {}
+_saved_time = {}
+
+
+def ticks_ms() -> int:
+    return int(_world.current().clock.now_ms()) % TICKS_PERIOD
+
+
+def ticks_us() -> int:
+    return int(_world.current().clock.now_ms() * 1000) % TICKS_PERIOD
+
+
+def ticks_add(ticks: int, delta: int) -> int:
+    return (ticks + delta) % TICKS_PERIOD
+
+
+def ticks_diff(end: int, start: int) -> int:
+    return (end - start + TICKS_HALF) % TICKS_PERIOD - TICKS_HALF
+
+
+def sleep_ms(duration: int) -> None:
+    _world.current().clock.sleep_ms(duration)
+
+
+def sleep_us(duration: int) -> None:
+    _world.current().clock.sleep_ms(duration / 1000)
+
+
+def sleep(duration: float) -> None:
+    _world.current().clock.sleep_ms(duration * 1000)
+
+
+def install(world: World = None) -> World:
+    """
+    Route the firmware modules and the tick functions to a simulated world
+    and return it. \n
+    Leite die Firmware-Module und die Tick-Funktionen auf eine simulierte
+    World um und gib sie aus.
+
+    Parameters / Parameter
+    -----------------
+
+    #### world: World = None
+        The world to simulate, a default World if not given. \n
+        Die zu simulierende World, ohne Angabe eine Standard-World.
+    """
+    world = world or World()
+    _world.set_current(world)
+
+    for name, module in MODULES.items():
+        if name not in _saved_modules:
+            _saved_modules[name] = sys.modules.get(name)
+        sys.modules[name] = module
+
+    for name in TIME_FUNCTIONS:
+        if name not in _saved_time:
+            _saved_time[name] = getattr(time, name, None)
+        setattr(time, name, globals()[name])
+
+    return world
+
+
+def uninstall() -> None:
+    """
+    Restore the modules and time functions replaced by install(). \n
+    Stelle die von install() ersetzten Module und Zeitfunktionen wieder her.
+    """
+    for name, module in _saved_modules.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _saved_modules.clear()
+
+    for name, function in _saved_time.items():
+        if function is None:
+            delattr(time, name)
+        else:
+            setattr(time, name, function)
+    _saved_time.clear()
+
+    _world.set_current(None)
@@ -0,0 +1,209 @@
+"""
+Batch runs of missions in the simulator, in virtual time and in parallel.
+
+A mission is a function `mission(db, world, **params)` that drives a
+DriveBase. Each trial gets a fresh World on a VirtualClock and a fresh
+DriveBase, so hundreds of trials run in the time one takes on the table:
+
+    from simulator.batch import sweep
+
+    def straight(db, world, brake_start, mainspeed):
+        db.drive_distance(50, mainspeed, 200, brake_start=brake_start)
+
+    results = sweep(straight, {"brake_start": [0.5, 0.7, 0.9], "mainspeed": [400, 600, 800]})
+
+Missions and world factories must be defined at module level, so the
+worker processes can import them.
+
+    python -m simulator.batch    # sweep the example mission below \n
+Serienläufe von Missionen im Simulator, in virtueller Zeit und parallel.
+Jeder Versuch bekommt eine neue World auf einer VirtualClock und eine neue
+DriveBase. Missionen und World-Fabriken müssen auf Modulebene stehen, damit
+die Arbeitsprozesse sie importieren können.
+"""
+
+import contextlib
+import io
+import itertools
+import math
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from .world import VirtualClock, World
+
+# Simulated time after which a trial is aborted, e.g. a robot pushing a wall forever
+DEFAULT_LIMIT = 5 * 60 * 1000
+
+
+def default_world(limit: float = DEFAULT_LIMIT) -> World:
+    """
+    Return a default World in the middle of the table on a VirtualClock. \n
+    Gib eine Standard-World in der Tischmitte auf einer VirtualClock aus.
+    """
+    return World(clock=VirtualClock(limit=limit), start=(60.0, 57.0, 0.0))
+
+
+def run_trial(mission, params: dict = None, world_factory=default_world, quiet: bool = True) -> dict:
+    """
+    Run one mission in a fresh simulated world.
+    Returns a dict with params, the final pose (x, y, heading, yaw), sim_ms,
+    wall_ms, the mission's return value as result and a traceback as
+    error, if any. \n
+    Führe eine Mission in einer neuen simulierten World aus.
+    Gibt ein dict mit params, der Endlage (x, y, heading, yaw), sim_ms,
+    wall_ms, dem Rückgabewert der Mission als result und gegebenenfalls
+    einem Traceback als error aus.
+
+    Parameters / Parameter
+    -----------------
+
+    #### mission: function
+        Function mission(db, world, **params). \n
+        Funktion mission(db, world, **params).
+
+    #### params: dict = None
+        Keyword arguments for the mission. \n
+        Schlüsselwortargumente für die Mission.
+
+    #### world_factory: function = default_world
+        Function returning the World to run in. \n
+        Funktion, die die World für den Versuch erzeugt.
+
+    #### quiet: bool = True
+        Swallow the Logger output of the mission. \n
+        Unterdrücke die Logger-Ausgaben der Mission.
+    """
+    from . import install
+
+    params = dict(params or {})
+    world = install(world_factory())
+    trial = {"params": params, "result": None, "error": None}
+
+    wall_start = time.perf_counter()
+    output = io.StringIO() if quiet else sys.stdout
+    try:
+        with contextlib.redirect_stdout(output):
+            # Imported after install() so DriveBase binds the simulated modules
+            from DriveBase import DriveBase
+            db = DriveBase()
+            trial["result"] = mission(db, world, **params)
+    except Exception:
+        trial["error"] = traceback.format_exc()
+
+    if getattr(world.clock, "limit", None) is not None:
+        # Reading the pose must not trip the limit again
+        world.clock.limit = None
+    trial.update(
+        x=world.x,
+        y=world.y,
+        heading=world.heading,
+        yaw=world.yaw(),
+        sim_ms=world.now(),
+        wall_ms=(time.perf_counter() - wall_start) * 1000,
+    )
+    return trial
+
+
+def _run_trial(job):
+    return run_trial(*job)
+
+
+def grid_points(grid: dict) -> list:
+    """
+    Return one params dict per combination of the values in
+    `grid` (parameter name -> list of values). \n
+    Gib ein params-dict pro Kombination der Werte in `grid`
+    (Parametername -> Liste von Werten) aus.
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def run_many(mission, points: list, world_factory=default_world, processes: int = None, quiet: bool = True) -> list:
+    """
+    Run a mission once per params dict in a process pool and return
+    the run_trial() results in the order of `points`. \n
+    Führe eine Mission einmal pro params-dict in einem Prozesspool aus
+    und gib die Ergebnisse von run_trial() in der Reihenfolge von `points` aus.
+
+    Parameters / Parameter
+    -----------------
+
+    #### mission: function
+        Function mission(db, world, **params), defined at module level. \n
+        Funktion mission(db, world, **params), auf Modulebene definiert.
+
+    #### points: list[dict]
+        One params dict per trial. \n
+        Ein params-dict pro Versuch.
+
+    #### world_factory: function = default_world
+        Function returning the World of each trial, defined at module level. \n
+        Funktion, die die World jedes Versuchs erzeugt, auf Modulebene definiert.
+
+    #### processes: int = None
+        Worker processes, one per CPU if None, in-process if 1. \n
+        Arbeitsprozesse, einer pro CPU bei None, im eigenen Prozess bei 1.
+
+    #### quiet: bool = True
+        Swallow the Logger output of the missions. \n
+        Unterdrücke die Logger-Ausgaben der Missionen.
+    """
+    jobs = [(mission, params, world_factory, quiet) for params in points]
+    if processes == 1:
+        return [_run_trial(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_run_trial, jobs, chunksize=max(1, len(jobs) // 64)))
+
+
+def sweep(mission, grid: dict, world_factory=default_world, processes: int = None, quiet: bool = True) -> list:
+    """
+    Run a mission for every combination of parameters in a process pool
+    and return the run_trial() results in the order of grid_points(grid).
+    `grid` maps parameter names to lists of values, the other arguments
+    are those of run_many(). \n
+    Führe eine Mission für jede Kombination der Parameter in einem
+    Prozesspool aus. `grid` ordnet Parameternamen Listen von Werten zu,
+    die anderen Argumente sind die von run_many().
+    """
+    return run_many(mission, grid_points(grid), world_factory, processes, quiet)
+
+
+def straight_drive(db, world, distance: float = 50, mainspeed: int = 600, brake_start: float = 0.7) -> float:
+    """
+    Example mission: drive straight and report the distance error in cm. \n
+    Beispielmission: fahre geradeaus und gib den Streckenfehler in cm aus.
+    """
+    start_x, start_y = world.x, world.y
+    db.drive_distance(distance, mainspeed, 200, brake_start=brake_start, re_align=False)
+    return math.hypot(world.x - start_x, world.y - start_y) - distance
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Sweep the example mission straight_drive in the simulator.")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes, one per CPU by default")
+    args = parser.parse_args()
+
+    grid = {
+        "brake_start": [0.5, 0.6, 0.7, 0.8, 0.9],
+        "mainspeed": [300, 450, 600, 750, 900],
+    }
+    start = time.perf_counter()
+    results = sweep(straight_drive, grid, processes=args.processes)
+    duration = time.perf_counter() - start
+
+    print("{:>11} {:>9} {:>10} {:>9} {:>8}".format("brake_start", "mainspeed", "error[cm]", "sim[s]", "heading"))
+    for trial in results:
+        if trial["error"]:
+            print(trial["params"], trial["error"].splitlines()[-1])
+            continue
+        print("{brake_start:>11} {mainspeed:>9}".format(**trial["params"])
+              + " {:>10.2f} {:>9.2f} {:>8.2f}".format(trial["result"], trial["sim_ms"] / 1000, trial["heading"]))
+    print("{} trials in {:.1f} s wall time".format(len(results), duration))
+
+
+if __name__ == "__main__":
+    main()
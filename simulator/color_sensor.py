@@ -0,0 +1,33 @@
+"""
+Simulated `color_sensor` module of the SPIKE Prime firmware.
+
+Reports the color printed on the ColorField below the sensor position. \n
+Simuliertes `color_sensor` Modul der SPIKE Prime Firmware.
+Meldet die Farbe der ColorField unter der Position des Sensors.
+"""
+
+from .world import RGBI, current
+
+
+def color(port: int) -> int:
+    """
+    Return the firmware color index below the sensor. \n
+    Gib den Farbindex der Firmware unter dem Sensor aus.
+    """
+    return current().sensor_color(port)
+
+
+def rgbi(port: int) -> tuple:
+    """
+    Return the raw red, green, blue and intensity values, 0 ... 1024. \n
+    Gib die Rohwerte für Rot, Grün, Blau und Intensität aus, 0 ... 1024.
+    """
+    return RGBI[color(port)]
+
+
+def reflection(port: int) -> int:
+    """
+    Return the reflected light in percent. \n
+    Gib das reflektierte Licht in Prozent aus.
+    """
+    return min(100, RGBI[color(port)][3] * 100 // 1024)
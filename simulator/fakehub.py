@@ -0,0 +1,290 @@
+"""
+Fake hub answering the MicroPython raw-REPL protocol, for testing
+HubTransport and UploadLibrarys without a LEGO hub.
+
+The code sent to it runs in CPython in a thread; paths under /flash are
+mapped to a local directory and `os` is replaced by a small version with
+the functions the upload tools use:
+
+    from simulator.fakehub import FakeHub
+    from HubTransport import RawRepl
+
+    stream, hub = FakeHub.loopback("/tmp/fakehub")
+    with RawRepl(stream) as link:
+        link.put(b"x = 1", "/flash/lib/Test.py")
+
+FakeHub.pty() opens it on a pseudo terminal instead, whose device path can
+be handed to RawRepl.serial() like a real serial port (POSIX only). \n
+Falscher Hub, der das Raw-REPL-Protokoll von MicroPython beantwortet, um
+HubTransport und UploadLibrarys ohne LEGO Hub zu testen. Der gesendete Code
+läuft in CPython, Pfade unter /flash liegen in einem lokalen Ordner.
+"""
+
+import builtins
+import contextlib
+import io
+import os
+import shutil
+import socket
+import threading
+import traceback
+
+from HubTransport import FdStream, SocketStream
+
+FLASH = "/flash"
+
+
+class FlashOs:
+    """
+    The parts of MicroPython's `os` the host tools use, on a local directory. \n
+    Die Teile von MicroPythons `os`, die die PC-Werkzeuge nutzen, auf einem lokalen Ordner.
+    """
+
+    def __init__(self, root: str, size: int):
+        self.root = root
+        self.size = size
+        self.sep = "/"
+
+    def path(self, remote: str) -> str:
+        """
+        Map a path on the hub to the local directory. \n
+        Bilde einen Pfad auf dem Hub auf den lokalen Ordner ab.
+        """
+        if not remote.startswith("/"):
+            remote = FLASH + "/" + remote
+        if remote != FLASH and not remote.startswith(FLASH + "/"):
+            raise OSError(2, "ENOENT")
+        local = os.path.normpath(os.path.join(self.root, remote[len(FLASH):].lstrip("/")))
+        if os.path.commonpath([local, self.root]) != self.root:
+            raise OSError(2, "ENOENT")
+        return local
+
+    def mkdir(self, path: str) -> None:
+        os.mkdir(self.path(path))
+
+    def remove(self, path: str) -> None:
+        os.remove(self.path(path))
+
+    def rmdir(self, path: str) -> None:
+        os.rmdir(self.path(path))
+
+    def rename(self, old: str, new: str) -> None:
+        os.rename(self.path(old), self.path(new))
+
+    def listdir(self, path: str = FLASH) -> list:
+        return sorted(os.listdir(self.path(path)))
+
+    def stat(self, path: str) -> tuple:
+        result = os.stat(self.path(path))
+        return (0o040000 if os.path.isdir(self.path(path)) else 0o100000, 0, 0, 0, 0, 0,
+                result.st_size, int(result.st_atime), int(result.st_mtime), int(result.st_ctime))
+
+    def statvfs(self, path: str = FLASH) -> tuple:
+        used = sum(
+            os.path.getsize(os.path.join(folder, name))
+            for folder, _, names in os.walk(self.root) for name in names
+        )
+        free = max(0, self.size - used) // 512
+        return (512, 512, self.size // 512, free, free, 0, 0, 0, 0, 255)
+
+
+class FakeHub(threading.Thread):
+    """
+    Thread answering the raw REPL on one end of a stream.
+    Like the firmware it keeps the globals of the raw REPL between code
+    blocks until a soft reset, and counts connections and soft resets so
+    tests can check how often a tool reconnects. \n
+    Thread, der das Raw-REPL an einem Ende eines Streams beantwortet.
+    Wie die Firmware behält er die Globals bis zu einem Soft-Reset und zählt
+    Verbindungen und Soft-Resets.
+
+    Parameters / Parameter
+    -----------------
+
+    #### stream
+        Hub side of the link, with read(size, timeout), write(data) and close(). \n
+        Hub-Seite der Verbindung, mit read(size, timeout), write(data) und close().
+
+    #### root: str
+        Local directory holding the content of /flash. \n
+        Lokaler Ordner mit dem Inhalt von /flash.
+
+    #### flash_size: int = 32 MiB
+        Reported size of the flash in bytes. \n
+        Gemeldete Größe des Flash-Speichers in Bytes.
+
+    #### raw_paste: bool = True
+        Support raw-paste mode, False answers like older firmware. \n
+        Unterstütze den Raw-Paste-Modus, bei False antwortet er wie ältere Firmware.
+
+    #### window: int = 128
+        Bytes the host may send per raw-paste window. \n
+        Bytes, die der PC pro Raw-Paste-Fenster senden darf.
+    """
+
+    def __init__(self, stream, root: str, flash_size: int = 32 * 1024 * 1024, raw_paste: bool = True, window: int = 128):
+        super().__init__(daemon=True)
+        os.makedirs(root, exist_ok=True)
+        self.stream = stream
+        self.os = FlashOs(os.path.abspath(root), flash_size)
+        self.raw = False
+        self.raw_paste = raw_paste
+        self.window = window
+        self.running = True
+        self.raw_entries = 0
+        self.soft_resets = 0
+        self.executed = 0
+        self.namespace = {}
+        self.soft_reboot()
+
+    @staticmethod
+    def loopback(root: str, **kwargs) -> tuple:
+        """
+        Start a fake hub on a socket pair.
+        Returns (host stream for RawRepl, running FakeHub). \n
+        Starte einen falschen Hub auf einem Socket-Paar.
+        Gibt (PC-Stream für RawRepl, laufender FakeHub) aus.
+        """
+        host, device = socket.socketpair()
+        hub = FakeHub(SocketStream(device), root, **kwargs)
+        hub.start()
+        return SocketStream(host), hub
+
+    @staticmethod
+    def pty(root: str, **kwargs) -> tuple:
+        """
+        Start a fake hub on a pseudo terminal.
+        Returns (device path of the terminal, running FakeHub). \n
+        Starte einen falschen Hub auf einem Pseudoterminal.
+        Gibt (Gerätepfad des Terminals, laufender FakeHub) aus.
+        """
+        import tty
+
+        master, slave = os.openpty()
+        # Raw mode, so Ctrl-C and Ctrl-D reach the hub as bytes
+        tty.setraw(master)
+        tty.setraw(slave)
+        hub = FakeHub(FdStream(master), root, **kwargs)
+        hub.device = os.ttyname(slave)
+        hub.start()
+        return hub.device, hub
+
+    def stop(self) -> None:
+        self.running = False
+        self.join(1)
+        self.stream.close()
+
+    def soft_reboot(self) -> None:
+        flash_os = self.os
+
+        def fake_open(path, mode="r", *args, **kwargs):
+            return open(flash_os.path(path), mode, *args, **kwargs)
+
+        def fake_import(name, *args, **kwargs):
+            if name in ("os", "uos"):
+                return flash_os
+            return builtins.__import__(name, *args, **kwargs)
+
+        fake_builtins = dict(vars(builtins), open=fake_open, __import__=fake_import)
+        self.namespace = {"__builtins__": fake_builtins, "__name__": "__main__"}
+
+    def run(self) -> None:
+        code = b""
+        # Bytes received in the current raw-paste window, None outside raw-paste mode
+        paste = None
+        while self.running:
+            try:
+                data = self.stream.read(4096, 0.05)
+            except OSError:
+                break
+            try:
+                code, paste = self.receive(data, code, paste)
+            except OSError:
+                # The host closed the link
+                break
+
+    def receive(self, data: bytes, code: bytes, paste) -> tuple:
+        """
+        Answer the bytes the host sent.
+        Returns (code received so far, bytes of the raw-paste window or None). \n
+        Beantworte die Bytes, die der PC gesendet hat.
+        Gibt (bisher empfangener Code, Bytes des Raw-Paste-Fensters oder None) aus.
+        """
+        for byte in data:
+            char = bytes([byte])
+            if paste is not None:
+                if char == b"\x04":
+                    paste = None
+                    self.stream.write(b"\x04")
+                    output, error = self.execute(code.decode())
+                    self.stream.write(output + b"\x04" + error + b"\x04>")
+                    code = b""
+                    continue
+                code += char
+                paste += 1
+                if paste == self.window:
+                    paste = 0
+                    self.stream.write(b"\x01")
+                continue
+            if self.raw and code == b"\x05A" and char == b"\x01":
+                code = b""
+                if self.raw_paste:
+                    paste = 0
+                    self.stream.write(b"R\x01" + self.window.to_bytes(2, "little"))
+                else:
+                    self.stream.write(b"R\x00")
+                continue
+            if not self.raw:
+                if char == b"\x01":
+                    self.raw = True
+                    self.raw_entries += 1
+                    code = b""
+                    self.stream.write(b"\r\nraw REPL; CTRL-B to exit\r\n>")
+                elif char == b"\x03":
+                    self.stream.write(b"\r\n>>> ")
+                elif char == b"\x04":
+                    self.soft_resets += 1
+                    self.soft_reboot()
+                    self.stream.write(b"MPY: soft reboot\r\n>>> ")
+            elif char == b"\x02":
+                self.raw = False
+                self.stream.write(b"\r\n>>> ")
+            elif char == b"\x03":
+                code = b""
+            elif char == b"\x04" and not code:
+                self.soft_resets += 1
+                self.soft_reboot()
+                self.stream.write(b"OK\r\nMPY: soft reboot\r\nraw REPL; CTRL-B to exit\r\n>")
+            elif char == b"\x04":
+                self.stream.write(b"OK")
+                output, error = self.execute(code.decode())
+                self.stream.write(output + b"\x04" + error + b"\x04>")
+                code = b""
+            else:
+                code += char
+        return code, paste
+
+    def execute(self, code: str) -> tuple:
+        """
+        Run code and return its (output, traceback) as bytes, the traceback
+        empty if it ran through. \n
+        Führe Code aus und gib (Ausgabe, Traceback) als Bytes aus, der
+        Traceback ist leer, wenn er fehlerfrei lief.
+        """
+        self.executed += 1
+        output = io.StringIO()
+        error = ""
+        try:
+            with contextlib.redirect_stdout(output):
+                exec(compile(code, "<stdin>", "exec"), self.namespace)
+        except Exception:
+            error = traceback.format_exc(limit=-1)
+        return output.getvalue().replace("\n", "\r\n").encode(), error.encode()
+
+    def reset_flash(self) -> None:
+        """
+        Delete everything on the fake flash. \n
+        Lösche alles auf dem falschen Flash-Speicher.
+        """
+        shutil.rmtree(self.os.root)
+        os.makedirs(self.os.root)
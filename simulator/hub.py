@@ -0,0 +1,51 @@
+"""
+Simulated `hub` module of the SPIKE Prime firmware.
+
+Provides the submodules motion_sensor, light_matrix, button and port. \n
+Simuliertes `hub` Modul der SPIKE Prime Firmware.
+Stellt die Untermodule motion_sensor, light_matrix, button und port bereit.
+"""
+
+from types import SimpleNamespace
+
+from .world import current
+
+
+def _tilt_angles() -> tuple:
+    return current().yaw(), 0, 0
+
+
+def _reset_yaw(angle: int) -> None:
+    current().reset_yaw(angle)
+
+
+def _write(text) -> None:
+    current().display = str(text)
+
+
+def _clear() -> None:
+    current().display = ""
+
+
+def _pressed(button: int) -> int:
+    # The firmware returns how long the button is held in ms
+    return 100 if current().button_pressed(button) else 0
+
+
+motion_sensor = SimpleNamespace(
+    tilt_angles=_tilt_angles,
+    reset_yaw=_reset_yaw,
+)
+
+light_matrix = SimpleNamespace(
+    write=_write,
+    clear=_clear,
+)
+
+button = SimpleNamespace(
+    LEFT=1,
+    RIGHT=2,
+    pressed=_pressed,
+)
+
+port = SimpleNamespace(A=0, B=1, C=2, D=3, E=4, F=5)
@@ -0,0 +1,164 @@
+"""
+Simulated `motor` module of the SPIKE Prime firmware.
+
+Mirrors the firmware functions used by DriveBase.py and Controller.py.
+Velocities are in degrees/second, durations in ms, positions in degrees. \n
+Simuliertes `motor` Modul der SPIKE Prime Firmware.
+Geschwindigkeiten in Grad/Sekunde, Zeiten in ms, Positionen in Grad.
+"""
+
+from .world import (  # noqa: F401 - re-exported firmware constants
+    COAST, BRAKE, HOLD, CONTINUE, SMART_COAST, SMART_BRAKE,
+    CLOCKWISE, COUNTERCLOCKWISE, SHORTEST_PATH, LONGEST_PATH,
+    current,
+)
+
+READY = 0
+RUNNING = 1
+STALLED = 2
+CANCELED = 3
+ERROR = 4
+DISCONNECTED = 5
+
+
+class _Command:
+    """
+    Return value of the run_for_* and run_to_* functions.
+    Like on the hub the motor already runs when the function returns;
+    awaiting the result waits until the command finished. \n
+    Rückgabewert der run_for_* und run_to_* Funktionen.
+    Wie auf dem Hub läuft der Motor schon, wenn die Funktion zurückkehrt;
+    await wartet, bis der Befehl fertig ist.
+    """
+
+    def __init__(self, motors):
+        self._motors = motors
+
+    def done(self) -> bool:
+        """
+        Return whether all motors of the command reached their end condition. \n
+        Gib aus, ob alle Motoren des Befehls ihre Endbedingung erreicht haben.
+        """
+        current().update()
+        return all(m.goal is None and m.end_time is None for m in self._motors)
+
+    def __await__(self):
+        while not self.done():
+            yield 10
+        return READY
+
+    __iter__ = __await__
+
+
+def absolute_position(port: int) -> int:
+    """
+    Return the shaft position in degrees, -180 ... 179. \n
+    Gib die Position der Welle in Grad aus, -180 ... 179.
+    """
+    m = current().motor(port)
+    return int(round(m.position + m.absolute_offset + 180)) % 360 - 180
+
+
+def relative_position(port: int) -> int:
+    """
+    Return the degrees turned since the last reset. \n
+    Gib die seit dem letzten Zurücksetzen gedrehten Grad aus.
+    """
+    m = current().motor(port)
+    return int(round(m.position - m.relative_offset))
+
+
+def reset_relative_position(port: int, position: int) -> None:
+    """
+    Set the relative position of the motor to `position`. \n
+    Setze die relative Position des Motors auf `position`.
+    """
+    m = current().motor(port)
+    m.relative_offset = m.position - position
+
+
+def velocity(port: int) -> int:
+    """
+    Return the current speed in degrees/second. \n
+    Gib die aktuelle Geschwindigkeit in Grad/Sekunde aus.
+    """
+    return int(current().motor(port).velocity)
+
+
+def get_duty_cycle(port: int) -> int:
+    """
+    Return the current PWM duty cycle, -10000 ... 10000. \n
+    Gib den aktuellen PWM-Tastgrad aus, -10000 ... 10000.
+    """
+    return current().motor(port).duty
+
+
+def set_duty_cycle(port: int, duty_cycle: int) -> None:
+    """
+    Run the motor open loop; the speed follows the duty cycle linearly. \n
+    Steuere den Motor ohne Regelung, die Geschwindigkeit folgt dem Tastgrad linear.
+    """
+    m = current().motor(port)
+    m.command(m.max_speed * duty_cycle / 10000, stop=COAST)
+
+
+def run(port: int, velocity: int, *, acceleration: int = 1000) -> None:
+    """
+    Run the motor at `velocity` until it is stopped. \n
+    Lass den Motor mit `velocity` laufen, bis er gestoppt wird.
+    """
+    current().motor(port).command(velocity)
+
+
+def run_for_time(port: int, duration: int, velocity: int, *, stop: int = BRAKE, acceleration: int = 1000, deceleration: int = 1000) -> _Command:
+    """
+    Run the motor at `velocity` for `duration` ms. \n
+    Lass den Motor `duration` ms mit `velocity` laufen.
+    """
+    world = current()
+    m = world.motor(port)
+    m.command(velocity, end_time=world.now() + duration, stop=stop)
+    return _Command([m])
+
+
+def run_for_degrees(port: int, degrees: int, velocity: int, *, stop: int = BRAKE, acceleration: int = 1000, deceleration: int = 1000) -> _Command:
+    """
+    Turn the motor by `degrees`, the sign of `degrees` times `velocity` gives the direction. \n
+    Drehe den Motor um `degrees`, das Vorzeichen von `degrees` mal `velocity` gibt die Richtung.
+    """
+    m = current().motor(port)
+    direction = -1 if (degrees < 0) != (velocity < 0) else 1
+    m.command(direction * abs(velocity), goal=m.position + direction * abs(degrees), stop=stop)
+    return _Command([m])
+
+
+def run_to_relative_position(port: int, position: int, velocity: int, *, stop: int = BRAKE, acceleration: int = 1000, deceleration: int = 1000) -> _Command:
+    """
+    Turn the motor to a relative position. \n
+    Drehe den Motor auf eine relative Position.
+    """
+    m = current().motor(port)
+    goal = m.relative_offset + position
+    m.command(abs(velocity) if goal >= m.position else -abs(velocity), goal=goal, stop=stop)
+    return _Command([m])
+
+
+def run_to_absolute_position(port: int, position: int, velocity: int, *, direction: int = SHORTEST_PATH, stop: int = BRAKE, acceleration: int = 1000, deceleration: int = 1000) -> _Command:
+    """
+    Turn the motor to an absolute position, taking the path given by `direction`. \n
+    Drehe den Motor auf eine absolute Position, auf dem Weg, den `direction` angibt.
+    """
+    m = current().motor(port)
+    delta = (position - absolute_position(port)) % 360
+    if direction == COUNTERCLOCKWISE or (direction == SHORTEST_PATH and delta > 180) or (direction == LONGEST_PATH and 0 < delta < 180):
+        delta -= 360
+    m.command(abs(velocity) if delta >= 0 else -abs(velocity), goal=m.position + delta, stop=stop)
+    return _Command([m])
+
+
+def stop(port: int, *, stop: int = BRAKE) -> None:
+    """
+    Stop the motor with the given stop mode. \n
+    Stoppe den Motor mit dem angegebenen Stoppmodus.
+    """
+    current().motor(port).halt(stop)
@@ -0,0 +1,124 @@
+"""
+Simulated `motor_pair` module of the SPIKE Prime firmware.
+
+The first motor of a pair is the left one. It is mounted mirrored, so the
+pair drives it backwards for forward motion, like the firmware does. \n
+Simuliertes `motor_pair` Modul der SPIKE Prime Firmware.
+Der erste Motor eines Paares ist der linke. Er ist gespiegelt eingebaut und
+dreht für eine Vorwärtsfahrt rückwärts, wie bei der Firmware.
+"""
+
+from .motor import _Command
+from .world import BRAKE, current
+
+PAIR_1 = 0
+PAIR_2 = 1
+PAIR_3 = 2
+
+
+def pair(pair: int, left_motor: int, right_motor: int) -> None:
+    """
+    Combine two motors into a drive pair. \n
+    Verbinde zwei Motoren zu einem Antriebspaar.
+    """
+    world = current()
+    world.motor(left_motor)
+    world.motor(right_motor)
+    world.pairs[pair] = (left_motor, right_motor)
+
+
+def unpair(pair: int) -> None:
+    """
+    Release the motors of a pair. \n
+    Gib die Motoren eines Paares frei.
+    """
+    current().pairs.pop(pair, None)
+
+
+def _wheel_speeds(steering: int, velocity: int) -> tuple:
+    """
+    Split `velocity` into left and right wheel speeds like the firmware steering. \n
+    Teile `velocity` wie die Lenkung der Firmware auf das linke und rechte Rad auf.
+    """
+    steering = max(-100, min(steering, 100))
+    if steering >= 0:
+        return velocity, velocity * (50 - steering) / 50
+    return velocity * (50 + steering) / 50, velocity
+
+
+def _motors(pair: int) -> tuple:
+    world = current()
+    left, right = world.pair_ports(pair)
+    return world.motor(left), world.motor(right)
+
+
+def move_tank(pair: int, left_velocity: int, right_velocity: int, *, acceleration: int = 1000) -> None:
+    """
+    Run both wheels at their own speed until stopped. \n
+    Lass beide Räder mit eigener Geschwindigkeit laufen, bis sie gestoppt werden.
+    """
+    left, right = _motors(pair)
+    left.command(-left_velocity)
+    right.command(right_velocity)
+
+
+def move(pair: int, steering: int, *, velocity: int = 360, acceleration: int = 1000) -> None:
+    """
+    Drive with `steering` (-100 ... 100, positive turns right) until stopped. \n
+    Fahre mit `steering` (-100 ... 100, positiv lenkt nach rechts), bis gestoppt wird.
+    """
+    move_tank(pair, *_wheel_speeds(steering, velocity))
+
+
+def move_tank_for_time(pair: int, left_velocity: int, right_velocity: int, duration: int, *, stop: int = BRAKE, acceleration: int = 1000, deceleration: int = 1000) -> _Command:
+    """
+    Run both wheels at their own speed for `duration` ms. \n
+    Lass beide Räder `duration` ms mit eigener Geschwindigkeit laufen.
+    """
+    left, right = _motors(pair)
+    end_time = current().now() + duration
+    left.command(-left_velocity, end_time=end_time, stop=stop)
+    right.command(right_velocity, end_time=end_time, stop=stop)
+    return _Command([left, right])
+
+
+def move_for_time(pair: int, duration: int, steering: int, *, velocity: int = 360, stop: int = BRAKE, acceleration: int = 1000, deceleration: int = 1000) -> _Command:
+    """
+    Drive with `steering` for `duration` ms. \n
+    Fahre `duration` ms mit `steering`.
+    """
+    left_velocity, right_velocity = _wheel_speeds(steering, velocity)
+    return move_tank_for_time(pair, left_velocity, right_velocity, duration, stop=stop)
+
+
+def move_tank_for_degrees(pair: int, degrees: int, left_velocity: int, right_velocity: int, *, stop: int = BRAKE, acceleration: int = 1000, deceleration: int = 1000) -> _Command:
+    """
+    Turn the faster wheel by `degrees`, the other one proportionally. \n
+    Drehe das schnellere Rad um `degrees`, das andere anteilig.
+    """
+    left, right = _motors(pair)
+    fastest = max(abs(left_velocity), abs(right_velocity)) or 1
+    sign = -1 if degrees < 0 else 1
+    for m, speed in ((left, -left_velocity), (right, right_velocity)):
+        travel = sign * abs(degrees) * speed / fastest
+        m.command(sign * speed, goal=m.position + travel, stop=stop)
+    return _Command([left, right])
+
+
+def move_for_degrees(pair: int, degrees: int, steering: int, *, velocity: int = 360, stop: int = BRAKE, acceleration: int = 1000, deceleration: int = 1000) -> _Command:
+    """
+    Drive with `steering` until the faster wheel turned by `degrees`. \n
+    Fahre mit `steering`, bis sich das schnellere Rad um `degrees` gedreht hat.
+    """
+    left_velocity, right_velocity = _wheel_speeds(steering, velocity)
+    return move_tank_for_degrees(pair, degrees, left_velocity, right_velocity, stop=stop)
+
+
+def stop(pair: int, *, stop: int = BRAKE) -> None:
+    """
+    Stop both motors of the pair. \n
+    Stoppe beide Motoren des Paares.
+    """
+    left, right = _motors(pair)
+    left.halt(stop)
+    right.halt(stop)
@@ -0,0 +1,389 @@
+"""
+Timeline and time budget of a mission run in the simulator.
+
+record() runs a mission with every public DriveBase call logged with its
+arguments, start and end time and the motors it occupies; the awaitable
+`*_async` maneuvers of coroutine missions are logged from their first to
+their last tick, side by side when they run in parallel. Sleeps, button
+waits and Motion.sleep/Motion.until in the mission code itself are logged
+as idle time, the ticks of the maneuver runner are not. report() then
+shows where the match clock goes, which neighbouring steps use different
+motors and could run side by side with Controller.parallel(), and the
+shortest run the motor usage would allow:
+
+    python -m simulator.timeline Controller ctrl.drive_forward
+    python -m simulator.timeline Controller ctrl.drive_and_lower
+
+The command fails if the mission recorded no DriveBase call at all. \n
+Zeitleiste und Zeitbudget eines Missionslaufs im Simulator.
+record() protokolliert jeden öffentlichen DriveBase-Aufruf mit Argumenten,
+Start, Ende und belegten Motoren, Pausen und Warten auf Knöpfe als
+Leerlauf. report() zeigt, wohin die Matchzeit geht und welche Schritte mit
+Controller.parallel() nebeneinander laufen könnten.
+"""
+
+import importlib
+import time
+
+from . import hub as sim_hub, install, world as _world
+from .world import VirtualClock, World
+
+DRIVE_METHODS = (
+    "drive_distance", "drive_path", "drive_arc", "turn_to_angle", "turn_till_color", "turn_till_reflect",
+    "till_collide", "till_color",
+)
+PORT_METHODS = (
+    "run_motor_duration", "run_motor_degree", "run_to_absolute_position",
+    "run_to_relative_position",
+)
+
+
+class Step:
+    """
+    One entry of the timeline, times in simulated ms. \n
+    Ein Eintrag der Zeitleiste, Zeiten in simulierten ms.
+    """
+
+    def __init__(self, kind: str, name: str, start: float, arguments: str = "", resources: frozenset = frozenset()):
+        self.kind = kind  # "call", "sleep", "button" or "wait"
+        self.name = name
+        self.start = start
+        self.end = start
+        self.arguments = arguments
+        self.resources = resources
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def __repr__(self):
+        return "Step({} {}({}) {:.0f}-{:.0f} ms)".format(self.kind, self.name, self.arguments, self.start, self.end)
+
+
+def resources(db, name: str, args: tuple) -> frozenset:
+    """
+    Return the motors a DriveBase call occupies, "drive" for the drive pair. \n
+    Gib die Motoren aus, die ein DriveBase-Aufruf belegt, "drive" für das Antriebspaar.
+    """
+    drive = (db.MOTORL, db.MOTORR)
+
+    def ports(values):
+        return frozenset("drive" if port in drive else "motor {}".format(port) for port in values)
+
+    if name in DRIVE_METHODS:
+        return frozenset(["drive"])
+    if name in PORT_METHODS:
+        return ports(args[2:])
+    if name == "reset_null":
+        return ports(args)
+    if name.startswith("run_action"):
+        return ports([db.ACTION])
+    if name == "attach_addition":
+        return ports([db.ADDITION])
+    return frozenset()
+
+
+def _arguments(args: tuple, kwargs: dict) -> str:
+    return ", ".join([repr(a) for a in args] + ["{}={!r}".format(k, v) for k, v in kwargs.items()])
+
+
+class Recorder:
+    """
+    Patches DriveBase, time and the hub buttons while a mission runs. \n
+    Ersetzt DriveBase, time und die Hub-Knöpfe, während eine Mission läuft.
+    """
+
+    def __init__(self, world: World):
+        self.world = world
+        self.steps = []
+        self.depth = 0
+        self.running = 0
+        self._patched = []
+
+    def now(self) -> float:
+        return self.world.now()
+
+    def _patch(self, owner, name: str, replacement) -> None:
+        # Classes keep the raw attribute, so static methods stay static when restored
+        if isinstance(owner, type):
+            original = owner.__dict__[name]
+        else:
+            original = getattr(owner, name)
+        self._patched.append((owner, name, original))
+        setattr(owner, name, replacement)
+
+    def __enter__(self):
+        from DriveBase import DriveBase, Motion
+
+        # Add-on methods are only class attributes once their module is loaded
+        DriveBase.load_addons()
+        for name in DriveBase.PROFILED:
+            self._patch(DriveBase, name, self._call_wrapper(name, getattr(DriveBase, name)))
+            if hasattr(DriveBase, name + "_async"):
+                self._patch(DriveBase, name + "_async", self._async_wrapper(name, getattr(DriveBase, name + "_async")))
+        self._patch(Motion, "run", staticmethod(self._run_wrapper(Motion.run)))
+        self._patch(Motion, "sleep", staticmethod(self._idle_wrapper("sleep", "Motion.sleep", Motion.sleep)))
+        self._patch(Motion, "until", staticmethod(self._idle_wrapper("wait", "Motion.until", Motion.until)))
+        for name in ("sleep", "sleep_ms", "sleep_us"):
+            self._patch(time, name, self._sleep_wrapper(name, getattr(time, name)))
+        self._patch(sim_hub.button, "pressed", self._button_wrapper(sim_hub.button.pressed))
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+        return False
+
+    def _call_wrapper(self, name: str, method):
+        recorder = self
+
+        def recorded(db, *args, **kwargs):
+            if recorder.depth:
+                return method(db, *args, **kwargs)
+            step = Step("call", name, recorder.now(), _arguments(args, kwargs), resources(db, name, args))
+            recorder.steps.append(step)
+            recorder.depth += 1
+            try:
+                return method(db, *args, **kwargs)
+            finally:
+                recorder.depth -= 1
+                step.end = recorder.now()
+        return recorded
+
+    def _async_wrapper(self, name: str, method):
+        recorder = self
+
+        def recorded(db, *args, **kwargs):
+            # Maneuvers built inside this one, e.g. by run_action_degree_async, are part of it
+            recorder.depth += 1
+            try:
+                motion = method(db, *args, **kwargs)
+            finally:
+                recorder.depth -= 1
+            if recorder.depth:
+                return motion
+            step = Step("call", name, 0.0, _arguments(args, kwargs), resources(db, name, args))
+            return type(motion)(recorder._timed(step, motion.steps))
+        return recorded
+
+    def _timed(self, step: Step, steps):
+        """
+        Run a maneuver generator, `step` spans its first to its last tick. \n
+        Führe einen Manöver-Generator aus, `step` reicht vom ersten bis zum letzten Schritt.
+        """
+        step.start = step.end = self.now()
+        self.steps.append(step)
+        value = None
+        try:
+            while True:
+                self.depth += 1
+                try:
+                    duration = steps.send(value)
+                except StopIteration as result:
+                    return result.value
+                finally:
+                    self.depth -= 1
+                value = yield duration
+        except GeneratorExit:
+            steps.close()
+            raise
+        finally:
+            step.end = self.now()
+
+    def _idle_wrapper(self, kind: str, name: str, function):
+        recorder = self
+
+        def idle(*args, **kwargs):
+            motion = function(*args, **kwargs)
+            if recorder.depth:
+                return motion
+            step = Step(kind, name, 0.0, _arguments(args, kwargs))
+            return type(motion)(recorder._timed(step, motion.steps))
+        return idle
+
+    def _run_wrapper(self, function):
+        recorder = self
+
+        def run(steps):
+            # The sleeps between the ticks of a maneuver are not idle time
+            recorder.running += 1
+            try:
+                return function(steps)
+            finally:
+                recorder.running -= 1
+        return run
+
+    def _sleep_wrapper(self, name: str, function):
+        recorder = self
+
+        def sleep(duration):
+            if recorder.depth or recorder.running:
+                return function(duration)
+            step = Step("sleep", "time." + name, recorder.now(), repr(duration))
+            recorder.steps.append(step)
+            function(duration)
+            step.end = recorder.now()
+        return sleep
+
+    def _button_wrapper(self, function):
+        recorder = self
+
+        def pressed(button):
+            result = function(button)
+            if not recorder.depth:
+                last = recorder.steps[-1] if recorder.steps else None
+                now = recorder.now()
+                # Consecutive polls without another step in between form one wait
+                if last is not None and last.kind == "button" and not last.arguments:
+                    last.end = now
+                else:
+                    recorder.steps.append(Step("button", "hub.button.pressed", now))
+                if result:
+                    recorder.steps[-1].arguments = "pressed"
+            return result
+        return pressed
+
+
+def record(mission, *args, world: World = None, **kwargs) -> list:
+    """
+    Run a mission in the simulator and return its Steps in order. \n
+    Führe eine Mission im Simulator aus und gib ihre Steps der Reihe nach aus.
+
+    Parameters / Parameter
+    -----------------
+
+    #### mission: function
+        Callable running DriveBase calls, e.g. a Controller method, or a
+        function returning a coroutine like Controller.drive_and_lower. \n
+        Aufrufbares Objekt mit DriveBase-Aufrufen, z.B. eine Controller-Methode,
+        oder eine Funktion, die eine Coroutine ausgibt, wie Controller.drive_and_lower.
+
+    #### world: World = None
+        World to run in. By default the installed world, the one the
+        mission's DriveBase was built in, or a new VirtualClock world. \n
+        World für den Lauf. Standardmäßig die installierte, in der die
+        DriveBase der Mission gebaut wurde, sonst eine neue mit VirtualClock.
+    """
+    if world is None:
+        world = _world._current or install(World(clock=VirtualClock(), start=(60.0, 57.0, 0.0)))
+    from DriveBase import Motion
+
+    with Recorder(world) as recorder:
+        result = mission(*args, **kwargs)
+        if hasattr(result, "__await__"):
+            Motion.run(result.__await__())
+    return recorder.steps
+
+
+def schedule(steps: list) -> float:
+    """
+    Return the length in ms of the shortest run if every call only waited
+    for the previous calls on the same motors and idle time were removed. \n
+    Gib die Länge in ms des kürzesten Laufs aus, wenn jeder Aufruf nur auf
+    frühere Aufrufe mit denselben Motoren wartet und es keinen Leerlauf gibt.
+    """
+    free = {}
+    end = 0.0
+    for step in steps:
+        if step.kind != "call":
+            continue
+        start = max([free.get(r, 0.0) for r in step.resources] or [0.0])
+        finish = start + step.duration
+        for r in step.resources:
+            free[r] = finish
+        end = max(end, finish)
+    return end
+
+
+def overlaps(steps: list) -> list:
+    """
+    Return (first, second, saving ms) for neighbouring calls on different
+    motors, only separated by idle time, the biggest saving first. \n
+    Gib (erster, zweiter, Ersparnis ms) für benachbarte Aufrufe mit
+    verschiedenen Motoren aus, die nur Leerlauf trennt, größte Ersparnis zuerst.
+    """
+    calls = [step for step in steps if step.kind == "call"]
+    pairs = []
+    # The call finishing last so far is the one the next call waited for
+    first = None
+    for second in calls:
+        if first is not None and second.start >= first.end and first.resources and second.resources \
+                and not (first.resources & second.resources):
+            pairs.append((first, second, min(first.duration, second.duration)))
+        if first is None or second.end > first.end:
+            first = second
+    pairs.sort(key=lambda pair: -pair[2])
+    return pairs
+
+
+def covered(steps: list, kinds: tuple) -> float:
+    """
+    Return the ms covered by steps of the given kinds, parallel steps counted once. \n
+    Gib die ms aus, die Steps der angegebenen Arten abdecken, parallele nur einmal gezählt.
+    """
+    total = 0.0
+    end = None
+    for step in sorted((s for s in steps if s.kind in kinds), key=lambda s: s.start):
+        if end is None or step.start > end:
+            total += step.duration
+            end = step.end
+        elif step.end > end:
+            total += step.end - end
+            end = step.end
+    return total
+
+
+def report(steps: list) -> str:
+    """
+    Return the timeline table, idle summary, overlap candidates and the time bound. \n
+    Gib die Zeitleiste, den Leerlauf, mögliche Überlappungen und die Zeitgrenze aus.
+    """
+    if not steps:
+        return "Empty timeline"
+    total = max(step.end for step in steps) - steps[0].start
+    lines = ["{:>8} {:>8} {:>6}  {:<7} {:<28} {}".format("start", "ms", "%", "kind", "step", "motors")]
+    for step in steps:
+        lines.append("{:>8.0f} {:>8.0f} {:>5.1f}%  {:<7} {:<28} {}".format(
+            step.start - steps[0].start, step.duration, 100 * step.duration / total if total else 0,
+            step.kind, "{}({})".format(step.name, step.arguments)[:28], ", ".join(sorted(step.resources))))
+
+    busy = covered(steps, ("call",))
+    sleeping = covered(steps, ("sleep",))
+    waiting = covered(steps, ("button", "wait"))
+    lines.append("")
+    lines.append("total {:.0f} ms: calls {:.0f} ms, sleeps {:.0f} ms, waits {:.0f} ms, mission code {:.0f} ms".format(
+        total, busy, sleeping, waiting, total - covered(steps, ("call", "sleep", "button", "wait"))))
+
+    pairs = overlaps(steps)
+    if pairs:
+        lines.append("")
+        lines.append("Could overlap with Controller.parallel():")
+        for first, second, saving in pairs:
+            lines.append("  {} + {}: up to {:.0f} ms".format(first.name, second.name, saving))
+    lines.append("")
+    lines.append("Critical path over the motors without idle time: {:.0f} ms ({:.0f} ms less)".format(
+        schedule(steps), total - schedule(steps)))
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Record the timeline of a mission in the simulator.")
+    parser.add_argument("module", help="Module of the mission, e.g. Controller")
+    parser.add_argument("mission", help="Attribute path of the mission in the module, e.g. ctrl.drive_forward")
+    args = parser.parse_args()
+
+    install(World(clock=VirtualClock(), start=(60.0, 57.0, 0.0)))
+    target = importlib.import_module(args.module)
+    for name in args.mission.split("."):
+        target = getattr(target, name)
+    steps = record(target)
+    print(report(steps))
+    if not any(step.kind == "call" for step in steps):
+        # E.g. maneuvers the recorder does not wrap, the timeline would be all idle time
+        raise SystemExit("No DriveBase calls recorded")
+
+
+if __name__ == "__main__":
+    main()
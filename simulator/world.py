@@ -0,0 +1,595 @@
+"""
+Physics model behind the simulated SPIKE Prime modules.
+
+A World holds the clock, six ports with their devices, a differential-drive
+robot on the competition table and a color field below it. The simulated
+firmware modules (hub, motor, motor_pair, color_sensor) read and command it
+through `current()`. The physics is integrated lazily: every firmware call
+first advances the model to the current clock time in fixed sub-steps. \n
+Physikmodell hinter den simulierten SPIKE Prime Modulen.
+Eine World enthält die Uhr, sechs Ports mit ihren Geräten, einen Roboter mit
+Differentialantrieb auf dem Wettbewerbstisch und eine Farbfläche darunter.
+Jeder Firmware-Aufruf rechnet das Modell zuerst bis zur aktuellen Zeit weiter.
+"""
+
+import math
+import time
+
+# Kept before install() replaces time.sleep with the simulated one
+_perf_counter = time.perf_counter
+_sleep = time.sleep
+
+
+# Tick arithmetic of MicroPython's time.ticks_*: values wrap at 2**30
+TICKS_PERIOD = 1 << 30
+TICKS_HALF = TICKS_PERIOD // 2
+
+# Port letters of the hub, A = 0 ... F = 5
+PORTS = "ABCDEF"
+
+# Stop modes and directions as defined by the SPIKE firmware `motor` module
+COAST = 0
+BRAKE = 1
+HOLD = 2
+CONTINUE = 3
+SMART_COAST = 4
+SMART_BRAKE = 5
+
+CLOCKWISE = 0
+COUNTERCLOCKWISE = 1
+SHORTEST_PATH = 2
+LONGEST_PATH = 3
+
+# Color indices of the SPIKE firmware `color` module
+BLACK = 0
+MAGENTA = 1
+PURPLE = 2
+BLUE = 3
+AZURE = 4
+TURQUOISE = 5
+GREEN = 6
+YELLOW = 7
+ORANGE = 8
+RED = 9
+WHITE = 10
+UNKNOWN = -1
+
+# Raw rgbi values (0-1024) the sensor reports above each printed color
+RGBI = {
+    BLACK: (60, 60, 60, 70),
+    MAGENTA: (700, 150, 450, 450),
+    PURPLE: (350, 200, 600, 400),
+    BLUE: (100, 250, 750, 400),
+    AZURE: (300, 700, 900, 650),
+    TURQUOISE: (150, 700, 650, 550),
+    GREEN: (150, 600, 200, 350),
+    YELLOW: (950, 900, 250, 750),
+    ORANGE: (950, 500, 150, 600),
+    RED: (850, 150, 120, 400),
+    WHITE: (950, 950, 950, 1000),
+}
+
+
+class Clock:
+    """
+    Scaled wall clock of the simulation.
+    With `time_scale` > 1 the simulated time runs faster than real time:
+    sleeps take `1 / time_scale` of their duration and ticks count
+    simulated milliseconds. \n
+    Skalierte Uhr der Simulation.
+    Mit `time_scale` > 1 läuft die simulierte Zeit schneller als die echte,
+    Pausen dauern nur `1 / time_scale` so lange.
+
+    Parameters / Parameter
+    -----------------
+
+    #### time_scale: float = 10.0
+        Simulated seconds per real second. \n
+        Simulierte Sekunden pro echter Sekunde.
+    """
+
+    def __init__(self, time_scale: float = 10.0):
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive")
+        self.time_scale = time_scale
+        self._start = _perf_counter()
+
+    def now_ms(self) -> float:
+        """
+        Simulated milliseconds since the clock was created. \n
+        Simulierte Millisekunden seit dem Start der Uhr.
+        """
+        return (_perf_counter() - self._start) * 1000 * self.time_scale
+
+    def sleep_ms(self, duration: float) -> None:
+        """
+        Let `duration` simulated milliseconds pass. \n
+        Lass `duration` simulierte Millisekunden vergehen.
+        """
+        if duration > 0:
+            _sleep(duration / 1000 / self.time_scale)
+
+
+class SimulationTimeout(RuntimeError):
+    """
+    Raised by VirtualClock when a mission runs past its time limit. \n
+    Wird von VirtualClock ausgelöst, wenn eine Mission ihr Zeitlimit überschreitet.
+    """
+
+
+class VirtualClock:
+    """
+    Simulated clock that never waits.
+    Sleeps advance the time instantly, so a mission takes only as long as
+    its Python code needs to run. Every time reading also advances the
+    clock by `read_cost` ms, the cost of a firmware call on the hub, so
+    loops that poll the ticks without sleeping still make progress. \n
+    Simulierte Uhr, die nie wartet.
+    Pausen stellen die Zeit sofort vor. Jedes Lesen der Zeit kostet
+    `read_cost` ms, so kommen auch Schleifen ohne Pause voran.
+
+    Parameters / Parameter
+    -----------------
+
+    #### read_cost: float = 0.02 [ms]
+        Simulated time that passes on every time reading. \n
+        Simulierte Zeit, die bei jedem Lesen der Zeit vergeht.
+
+    #### limit: float = None [ms]
+        Simulated time after which SimulationTimeout is raised, no limit if None. \n
+        Simulierte Zeit, nach der SimulationTimeout ausgelöst wird, ohne Limit bei None.
+    """
+
+    def __init__(self, read_cost: float = 0.02, limit: float = None):
+        self.read_cost = read_cost
+        self.limit = limit
+        self._now = 0.0
+
+    def now_ms(self) -> float:
+        """
+        Simulated milliseconds since the clock was created. \n
+        Simulierte Millisekunden seit dem Start der Uhr.
+        """
+        self._advance(self.read_cost)
+        return self._now
+
+    def sleep_ms(self, duration: float) -> None:
+        """
+        Advance the clock by `duration` simulated milliseconds. \n
+        Stelle die Uhr um `duration` simulierte Millisekunden vor.
+        """
+        if duration > 0:
+            self._advance(duration)
+
+    def _advance(self, duration: float) -> None:
+        self._now += duration
+        if self.limit is not None and self._now > self.limit:
+            raise SimulationTimeout("Mission ran longer than {} ms".format(self.limit))
+
+
+class Motor:
+    """
+    State of one simulated motor, positions in degrees and speeds in degrees/second. \n
+    Zustand eines simulierten Motors, Positionen in Grad, Geschwindigkeiten in Grad/Sekunde.
+    """
+
+    def __init__(self, max_speed: float = 1050, acceleration: float = 8000):
+        self.max_speed = max_speed
+        self.acceleration = acceleration
+
+        self.position = 0.0
+        self.velocity = 0.0
+        self.target = 0.0
+        self.relative_offset = 0.0
+        self.absolute_offset = 0.0
+
+        # Optional end condition of the current command
+        self.goal = None
+        self.end_time = None
+        self.stop_mode = BRAKE
+
+        self.duty = 0
+        self.stalled = False
+
+    def command(self, velocity: float, goal: float = None, end_time: float = None, stop: int = BRAKE) -> None:
+        """
+        Run at `velocity` until `goal` (raw position) or `end_time` (ms) is reached, if given. \n
+        Fahre mit `velocity`, bis `goal` (Rohposition) oder `end_time` (ms) erreicht ist, falls gesetzt.
+        """
+        self.target = max(-self.max_speed, min(velocity, self.max_speed))
+        self.goal = goal
+        self.end_time = end_time
+        self.stop_mode = stop
+
+    def halt(self, stop: int = BRAKE) -> None:
+        """
+        Stop the motor with the given firmware stop mode. \n
+        Stoppe den Motor mit dem angegebenen Stoppmodus der Firmware.
+        """
+        self.target = 0.0
+        self.goal = None
+        self.end_time = None
+        self.stop_mode = stop
+
+    def step(self, dt: float, now: float) -> None:
+        """
+        Advance speed and end conditions by `dt` seconds at simulated time `now` (ms). \n
+        Rechne Geschwindigkeit und Endbedingungen um `dt` Sekunden zur Zeit `now` (ms) weiter.
+        """
+        if self.end_time is not None and now >= self.end_time:
+            self.halt(self.stop_mode)
+
+        target = self.target
+        if self.goal is not None:
+            remaining = self.goal - self.position
+            if remaining * self.target <= 0:
+                # Reached the goal, the firmware brakes or holds right there
+                self.halt(self.stop_mode)
+                if self.stop_mode not in (COAST, SMART_COAST):
+                    self.velocity = 0.0
+                return
+            # Slow down in time to stop on the goal
+            reachable = math.sqrt(2 * self.acceleration * abs(remaining))
+            target = math.copysign(min(abs(target), max(reachable, 20)), target)
+
+        coasting = target == 0 and self.stop_mode in (COAST, SMART_COAST)
+        rate = self.acceleration / 4 if coasting else self.acceleration
+        limit = rate * dt
+        self.velocity += max(-limit, min(target - self.velocity, limit))
+
+    def move(self, dt: float) -> None:
+        """
+        Turn the shaft by the current speed unless it is blocked. \n
+        Drehe die Welle mit der aktuellen Geschwindigkeit, außer sie ist blockiert.
+        """
+        if self.stalled:
+            self.velocity = 0.0
+        else:
+            self.position += self.velocity * dt
+        load = 10000 if self.stalled and self.target else 8000 * abs(self.velocity) / self.max_speed
+        self.duty = int(math.copysign(min(load, 10000), self.target or self.velocity))
+
+
+class ColorField:
+    """
+    Printed mat below the robot as a background color plus colored rectangles.
+    Coordinates are in cm, the origin is the lower left corner of the table.
+    Rectangles added later are drawn on top of earlier ones. \n
+    Bedruckte Matte unter dem Roboter, eine Hintergrundfarbe mit farbigen Rechtecken.
+    Koordinaten in cm, der Ursprung ist die linke untere Ecke des Tisches.
+    Später hinzugefügte Rechtecke liegen über früheren.
+    """
+
+    def __init__(self, background: int = WHITE):
+        self.background = background
+        self.regions = []
+
+    def add_rect(self, x0: float, y0: float, x1: float, y1: float, color: int = BLACK) -> "ColorField":
+        """
+        Add a colored rectangle between two corners.
+        Returns the field, to chain calls. \n
+        Füge ein farbiges Rechteck zwischen zwei Ecken hinzu.
+        Gibt die Fläche zurück, um Aufrufe zu verketten.
+        """
+        self.regions.append((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1), color))
+        return self
+
+    def add_line(self, x0: float, y0: float, x1: float, y1: float, width: float = 2.0, color: int = BLACK) -> "ColorField":
+        """
+        Add a horizontal or vertical line, e.g. a black guide line of the mat.
+        Returns the field, to chain calls. \n
+        Füge eine waagrechte oder senkrechte Linie hinzu, z.B. eine schwarze Linie der Matte.
+        Gibt die Fläche zurück, um Aufrufe zu verketten.
+        """
+        half = width / 2
+        if abs(x1 - x0) >= abs(y1 - y0):
+            return self.add_rect(x0, y0 - half, x1, y1 + half, color)
+        return self.add_rect(x0 - half, y0, x1 + half, y1, color)
+
+    def color_at(self, x: float, y: float) -> int:
+        """
+        Return the firmware color index printed at (x, y). \n
+        Gib den Farbindex der Firmware an der Stelle (x, y) aus.
+        """
+        for x0, y0, x1, y1, color in reversed(self.regions):
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return color
+        return self.background
+
+
+class World:
+    """
+    Simulated robot on the table, shared by all simulated firmware modules.
+    The robot is a differential drive. It faces along `heading`, counted
+    counter-clockwise in degrees from the x axis of the table, and drives
+    that way when the pair velocity has the sign of `forward`. The gyro yaw
+    is reported as `yaw_sign * heading` in decidegrees. DriveBase.py takes
+    -yaw / 10 as the heading of every maneuver, so with the default
+    yaw_sign=1 a positive angle turns the robot clockwise, to the right. \n
+    Simulierter Roboter auf dem Tisch, von allen simulierten Firmware-Modulen geteilt.
+    Der Roboter hat einen Differentialantrieb und schaut entlang `heading`,
+    gegen den Uhrzeigersinn in Grad von der x-Achse des Tisches gezählt.
+    Der Gyro meldet `yaw_sign * heading` in Zehntelgrad. DriveBase.py nimmt
+    -yaw / 10 als Winkel jedes Manövers, mit yaw_sign=1 (Standard) dreht ein
+    positiver Winkel den Roboter im Uhrzeigersinn, nach rechts.
+
+    Parameters / Parameter
+    -----------------
+
+    #### clock: Clock | VirtualClock = None
+        Clock of the simulation, a 10x scaled Clock by default. \n
+        Uhr der Simulation, standardmäßig eine 10-fach skalierte Clock.
+
+    #### devices: dict = None
+        Port -> "motor" or "color_sensor", defaults to the Controller.py layout. \n
+        Port -> "motor" oder "color_sensor", standardmäßig die Belegung aus Controller.py.
+
+    #### wheel_circumference: float = 17.6 / 3 [cm]
+        Distance per motor revolution (DriveBase.WHEELCIRC). \n
+        Strecke pro Motorumdrehung (DriveBase.WHEELCIRC).
+
+    #### track_width: float = 11.2 [cm]
+        Distance between the two drive wheels. \n
+        Abstand zwischen den beiden Antriebsrädern.
+
+    #### table: tuple = (236.2, 114.3) [cm]
+        Width and height of the table. \n
+        Breite und Höhe des Tisches.
+
+    #### footprint: tuple = (20.0, 16.0) [cm]
+        Length and width of the robot, used for wall collisions. \n
+        Länge und Breite des Roboters, für Zusammenstöße mit der Bande.
+
+    #### start: tuple = (40.0, 20.0, 0.0)
+        Start pose (x cm, y cm, heading degrees). \n
+        Startposition (x cm, y cm, Richtung in Grad).
+
+    #### yaw_sign: int = 1
+        Sign of the reported yaw relative to counter-clockwise rotation. \n
+        Vorzeichen des Gyrowerts gegenüber einer Drehung gegen den Uhrzeigersinn.
+
+    #### forward: int = -1
+        Sign of the pair velocity that drives the robot forwards,
+        negative for the hub orientation DriveBase.py is written for. \n
+        Vorzeichen der Paargeschwindigkeit, mit der der Roboter vorwärts fährt,
+        negativ für die Lage des Hubs, für die DriveBase.py geschrieben ist.
+
+    #### drive_bias: float = 0.0
+        Relative excess speed of the right wheel, e.g. 0.02 for a 2 % larger
+        wheel, so the robot drifts like a real one. \n
+        Relative Mehrgeschwindigkeit des rechten Rades, z.B. 0.02 für ein
+        2 % größeres Rad, damit der Roboter wie ein echter abdriftet.
+
+    #### color_field: ColorField = None
+        Mat below the robot, plain white by default. \n
+        Matte unter dem Roboter, standardmäßig einfach weiß.
+
+    #### sensor_offset: tuple = (0.0, 0.0) [cm]
+        Color sensor position relative to the robot center (forward, left). \n
+        Position des Farbsensors relativ zur Robotermitte (vorne, links).
+
+    #### auto_press: bool = True
+        Report every hub button as pressed, so button waits pass. \n
+        Melde jeden Hub-Knopf als gedrückt, damit Wartestellen durchlaufen.
+
+    #### step_ms: float = 2.0 [ms]
+        Length of one physics sub-step in simulated time. \n
+        Länge eines Physik-Teilschritts in simulierter Zeit.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock: Clock = None,
+        devices: dict = None,
+        wheel_circumference: float = 17.6 / 3,
+        track_width: float = 11.2,
+        table: tuple = (236.2, 114.3),
+        footprint: tuple = (20.0, 16.0),
+        start: tuple = (40.0, 20.0, 0.0),
+        yaw_sign: int = 1,
+        forward: int = -1,
+        drive_bias: float = 0.0,
+        color_field: ColorField = None,
+        sensor_offset: tuple = (0.0, 0.0),
+        auto_press: bool = True,
+        step_ms: float = 2.0,
+    ):
+        self.clock = clock or Clock()
+        if devices is None:
+            devices = {0: "motor", 2: "color_sensor", 3: "motor", 4: "motor", 5: "motor"}
+        self.devices = dict(devices)
+        self.motors = {port: Motor() for port, kind in self.devices.items() if kind == "motor"}
+
+        self.wheel_circumference = wheel_circumference
+        self.track_width = track_width
+        self.table = table
+        self.footprint = footprint
+        self.yaw_sign = yaw_sign
+        self.forward = forward
+        self.drive_bias = drive_bias
+        self.color_field = color_field or ColorField()
+        self.sensor_offset = sensor_offset
+        self.step_ms = step_ms
+
+        self.x, self.y, self.heading = start
+        self.yaw_offset = 0.0
+        self.collided = False
+
+        self.pairs = {}
+
+        self.auto_press = auto_press
+        self.pressed = set()
+        self.display = ""
+
+        self._time = self.clock.now_ms()
+
+    # Time
+
+    def now(self) -> float:
+        """
+        Return the simulated time in ms, after advancing the physics to it. \n
+        Gib die simulierte Zeit in ms aus, nachdem die Physik bis dahin gerechnet wurde.
+        """
+        self.update()
+        return self._time
+
+    def update(self) -> None:
+        """
+        Integrate the physics up to the current clock time. \n
+        Rechne die Physik bis zur aktuellen Zeit der Uhr.
+        """
+        target = self.clock.now_ms()
+        while self._time + self.step_ms <= target:
+            self._step(self.step_ms / 1000)
+            self._time += self.step_ms
+
+    def _step(self, dt: float) -> None:
+        for motor in self.motors.values():
+            motor.step(dt, self._time)
+
+        drive = self._drive_ports()
+        if drive is None:
+            for motor in self.motors.values():
+                motor.move(dt)
+            return
+
+        left, right = drive
+        scale = self.wheel_circumference / 360
+        # The left motor of a pair is mirrored, so it turns backwards to drive forwards
+        left_speed = -self.motors[left].velocity * scale
+        right_speed = self.motors[right].velocity * scale * (1 + self.drive_bias)
+        speed = self.forward * (left_speed + right_speed) / 2
+        turn_rate = math.degrees((right_speed - left_speed) / self.track_width)
+
+        heading = self.heading + turn_rate * dt
+        x = self.x + speed * dt * math.cos(math.radians(heading))
+        y = self.y + speed * dt * math.sin(math.radians(heading))
+
+        blocked = speed != 0 and not self._inside(x, y, heading)
+        self.collided = blocked
+        self.motors[left].stalled = blocked
+        self.motors[right].stalled = blocked
+        if not blocked:
+            self.x, self.y, self.heading = x, y, heading
+
+        for motor in self.motors.values():
+            motor.move(dt)
+
+    def _drive_ports(self):
+        """
+        Return (left, right) of the first pair, the drive motors of the robot. \n
+        Gib (links, rechts) des ersten Paares aus, die Antriebsmotoren des Roboters.
+        """
+        for pair in sorted(self.pairs):
+            left, right = self.pairs[pair]
+            if left in self.motors and right in self.motors:
+                return left, right
+        return None
+
+    def _inside(self, x: float, y: float, heading: float) -> bool:
+        """
+        Return whether the whole robot footprint is on the table at this pose. \n
+        Gib aus, ob der ganze Roboter in dieser Lage auf dem Tisch steht.
+        """
+        length, width = self.footprint
+        cos_h = math.cos(math.radians(heading))
+        sin_h = math.sin(math.radians(heading))
+        for forward in (-length / 2, length / 2):
+            for left in (-width / 2, width / 2):
+                corner_x = x + forward * cos_h - left * sin_h
+                corner_y = y + forward * sin_h + left * cos_h
+                if not (0 <= corner_x <= self.table[0] and 0 <= corner_y <= self.table[1]):
+                    return False
+        return True
+
+    # Devices
+
+    def motor(self, port: int) -> Motor:
+        """
+        Return the motor at `port`, OSError if none is connected there,
+        like the firmware does. \n
+        Gib den Motor an `port` aus, OSError wenn dort keiner angeschlossen
+        ist, wie bei der Firmware.
+        """
+        self.update()
+        if port not in self.motors:
+            raise OSError(19, "No motor on port {}".format(port))
+        return self.motors[port]
+
+    def pair_ports(self, pair: int) -> tuple:
+        """
+        Return the (left, right) motor ports of a pair, OSError if it was
+        never set up with motor_pair.pair. \n
+        Gib die Motorports (links, rechts) eines Paares aus, OSError wenn es
+        nie mit motor_pair.pair eingerichtet wurde.
+        """
+        self.update()
+        if pair not in self.pairs:
+            raise OSError(19, "Motor pair {} is not paired".format(pair))
+        return self.pairs[pair]
+
+    def yaw(self) -> int:
+        """
+        Return the gyro yaw in decidegrees, wrapped to -1800 ... 1799. \n
+        Gib den Gyrowert in Zehntelgrad aus, begrenzt auf -1800 ... 1799.
+        """
+        self.update()
+        yaw = self.yaw_sign * self.heading * 10 + self.yaw_offset
+        return int(round((yaw + 1800) % 3600 - 1800))
+
+    def reset_yaw(self, angle: int) -> None:
+        """
+        Set the reported yaw to `angle` decidegrees. \n
+        Setze den gemeldeten Gyrowert auf `angle` Zehntelgrad.
+        """
+        self.update()
+        self.yaw_offset = angle - self.yaw_sign * self.heading * 10
+
+    def sensor_color(self, port: int) -> int:
+        """
+        Return the color index below the color sensor, OSError if none is
+        connected to `port`. \n
+        Gib den Farbindex unter dem Farbsensor aus, OSError wenn an `port`
+        keiner angeschlossen ist.
+        """
+        self.update()
+        if self.devices.get(port) != "color_sensor":
+            raise OSError(19, "No color sensor on port {}".format(port))
+        forward, left = self.sensor_offset
+        cos_h = math.cos(math.radians(self.heading))
+        sin_h = math.sin(math.radians(self.heading))
+        x = self.x + forward * cos_h - left * sin_h
+        y = self.y + forward * sin_h + left * cos_h
+        return self.color_field.color_at(x, y)
+
+    def button_pressed(self, button: int) -> bool:
+        """
+        Return whether the hub button is held. \n
+        Gib aus, ob der Hub-Knopf gedrückt ist.
+        """
+        return self.auto_press or button in self.pressed
+
+
+_current = None
+
+
+def current() -> World:
+    """
+    Return the world the simulated modules talk to,
+    RuntimeError if simulator.install() was not called. \n
+    Gib die World aus, mit der die simulierten Module arbeiten,
+    RuntimeError wenn simulator.install() nicht aufgerufen wurde.
+    """
+    if _current is None:
+        raise RuntimeError("No simulated world, call simulator.install() first")
+    return _current
+
+
+def set_current(world: World) -> None:
+    """
+    Make `world` the target of all simulated modules. \n
+    Mache `world` zum Ziel aller simulierten Module.
+    """
+    global _current
+    _current = world
@@ -0,0 +1,184 @@
+"""
+Automatic tuning of the drive_distance heading PID per speed.
+
+Replaces hand-filling PIDValuesCalibration.xlsx. For every speed bucket the
+robot starts a straight drive with a heading error in the simulator; each
+trial is scored on heading error, settling time and overshoot. A coarse
+grid and then a finer grid around the best gains are searched in a process
+pool (simulator.batch.run_many). The winners are written as a gain table in the
+Calibrate.py format, which DriveBase.configure_pid(gain_table=...) loads:
+
+    python src/AutoTune.py --output gain_table.csv
+    python UploadLibrarys.py ... # then copy gain_table.csv to the hub
+
+score_trace() works on any (time, heading error) trace, so logged runs of
+the real robot can be scored the same way.
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.batch import run_many  # noqa: E402
+
+# Weights of the trial score, lower is better
+SETTLE_WEIGHT = 0.5  # per second until the heading stays within the band
+OVERSHOOT_WEIGHT = 2.0  # per degree past the target heading
+SETTLE_BAND = 1.0  # [°]
+
+SPEEDS = list(range(200, 1100, 100))
+COARSE_GRID = {
+    'p': [0.25, 0.5, 1, 2, 4, 8],
+    'i': [0],
+    'd': [0, 0.5, 1, 2],
+}
+REFINE_FACTORS = [0.7, 0.85, 1, 1.2, 1.4]
+
+
+def score_trace(times: list, errors: list, band: float = SETTLE_BAND) -> dict:
+    """
+    Score a heading error trace of a drive.
+
+    Args:
+        times: Sample times in ms
+        errors: Heading error in degrees at each sample
+        band: Error below which the heading counts as settled
+
+    Returns:
+        dict: iae (integrated absolute error in °·s), settle_ms, overshoot (°)
+            and the weighted score
+    """
+    iae = 0.0
+    for n in range(1, len(times)):
+        iae += (abs(errors[n]) + abs(errors[n - 1])) / 2 * (times[n] - times[n - 1]) / 1000
+
+    settle_ms = 0
+    for n in range(len(errors) - 1, -1, -1):
+        if abs(errors[n]) > band:
+            # Never settled counts as settling at the end of the trace
+            settle_ms = times[min(n + 1, len(times) - 1)]
+            break
+
+    direction = math.copysign(1, errors[0]) if errors and errors[0] else 1
+    overshoot = max([0.0] + [-direction * error for error in errors])
+
+    return {
+        'iae': iae,
+        'settle_ms': settle_ms,
+        'overshoot': overshoot,
+        'score': iae + SETTLE_WEIGHT * settle_ms / 1000 + OVERSHOOT_WEIGHT * overshoot,
+    }
+
+
+def drive_trial(db, world, speed: int, p: float, i: float, d: float, disturbance: float = 5, distance: float = 60) -> dict:
+    """
+    Mission for simulator.batch: drive straight at a constant speed with a
+    start heading error of `disturbance` degrees and score the correction.
+    """
+    from DriveBase import GainSchedule
+
+    db.configure_pid(False, False, False, gain_table=GainSchedule.from_points([0, 1200], [p, p], [i, i], [d, d]))
+    db.global_turn_value = disturbance
+
+    steps = db.drive_distance_async(distance, speed, speed, re_align=False, brake_start=1.0).__await__()
+    start = time.ticks_ms()
+    times = []
+    errors = []
+    while True:
+        times.append(time.ticks_diff(time.ticks_ms(), start))
+        errors.append(-world.yaw() / 10 - disturbance)
+        try:
+            delay = steps.send(None)
+        except StopIteration:
+            break
+        time.sleep_ms(delay)
+    return score_trace(times, errors)
+
+
+def tuning_world():
+    """World for the trials: a robot whose right wheel is 2 % faster."""
+    from simulator import VirtualClock, World
+    from simulator.batch import DEFAULT_LIMIT
+    return World(clock=VirtualClock(limit=DEFAULT_LIMIT), start=(40.0, 57.0, 0.0), drive_bias=0.02)
+
+
+def best_per_speed(results: list) -> dict:
+    """
+    Returns:
+        dict: speed -> the trial with the lowest score at that speed
+    """
+    best = {}
+    for trial in results:
+        if trial['error']:
+            continue
+        speed = trial['params']['speed']
+        if speed not in best or trial['result']['score'] < best[speed]['result']['score']:
+            best[speed] = trial
+    return best
+
+
+def tune(speeds: list = SPEEDS, grid: dict = COARSE_GRID, processes: int = None) -> dict:
+    """
+    Search the gains for every speed, first on `grid`, then around the best point.
+
+    Returns:
+        dict: speed -> best trial, its params hold p, i and d
+    """
+    results = []
+    for speed in speeds:
+        # One pool run per round for all speeds keeps every worker busy
+        results.extend(_trials(speed, grid))
+    best = best_per_speed(sweep_jobs(results, processes))
+
+    refined = []
+    for speed, trial in best.items():
+        params = trial['params']
+        refined.extend(_trials(speed, {
+            'p': [params['p'] * f for f in REFINE_FACTORS],
+            'i': [params['i']],
+            'd': sorted({params['d'] * f for f in REFINE_FACTORS} | {0}),
+        }))
+    return best_per_speed(list(best.values()) + sweep_jobs(refined, processes))
+
+
+def _trials(speed: int, grid: dict) -> list:
+    return [dict(speed=speed, p=p, i=i, d=d) for p in grid['p'] for i in grid['i'] for d in grid['d']]
+
+
+def sweep_jobs(points: list, processes: int = None) -> list:
+    """Run drive_trial for a list of params dicts in the process pool."""
+    return run_many(drive_trial, points, world_factory=tuning_world, processes=processes)
+
+
+def write_gain_table(best: dict, output_file: str) -> None:
+    """Write the tuned gains in the Calibrate.py table format (`;`, decimal comma)."""
+    def number(value: float) -> str:
+        return "{:.6g}".format(value).replace('.', ',')
+
+    with open(output_file, 'w') as file:
+        file.write("SPEED;pRegler;iRegler;dRegler\n")
+        for speed in sorted(best):
+            params = best[speed]['params']
+            file.write(";".join([str(speed), number(params['p']), number(params['i']), number(params['d'])]) + "\n")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Stellt die PID-Werte von drive_distance automatisch im Simulator ein.")
+    parser.add_argument("--output", default="gain_table.csv", help="Ausgabedatei für DriveBase.configure_pid(gain_table=...)")
+    parser.add_argument("--processes", type=int, default=None, help="Anzahl paralleler Prozesse")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    best = tune(processes=args.processes)
+    write_gain_table(best, args.output)
+
+    print("{:>6} {:>7} {:>7} {:>7} {:>8} {:>9} {:>9}".format("SPEED", "P", "I", "D", "IAE", "settle", "overshoot"))
+    for speed in sorted(best):
+        params, result = best[speed]['params'], best[speed]['result']
+        print("{:>6} {:>7.3f} {:>7.3f} {:>7.3f} {:>8.3f} {:>8}ms {:>8.2f}°".format(
+            speed, params['p'], params['i'], params['d'], result['iae'], result['settle_ms'], result['overshoot']))
+    print(f"Tabelle wurde in {args.output} gespeichert ({time.perf_counter() - start:.1f} s).")
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark of generated evaluators for the controller curves.
+
+Refits DriveBase.p_polynomial and i_polynomial with Calibrate.py, generates
+a Horner-form and a piecewise-linear evaluator for each and compares their
+per-call cost and maximum deviation against the original polynomials:
+
+    python src/BenchEvaluators.py --output regler_evaluators.py
+
+The written module defines drop-in p_polynomial / i_polynomial functions.
+Uploaded next to DriveBase.py, BenchGainSchedule.py also times them on the hub.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+
+import simulator  # noqa: E402
+import Calibrate  # noqa: E402
+
+simulator.install()
+from DriveBase import DriveBase  # noqa: E402
+
+MAX_SPEED = 1100
+NAMES = ("p_polynomial", "i_polynomial")
+ORIGINALS = (DriveBase.p_polynomial, DriveBase.i_polynomial)
+
+
+def build(form: str, step: int = 20) -> tuple:
+    """
+    Fit the original curves and compile the generated evaluators.
+
+    Args:
+        form: "horner" or "table"
+        step: Bucket width of the table form
+
+    Returns:
+        tuple: (source, {name: function})
+    """
+    speed = np.arange(0, MAX_SPEED + 1, 10, dtype=float)
+    values = np.column_stack([[function(s) for s in speed] for function in ORIGINALS])
+    fit, results = Calibrate.fit_columns(speed, values)
+    source = Calibrate.module_source(NAMES, fit, results, form, step)
+    namespace = {}
+    exec(source, namespace)
+    return source, {name: namespace[name] for name in NAMES}
+
+
+def per_call_ns(function, rounds: int = 20000) -> float:
+    """Mean ns per call of function(speed) over the speed range."""
+    speeds = [n % MAX_SPEED for n in range(rounds)]
+
+    def run():
+        for speed in speeds:
+            function(speed)
+
+    return min(timeit.repeat(run, number=1, repeat=5)) / rounds * 1e9
+
+
+def max_deviation(function, original) -> float:
+    return max(abs(function(speed) - original(speed)) for speed in range(MAX_SPEED + 1))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Vergleicht erzeugte Auswertefunktionen mit den Originalpolynomen.")
+    parser.add_argument("--output", help="Horner-Funktionen als Modul für den Hub speichern")
+    parser.add_argument("--step", type=int, default=20, help="Geschwindigkeitsabstand der Tabellenform")
+    args = parser.parse_args()
+
+    print(f"{'evaluator':<22} {'ns/call':>9} {'speedup':>8} {'max dev':>10}")
+    baseline = {name: per_call_ns(original) for name, original in zip(NAMES, ORIGINALS)}
+    for name in NAMES:
+        print(f"{'original ' + name:<22} {baseline[name]:>9.0f} {1:>7.1f}x {0:>10.2e}")
+
+    for form in Calibrate.FORMS:
+        source, functions = build(form, args.step)
+        for name, original in zip(NAMES, ORIGINALS):
+            cost = per_call_ns(functions[name])
+            print(f"{form + ' ' + name:<22} {cost:>9.0f} {baseline[name] / cost:>7.1f}x"
+                  f" {max_deviation(functions[name], original):>10.2e}")
+        if form == "horner" and args.output:
+            with open(args.output, "w") as file:
+                file.write(source)
+            print(f"Horner-Funktionen wurden in {args.output} gespeichert.")
+
+
+if __name__ == "__main__":
+    main()
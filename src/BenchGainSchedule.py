@@ -0,0 +1,81 @@
+"""
+Benchmark for the gain table behind DriveBase.get_pids.
+
+Compares the per-call cost and the numeric deviation of the precomputed
+GainSchedule against the 6th-order polynomials it replaces.
+Run it on the hub after UploadLibrarys.py:
+
+    mpremote run src/BenchGainSchedule.py
+
+If regler_evaluators.py from BenchEvaluators.py is on the hub as well,
+its Horner-form curves are timed too.
+"""
+
+import gc
+import time
+
+from DriveBase import DriveBase, GainSchedule
+
+ROUNDS = 2000
+MAX_SPEED = 1100
+
+
+def polynomial_pids(speed):
+    return (DriveBase.p_polynomial(speed), DriveBase.i_polynomial(speed), 1)
+
+
+def bench(name, function):
+    """Print mean µs and heap bytes per call of function(speed)."""
+    gc.collect()
+    has_mem = hasattr(gc, "mem_alloc")
+    if has_mem:
+        gc.disable()
+        mem_start = gc.mem_alloc()
+    start = time.ticks_us()
+    for n in range(ROUNDS):
+        function(n % MAX_SPEED)
+    duration = time.ticks_diff(time.ticks_us(), start)
+    line = "{:<12} {:>8.1f} us/call".format(name, duration / ROUNDS)
+    if has_mem:
+        line += " {:>8.1f} B/call".format((gc.mem_alloc() - mem_start) / ROUNDS)
+        gc.enable()
+    print(line)
+    return duration / ROUNDS
+
+
+def deviation(table):
+    """Return the maximum absolute deviation of p and i from the polynomials."""
+    worst_p = 0
+    worst_i = 0
+    for speed in range(MAX_SPEED + 1):
+        p, i, d = table.lookup(speed)
+        worst_p = max(worst_p, abs(p - DriveBase.p_polynomial(speed)))
+        worst_i = max(worst_i, abs(i - DriveBase.i_polynomial(speed)))
+    return worst_p, worst_i
+
+
+def main():
+    print("Gain schedule benchmark, {} calls each".format(ROUNDS))
+    polynomial = bench("polynomial", polynomial_pids)
+    for step in (10, 20, 50):
+        table = GainSchedule.from_functions(
+            DriveBase.p_polynomial, DriveBase.i_polynomial, step=step)
+        cost = bench("table/{}".format(step), table.lookup)
+        worst_p, worst_i = deviation(table)
+        print("    speedup {:.1f}x, max deviation p {:.4f}, i {:.4f}".format(
+            polynomial / cost, worst_p, worst_i))
+
+    try:
+        import regler_evaluators
+    except ImportError:
+        return
+
+    def horner_pids(speed):
+        return (regler_evaluators.p_polynomial(speed), regler_evaluators.i_polynomial(speed), 1)
+
+    cost = bench("horner", horner_pids)
+    print("    speedup {:.1f}x".format(polynomial / cost))
+
+
+if __name__ == "__main__":
+    main()
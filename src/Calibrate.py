@@ -2,35 +2,199 @@ import numpy as np
 import pandas as pd
 import tkinter as tk
 
-def generate_polynomial_functions(csv_file, output_file="regler_functions.py"):
+MAX_DEGREE = 8
+FOLDS = 5
+
+
+def load_table(csv_file):
     # CSV-Datei einlesen mit ; als Trennzeichen und , als Dezimaltrennzeichen
     df = pd.read_csv(csv_file, delimiter=';', decimal=',')
-    
+
     if 'SPEED' not in df.columns:
         raise ValueError("CSV-Datei muss eine 'SPEED'-Spalte enthalten.")
-    
-    speed = df['SPEED'].values
-    
-    functions = {}
-    
-    for column in df.columns:
-        if column != 'SPEED':
-            coefficients = np.polyfit(speed, df[column].values, 6)
-            
-            function_str = "      + ".join(
-                f"{coef:.15e}*speed**{6-i}\n" for i, coef in enumerate(coefficients)
+
+    columns = [column for column in df.columns if column != 'SPEED']
+    return df['SPEED'].to_numpy(dtype=float), df[columns].to_numpy(dtype=float), columns
+
+
+class PolynomialFit:
+    # Polynome aller Reglerspalten auf einer normierten Geschwindigkeitsachse
+    # x = (speed - center) / scale in [-1, 1]. Ohne Normierung ist die
+    # Vandermonde-Matrix bei speed**6 ~ 1e18 schlecht konditioniert, daher
+    # kamen Koeffizienten wie 5.9e-16 in get_pids.
+
+    def __init__(self, speed, center=None, scale=None):
+        self.low = float(speed.min())
+        self.high = float(speed.max())
+        self.center = (self.high + self.low) / 2 if center is None else center
+        self.scale = ((self.high - self.low) / 2 or 1.0) if scale is None else scale
+
+    def normalize(self, speed):
+        # Außerhalb der Messwerte nicht extrapolieren
+        return np.clip((np.asarray(speed, dtype=float) - self.center) / self.scale, -1.0, 1.0)
+
+    def solve(self, speed, values, degree):
+        # Ein einziges Least-Squares-Problem für alle Spalten (mehrere rechte Seiten);
+        # Koeffizienten mit der höchsten Potenz zuerst, Form (degree + 1, Spalten)
+        vander = np.vander(self.normalize(speed), degree + 1)
+        coefficients, *_ = np.linalg.lstsq(vander, values, rcond=None)
+        return coefficients
+
+    def evaluate(self, coefficients, speed):
+        return np.vander(self.normalize(speed), len(coefficients)) @ coefficients
+
+
+def cross_validate(speed, values, max_degree=MAX_DEGREE, folds=FOLDS):
+    # k-fache Kreuzvalidierung: RMSE je Grad (Zeilen) und Spalte, Grad 0 bis max_degree
+    fit = PolynomialFit(speed)
+    folds = max(2, min(folds, len(speed)))
+    fold_of = np.random.default_rng(0).permutation(len(speed)) % folds
+
+    errors = np.full((max_degree + 1, values.shape[1]), np.inf)
+    for degree in range(max_degree + 1):
+        squared = np.zeros(values.shape[1])
+        for fold in range(folds):
+            train = fold_of != fold
+            # Zu wenige Punkte für diesen Grad: nicht bewertbar
+            if np.count_nonzero(train) <= degree:
+                break
+            coefficients = fit.solve(speed[train], values[train], degree)
+            residuals = fit.evaluate(coefficients, speed[~train]) - values[~train]
+            squared += (residuals ** 2).sum(axis=0)
+        else:
+            errors[degree] = np.sqrt(squared / len(speed))
+    return errors
+
+
+def fit_columns(speed, values, max_degree=MAX_DEGREE, folds=FOLDS):
+    # Grad je Spalte per Kreuzvalidierung wählen, dann alle Spalten mit gleichem
+    # Grad gemeinsam auf allen Messwerten fitten
+    fit = PolynomialFit(speed)
+    errors = cross_validate(speed, values, max_degree, folds)
+    degrees = errors.argmin(axis=0)
+
+    results = []
+    for column, degree in enumerate(degrees):
+        results.append({'degree': int(degree), 'cv_rmse': float(errors[degree, column])})
+    for degree in np.unique(degrees):
+        columns = np.flatnonzero(degrees == degree)
+        coefficients = fit.solve(speed, values[:, columns], int(degree))
+        residuals = fit.evaluate(coefficients, speed) - values[:, columns]
+        for n, column in enumerate(columns):
+            results[column].update(
+                coefficients=coefficients[:, n],
+                rms=float(np.sqrt(np.mean(residuals[:, n] ** 2))),
+                max_residual=float(np.abs(residuals[:, n]).max()),
             )
-            
-            functions[column] = f"""
-def {column}_function(speed):
-    return (\n      {function_str})
-"""
-    
+    return fit, results
+
+
+FORMS = ("horner", "table")
+
+
+def horner_source(name, fit, result):
+    # Horner-Schema: ein Multiplizieren und Addieren pro Grad statt speed**n
+    coefficients = result['coefficients']
+    lines = [
+        f"def {name}(speed):",
+        f"    # Grad {result['degree']}, gültig für {fit.low:g} bis {fit.high:g},"
+        f" RMS-Fehler {result['rms']:.4g}, Kreuzvalidierung {result['cv_rmse']:.4g}",
+        f"    x = (speed - {fit.center!r}) * {1 / fit.scale!r}",
+        "    if x > 1:",
+        "        x = 1",
+        "    elif x < -1:",
+        "        x = -1",
+        f"    y = {float(coefficients[0])!r}",
+    ]
+    lines += [f"    y = y * x {'-' if c < 0 else '+'} {abs(float(c))!r}" for c in coefficients[1:]]
+    lines.append("    return y")
+    return "\n".join(lines) + "\n"
+
+
+def table_source(name, fit, result, step=20):
+    # Stückweise linear: das Polynom einmal pro Stufe auswerten, auf dem Hub
+    # bleibt pro Aufruf ein Index, eine Multiplikation und eine Addition
+    buckets = np.arange(fit.low, fit.high + step, step)
+    values = fit.evaluate(result['coefficients'], buckets)
+    last = len(values) - 1
+    rows = ",\n".join(
+        "    " + ", ".join(f"{float(v)!r}" for v in values[n:n + 6]) for n in range(0, len(values), 6)
+    )
+    lines = [
+        f"_{name}_table = array('f', [",
+        rows,
+        "])",
+        "",
+        "",
+        f"def {name}(speed):",
+        f"    # Stufen von {step} ab {fit.low:g}, Polynom vom Grad {result['degree']},"
+        f" RMS-Fehler {result['rms']:.4g}",
+        f"    table = _{name}_table",
+        f"    position = (speed - {fit.low!r}) / {step}",
+        "    if position <= 0:",
+        "        return table[0]",
+        "    index = int(position)",
+        f"    if index >= {last}:",
+        f"        return table[{last}]",
+        "    low = table[index]",
+        "    return low + (table[index + 1] - low) * (position - index)",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def evaluator_source(name, fit, result, form="horner", step=20):
+    # Quelltext einer Auswertefunktion name(speed) in der gewünschten Form,
+    # direkter Ersatz für DriveBase.p_polynomial / i_polynomial
+    if form == "horner":
+        return horner_source(name, fit, result)
+    if form == "table":
+        return table_source(name, fit, result, step)
+    raise ValueError(f"Unbekannte Form {form!r}, erlaubt: {', '.join(FORMS)}")
+
+
+def module_source(names, fit, results, form="horner", step=20):
+    header = "from array import array\n\n\n" if form == "table" else ""
+    return header + "\n\n".join(
+        evaluator_source(name, fit, result, form, step) for name, result in zip(names, results)
+    )
+
+
+def print_report(columns, results):
+    print(f"{'Spalte':<12} {'Grad':>4} {'RMS':>10} {'Max':>10} {'CV-RMSE':>10}")
+    for column, result in zip(columns, results):
+        print(f"{column:<12} {result['degree']:>4} {result['rms']:>10.4g}"
+              f" {result['max_residual']:>10.4g} {result['cv_rmse']:>10.4g}")
+
+
+def generate_polynomial_functions(csv_file, output_file="regler_functions.py", max_degree=MAX_DEGREE, folds=FOLDS, form="horner", step=20):
+    speed, values, columns = load_table(csv_file)
+    fit, results = fit_columns(speed, values, max_degree, folds)
+    print_report(columns, results)
+
+    names = [f"{column}_function" for column in columns]
+
     # Funktionen in Python-Datei speichern
     with open(output_file, "w") as f:
-        f.write("\n".join(functions.values()))
-    
+        f.write(module_source(names, fit, results, form, step))
+
     print(f"Funktionen wurden in {output_file} gespeichert.")
+    return results
+
+
+def generate_gain_table(csv_file, output_file="gain_table.csv", step=20, max_speed=1200, max_degree=MAX_DEGREE, folds=FOLDS):
+    # Gefittete Polynome einmal pro Geschwindigkeitsstufe auswerten und als
+    # Tabelle speichern, die DriveBase.configure_pid(gain_table=...) direkt lädt
+    speed, values, columns = load_table(csv_file)
+    fit, results = fit_columns(speed, values, max_degree, folds)
+
+    buckets = np.arange(0, max_speed + step, step)
+    table = pd.DataFrame({'SPEED': buckets})
+    for column, result in zip(columns, results):
+        table[column] = fit.evaluate(result['coefficients'], buckets)
+
+    table.to_csv(output_file, sep=';', decimal=',', index=False)
+
+    print(f"Tabelle mit {len(buckets)} Stufen wurde in {output_file} gespeichert.")
 
 def calibrate_gui():
     root = tk.Tk()
@@ -47,6 +211,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generiert Polynomfunktionen aus einer CSV-Datei.")
     parser.add_argument("csv_file", help="Pfad zur CSV-Datei")
     parser.add_argument("--output", default="regler_functions.py", help="Ausgabedatei für die Funktionen")
+    parser.add_argument("--table", help="Zusätzlich eine Tabelle für DriveBase.configure_pid(gain_table=...) speichern")
+    parser.add_argument("--step", type=int, default=20, help="Geschwindigkeitsabstand der Tabelle")
+    parser.add_argument("--max-degree", type=int, default=MAX_DEGREE, help="Höchster Polynomgrad der Kreuzvalidierung")
+    parser.add_argument("--folds", type=int, default=FOLDS, help="Anzahl der Teilmengen der Kreuzvalidierung")
+    parser.add_argument("--form", choices=FORMS, default="horner", help="Form der erzeugten Funktionen: Horner-Schema oder stückweise lineare Tabelle")
     args = parser.parse_args()
     
-    generate_polynomial_functions(args.csv_file, args.output)
+    generate_polynomial_functions(args.csv_file, args.output, args.max_degree, args.folds, args.form, args.step)
+    if args.table:
+        generate_gain_table(args.csv_file, args.table, args.step, max_degree=args.max_degree, folds=args.folds)
@@ -0,0 +1,188 @@
+"""
+Decode and analyse DriveBase telemetry on the PC.
+
+Reads the binary blocks written by DriveBase.Telemetry.save() (a .bin file
+on the hub, fetched with mpremote) or printed by Telemetry.stream() (the
+"TLM:" lines of a captured console), turns every maneuver into a NumPy
+array and prints summary statistics per maneuver:
+
+    python src/TelemetryTool.py --fetch /flash/telemetry.bin telemetry.bin
+    python src/TelemetryTool.py console.txt --csv telemetry.csv
+"""
+
+import base64
+import os
+import struct
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must match DriveBase.Telemetry
+MAGIC = b"DBTL"
+VERSION = 1
+HEADER = "<4sBBHII"
+FIELDS = ("time", "yaw", "error", "p", "i", "d", "steering", "speed", "left", "right")
+
+WHEEL_CIRCUMFERENCE = 17.6 / 3  # [cm] DriveBase.WHEELCIRC
+SETTLE_BAND = 1.0  # [°]
+
+
+def decode(data: bytes) -> list:
+    """
+    Split a telemetry byte stream into maneuvers.
+
+    Args:
+        data: Concatenated binary blocks
+
+    Returns:
+        list: One dict per maneuver with name, dropped and samples,
+            a (count, fields) float array with the columns of FIELDS
+
+    Raises:
+        ValueError: On a broken block or an unknown format version
+    """
+    maneuvers = []
+    offset = 0
+    header_size = struct.calcsize(HEADER)
+    while offset < len(data):
+        if len(data) - offset < header_size:
+            raise ValueError(f"Truncated header at byte {offset}")
+        magic, version, width, name_length, count, dropped = struct.unpack_from(HEADER, data, offset)
+        if magic != MAGIC:
+            raise ValueError(f"No telemetry block at byte {offset}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported telemetry version {version}")
+        offset += header_size
+        name = data[offset:offset + name_length].decode()
+        offset += name_length
+        size = 4 * width * count
+        if len(data) - offset < size:
+            raise ValueError(f"Truncated samples of {name} at byte {offset}")
+        samples = np.frombuffer(data, dtype="<f4", count=width * count, offset=offset).reshape(count, width)
+        offset += size
+        maneuvers.append({'name': name, 'dropped': dropped, 'samples': samples[:, :len(FIELDS)].astype(float)})
+    return maneuvers
+
+
+def read_console(text: str) -> bytes:
+    """
+    Returns:
+        bytes: The binary stream printed by Telemetry.stream() in a console capture
+    """
+    return b"".join(
+        base64.b64decode(line.strip()[4:]) for line in text.splitlines() if line.strip().startswith("TLM:")
+    )
+
+
+def read(path: str) -> list:
+    """
+    Decode a .bin file or a console capture with "TLM:" lines.
+
+    Returns:
+        list: The maneuvers, see decode()
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(MAGIC):
+        data = read_console(data.decode(errors="replace"))
+    return decode(data)
+
+
+def column(maneuver: dict, field: str) -> np.ndarray:
+    return maneuver['samples'][:, FIELDS.index(field)]
+
+
+def summarize(maneuver: dict, band: float = SETTLE_BAND, fixed_point: bool = False,
+              wheel_circumference: float = WHEEL_CIRCUMFERENCE) -> dict:
+    """
+    Summary statistics of one maneuver.
+
+    Args:
+        maneuver: One entry of decode()
+        band: Error in degrees below which the maneuver counts as settled
+        fixed_point: The error was recorded in decidegrees (DriveBase.FIXEDPOINT)
+        wheel_circumference: Distance per motor revolution in cm
+
+    Returns:
+        dict: samples, duration_ms, settle_ms (None if it never settled),
+            overshoot and drift in degrees, speed in degrees/s and cm/s
+    """
+    times = column(maneuver, "time")
+    error = column(maneuver, "error") / (10 if fixed_point else 1)
+    yaw = column(maneuver, "yaw") / 10
+    if len(times) == 0:
+        return {'samples': 0}
+
+    outside = np.flatnonzero(np.abs(error) > band)
+    if len(outside) == 0:
+        settle_ms = 0.0
+    elif outside[-1] == len(error) - 1:
+        settle_ms = None
+    else:
+        settle_ms = float(times[outside[-1] + 1])
+
+    direction = np.sign(error[0]) or 1
+    overshoot = float(max(0.0, (-direction * error).max()))
+
+    duration = float(times[-1] - times[0])
+    driven = (np.abs(column(maneuver, "left")[-1] - column(maneuver, "left")[0])
+              + np.abs(column(maneuver, "right")[-1] - column(maneuver, "right")[0])) / 2
+    speed = float(driven / duration * 1000) if duration else 0.0
+
+    return {
+        'samples': len(times),
+        'duration_ms': duration,
+        'settle_ms': settle_ms,
+        'overshoot': overshoot,
+        'drift': float(yaw[-1] - yaw[0]),
+        'speed': speed,
+        'speed_cm': speed * wheel_circumference / 360,
+    }
+
+
+def to_csv(maneuvers: list, path: str) -> None:
+    """Write all maneuvers into one CSV file with a maneuver column."""
+    with open(path, "w") as file:
+        file.write("maneuver;index;" + ";".join(FIELDS) + "\n")
+        for index, maneuver in enumerate(maneuvers):
+            for row in maneuver['samples']:
+                file.write(f"{maneuver['name']};{index};" + ";".join(f"{value:g}" for value in row) + "\n")
+
+
+def fetch(remote: str, local: str) -> bool:
+    """Copy a telemetry file from the hub with the mpremote of UploadLibrarys.py."""
+    import UploadLibrarys
+    return UploadLibrarys.ensure_venv() and UploadLibrarys.fetch_file(remote, local)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Dekodiert und analysiert Telemetrie von DriveBase.")
+    parser.add_argument("file", help=".bin-Datei oder Konsolen-Mitschnitt mit TLM:-Zeilen")
+    parser.add_argument("--fetch", metavar="HUBPFAD", help="Datei vorher vom Hub holen, z.B. /flash/telemetry.bin")
+    parser.add_argument("--csv", help="Alle Messwerte zusätzlich als CSV speichern")
+    parser.add_argument("--fixed-point", action="store_true", help="Fehler wurde in Zehntelgrad aufgezeichnet")
+    parser.add_argument("--band", type=float, default=SETTLE_BAND, help="Toleranz in Grad für die Einschwingzeit")
+    args = parser.parse_args()
+
+    if args.fetch and not fetch(args.fetch, args.file):
+        sys.exit(1)
+
+    maneuvers = read(args.file)
+    print(f"{'#':>3} {'maneuver':<16} {'samples':>7} {'dropped':>7} {'time[ms]':>9} {'settle[ms]':>10}"
+          f" {'overshoot':>9} {'drift[°]':>8} {'speed[°/s]':>10} {'speed[cm/s]':>11}")
+    for index, maneuver in enumerate(maneuvers):
+        stats = summarize(maneuver, args.band, args.fixed_point)
+        if not stats['samples']:
+            print(f"{index:>3} {maneuver['name']:<16} {0:>7} {maneuver['dropped']:>7}")
+            continue
+        settle = "-" if stats['settle_ms'] is None else f"{stats['settle_ms']:.0f}"
+        print(f"{index:>3} {maneuver['name']:<16} {stats['samples']:>7} {maneuver['dropped']:>7}"
+              f" {stats['duration_ms']:>9.0f} {settle:>10} {stats['overshoot']:>9.2f}"
+              f" {stats['drift']:>8.2f} {stats['speed']:>10.0f} {stats['speed_cm']:>11.1f}")
+
+    if args.csv:
+        to_csv(maneuvers, args.csv)
+        print(f"Messwerte wurden in {args.csv} gespeichert.")